@@ -156,6 +156,27 @@ PLUGINS_CONFIG = {
         "device42_username": os.getenv("DEVICE42_USERNAME", ""),
         "device42_password": os.getenv("DEVICE42_PASSWORD", ""),
         "verify_ssl": False,
+        "connection_pool_size": 10,
+        "max_concurrent_requests": 1,
+        "max_concurrent_datasets": 1,
+        "doql_chunk_sizes": {},
+        "doql_output_type": "json",
+        "max_retries": 3,
+        "retry_backoff_factor": 1.0,
+        "circuit_breaker_threshold": 5,
+        "circuit_breaker_timeout": 60,
+        "snapshot_dir": None,
+        "snapshot_ttl": {},
+        "record_path": None,
+        "replay_path": None,
+        "replay_latency": None,
+        "adaptive_page_size": False,
+        "page_size_target_latency": 2.0,
+        "page_size_min": 100,
+        "page_size_max": 5000,
+        "page_size_overrides": {},
+        "page_size_cache": None,
+        "memoize_requests": True,
         "defaults": {
             "site_status": "Active",
             "rack_status": "Active",
@@ -163,6 +184,13 @@ PLUGINS_CONFIG = {
         },
         "delete_on_sync": False,
         "use_dns": True,
+        "dns_max_workers": 8,
+        "dns_timeout": 5,
+        "dns_cache_ttl": 86400,
+        "dns_negative_cache_ttl": 3600,
+        "dns_cache_path": None,
+        "mgmt_interface_names": ["mgmt0", "management", "management0", "Management"],
+        "compact_models": False,
         "customer_is_facility": True,
         "facility_prepend": "sitecode-",
         "role_prepend": "nautobot-",
@@ -1,27 +1,37 @@
 """DiffSync adapter for Device42."""
 
+import ipaddress
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal
-from typing import List
+from typing import Optional
 
 from diffsync import DiffSync
 from diffsync.exceptions import ObjectAlreadyExists, ObjectNotFound
 from django.utils.text import slugify
 from nautobot.core.settings_funcs import is_truthy
 from netutils.bandwidth import name_to_bits
-from netutils.dns import fqdn_to_ip, is_fqdn_resolvable
+from netutils.dns import fqdn_to_ip
 from nautobot.extras.jobs import Job
 from nautobot_ssot_device42.constant import PLUGIN_CFG
 from nautobot_ssot_device42.diffsync.models.base import assets, circuits, dcim, ipam
+from nautobot_ssot_device42.diffsync.models.compact import use_compact_models
 from nautobot_ssot_device42.utils.device42 import (
+    AsyncDevice42API,
     get_facility,
     get_intf_type,
     get_intf_status,
     get_netmiko_platform,
     get_custom_field_dict,
     load_vlan,
+    netport_pk_map,
 )
-from nautobot_ssot_device42.utils.nautobot import determine_vc_position
+from nautobot_ssot_device42.utils.dns import DNSResolver
+from nautobot_ssot_device42.utils.interning import TagSet
+from nautobot_ssot_device42.utils.nautobot import build_vc_member_index, determine_vc_position
+from nautobot_ssot_device42.utils.racks import RackOccupancy, face_mask
+from nautobot_ssot_device42.utils.rules import get_rules
 
 
 def sanitize_string(san_str: str):
@@ -61,29 +71,53 @@ def get_site_from_mapping(device_name: str) -> str:
     Returns:
         str: The Site slug of the associated Site for the Device in the mapping. Returns blank string if match not found.
     """
-    for _entry in PLUGIN_CFG["hostname_mapping"]:
-        for _mapping, _slug in _entry.items():
-            site_match = re.match(_mapping, device_name)
-            if site_match:
-                return _slug
-    return ""
+    return get_rules(PLUGIN_CFG).site_for_device(device_name)
 
 
-def get_dns_a_record(dev_name: str):
+# FQDN portion of a Device name that's resolved when `use_dns` is enabled.
+FQDN_PATTERN = re.compile(r"[a-zA-Z0-9\.\/\?\:\-_=#]+\.[a-zA-Z]{2,6}")
+
+
+def get_dns_a_record(dev_name: str, resolver: Optional[DNSResolver] = None):
     """Method to obtain A record for a Device.
 
     Args:
         dev_name (str): Name of Device to perform DNS query for.
+        resolver (DNSResolver, optional): Resolver to look the name up with, using its cache. Defaults to None.
 
     Returns:
         str: A record for Device if exists, else False.
     """
-    if is_fqdn_resolvable(dev_name):
+    if resolver is not None:
+        return resolver.lookup(dev_name)
+    try:
         return fqdn_to_ip(dev_name)
-    else:
+    except (OSError, UnicodeError):
         return False
 
 
+# Columns of each Device42 dataset used by the loaders keyed by the Device42API method retrieving it.
+DATASET_COLUMNS = {}
+
+
+def uses_columns(dataset: str, *columns: str):
+    """Decorator declaring the columns of a Device42 dataset that a loader uses.
+
+    Only the declared columns are retrieved from Device42, so each loader must declare every column it reads. Columns
+    declared for the same dataset by several loaders are combined.
+
+    Args:
+        dataset (str): Name of the Device42API method retrieving the dataset, ie `get_buildings`.
+        *columns (str): Names of the columns used by the loader.
+    """
+
+    def decorator(method):
+        DATASET_COLUMNS[dataset] = tuple(dict.fromkeys(DATASET_COLUMNS.get(dataset, ()) + columns))
+        return method
+
+    return decorator
+
+
 class Device42Adapter(DiffSync):
     """DiffSync adapter using requests to communicate to Device42 server."""
 
@@ -124,43 +158,189 @@ class Device42Adapter(DiffSync):
         "conn",
     ]
 
-    def __init__(self, *args, job: Job, sync=None, client, **kwargs):
+    # Datasets that are independent of each other and can be retrieved from Device42 concurrently prior to loading.
+    prefetch = (
+        "get_buildings",
+        "get_rooms",
+        "get_racks",
+        "get_vendors",
+        "get_hardware_models",
+        "get_vrfgroups",
+        "get_subnet_default_custom_fields",
+        "get_subnet_custom_fields",
+        "get_subnets",
+        "get_devices",
+        "get_port_custom_fields",
+        "get_ipaddr_custom_fields",
+        "get_telcocircuits",
+        "get_patch_panels",
+        "get_patch_panel_port_pks",
+    )
+
+    # Lookup maps of Device42 records keyed by primary key, along with the Device42API method that retrieves each.
+    lookup_maps = {
+        "device42_clusters": "get_cluster_members",
+        "d42_building_map": "get_building_pks",
+        "d42_customer_map": "get_customer_pks",
+        "d42_room_map": "get_room_pks",
+        "d42_rack_map": "get_rack_pks",
+        "d42_vlan_map": "get_vlan_info",
+        "d42_device_map": "get_device_pks",
+        "d42_netports": "get_netports",
+        "d42_vendor_map": "get_vendor_pks",
+        "d42_ipaddr_default_cfs": "get_ipaddr_default_custom_fields",
+        "d42_port_default_cfs": "get_port_default_custom_fields",
+    }
+    # Lookup maps needed by the Device, Port, VLAN and IP Address loaders that are retrieved when the adapter is created.
+    # The Ports along with their VLAN membership are retrieved once and shared by the Port, VLAN and Port PK lookups.
+    # The Building, Customer, Room and Rack maps are only used for Patch Panels and the Vendor map only for Circuits, so
+    # those are retrieved on first use and never retrieved if there's nothing that needs them.
+    prefetch_maps = (
+        "device42_clusters",
+        "d42_vlan_map",
+        "d42_device_map",
+        "d42_netports",
+        "d42_ipaddr_default_cfs",
+        "d42_port_default_cfs",
+    )
+
+    def __init__(self, *args, job: Job, sync=None, client, dns_resolver: Optional[DNSResolver] = None, **kwargs):
         """Initialize Device42Adapter.
 
         Args:
             job (Job): Nautobot Job.
             sync (object, optional): Nautobot DiffSync. Defaults to None.
             client (object): Device42API client connection object.
+            dns_resolver (DNSResolver, optional): Resolver used when `use_dns` is enabled. Defaults to None for one
+                configured from the plugin settings.
         """
         super().__init__(*args, **kwargs)
         self.job = job
         self.sync = sync
         self.device42_hardware_dict = {}
         self.device42 = client
-        self.device42_clusters = self.device42.get_cluster_members()
-        self.rack_elevations = {}
+        self.datasets = {}
+        if PLUGIN_CFG.get("compact_models"):
+            use_compact_models(self)
+        # rack units taken by the loaded Devices keyed by (Building, Room, Rack)
+        self.rack_occupancy = RackOccupancy()
+        self.dns_resolver = dns_resolver or DNSResolver(
+            max_workers=PLUGIN_CFG.get("dns_max_workers", 8),
+            timeout=PLUGIN_CFG.get("dns_timeout", 5.0),
+            ttl=PLUGIN_CFG.get("dns_cache_ttl", 86400),
+            negative_ttl=PLUGIN_CFG.get("dns_negative_cache_ttl", 3600),
+            path=PLUGIN_CFG.get("dns_cache_path"),
+        )
+        # loaded IPAddresses keyed by (VRF, IP version) then integer host address, see `index_ipaddr`
+        self.ipaddr_index = {}
+        # preferred management interface of each Device keyed by Device name, see `index_mgmt_intf`
+        self.mgmt_intf_index = {}
 
         # mapping of SiteCode (facility) to Building name
         self.d42_building_sitecode_map = {}
-        # mapping of Building PK to Building info
-        self.d42_building_map = self.device42.get_building_pks()
-        # mapping of Customer PK to Customer info
-        self.d42_customer_map = self.device42.get_customer_pks()
-        # mapping of Room PK to Room info
-        self.d42_room_map = self.device42.get_room_pks()
-        # mapping of Rack PK to Rack info
-        self.d42_rack_map = self.device42.get_rack_pks()
-        # mapping of VLAN PK to VLAN name and ID
-        self.d42_vlan_map = self.device42.get_vlan_info()
-        # mapping of Device PK to Device name
-        self.d42_device_map = self.device42.get_device_pks()
-        # mapping of Port PK to Port name
-        self.d42_port_map = self.device42.get_port_pks()
-        # mapping of Vendor PK to Vendor info
-        self.d42_vendor_map = self.device42.get_vendor_pks()
-        # default custom fields for IP Address
-        self.d42_ipaddr_default_cfs = self.device42.get_ipaddr_default_custom_fields()
+        self.prefetch_lookup_maps(self.prefetch_maps)
+
+    def __getattr__(self, name: str):
+        """Retrieve a lookup map from Device42 the first time it's accessed if it wasn't prefetched."""
+        if name in type(self).lookup_maps and "device42" in self.__dict__:
+            value = self.retrieve(self.lookup_maps[name])
+            setattr(self, name, value)
+            return value
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    @property
+    def d42_port_map(self) -> dict:
+        """Ports of Devices keyed by primary key with their name, MAC address and Device, derived from `d42_netports`."""
+        if "_d42_port_map" not in self.__dict__:
+            self._d42_port_map = netport_pk_map(self.d42_netports)  # pylint: disable=attribute-defined-outside-init
+        return self._d42_port_map
+
+    @property
+    def cluster_member_index(self) -> dict:
+        """Cluster and VC position of every cluster member Device, rebuilt whenever `device42_clusters` is replaced."""
+        cached = self.__dict__.get("_cluster_member_index")
+        if cached is None or cached[0] is not self.device42_clusters:
+            cached = (self.device42_clusters, build_vc_member_index(self.device42_clusters))
+            self._cluster_member_index = cached  # pylint: disable=attribute-defined-outside-init
+        return cached[1]
+
+    def prefetch_lookup_maps(self, names: tuple):
+        """Retrieve the named lookup maps from Device42 concurrently, bounded by `max_concurrent_datasets`.
 
+        Args:
+            names (tuple): Names of the lookup maps to retrieve, as found in `lookup_maps`.
+        """
+        if not names:
+            return
+
+        def fetch(name: str):
+            start = time.perf_counter()
+            value = self.retrieve(self.lookup_maps[name])
+            return name, value, time.perf_counter() - start
+
+        max_workers = min(max(1, PLUGIN_CFG.get("max_concurrent_datasets", 1)), len(names))
+        start = time.perf_counter()
+        if max_workers > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(fetch, names))
+        else:
+            results = [fetch(name) for name in names]
+        for name, value, _ in results:
+            setattr(self, name, value)
+        timings = ", ".join(f"{name} {elapsed:.2f}s" for name, _, elapsed in results)
+        self.job.log_debug(
+            message=f"Retrieved lookup maps from Device42 in {time.perf_counter() - start:.2f}s: {timings}."
+        )
+
+    def prefetch_datasets(self):
+        """Retrieve the datasets used by the loaders concurrently.
+
+        This is only done when `max_concurrent_datasets` is greater than 1, otherwise each dataset is retrieved as it's
+        loaded.
+        """
+        max_concurrency = PLUGIN_CFG.get("max_concurrent_datasets", 1)
+        if max_concurrency <= 1:
+            return
+        self.job.log_info(
+            message=f"Retrieving {len(self.prefetch)} datasets from Device42, {max_concurrency} at a time."
+        )
+        start = time.perf_counter()
+        with AsyncDevice42API(client=self.device42, max_concurrency=max_concurrency) as async_client:
+            self.datasets = async_client.fetch(
+                *self.prefetch,
+                kwargs={name: {"columns": DATASET_COLUMNS[name]} for name in self.prefetch if name in DATASET_COLUMNS},
+            )
+        self.job.log_info(message=f"Retrieved datasets from Device42 in {time.perf_counter() - start:.1f} seconds.")
+
+    def get_dataset(self, name: str):
+        """Return the dataset retrieved by the Device42API method `name`, using the prefetched copy if available.
+
+        A prefetched dataset is only handed out once so it isn't held in memory for the remainder of the sync.
+
+        Args:
+            name (str): Name of the Device42API method, ie `get_buildings`.
+
+        Returns:
+            Any: Dataset returned from Device42.
+        """
+        if name in self.datasets:
+            return self.datasets.pop(name)
+        return self.retrieve(name)
+
+    def retrieve(self, name: str):
+        """Retrieve a dataset from Device42 with only the columns declared by the loaders using it.
+
+        Args:
+            name (str): Name of the Device42API method, ie `get_buildings`.
+
+        Returns:
+            Any: Dataset returned from Device42.
+        """
+        if name in DATASET_COLUMNS:
+            return getattr(self.device42, name)(columns=DATASET_COLUMNS[name])
+        return getattr(self.device42, name)()
+
+    @uses_columns("get_devices", "name", "customer", "building")
     def get_building_for_device(self, dev_record: dict) -> str:
         """Method to determine the Building (Site) for a Device.
 
@@ -187,13 +367,23 @@ class Device42Adapter(DiffSync):
             return slugify(_building)
         return ""
 
+    @uses_columns(
+        "get_buildings",
+        "name",
+        "address",
+        "latitude",
+        "longitude",
+        "contact_name",
+        "contact_phone",
+        "rooms",
+        "custom_fields",
+        "tags",
+    )
     def load_buildings(self):
         """Load Device42 buildings."""
-        for record in self.device42.get_buildings():
+        for record in self.get_dataset("get_buildings"):
             self.job.log_info(message=f"Loading {record['name']} building from Device42.")
-            _tags = record["tags"] if record.get("tags") else []
-            if len(_tags) > 1:
-                _tags.sort()
+            _tags = TagSet.of(record.get("tags"))
             building = self.building(
                 name=record["name"],
                 address=sanitize_string(record["address"]) if record.get("address") else "",
@@ -215,18 +405,13 @@ class Device42Adapter(DiffSync):
                 if self.job.kwargs.get("debug"):
                     self.job.log_warning(message=f"{record['name']} is already loaded. {err}")
 
+    @uses_columns("get_rooms", "name", "building", "notes", "custom_fields", "tags")
     def load_rooms(self):
         """Load Device42 rooms."""
-        for record in self.device42.get_rooms():
+        for record in self.get_dataset("get_rooms"):
             self.job.log_info(message=f"Loading {record['name']} room from Device42.")
-            _tags = record["tags"] if record.get("tags") else []
-            if len(_tags) > 1:
-                _tags.sort()
+            _tags = TagSet.of(record.get("tags"))
             if record.get("building"):
-                if record["building"] not in self.rack_elevations:
-                    self.rack_elevations[record["building"]] = {}
-                if record["name"] not in self.rack_elevations[record["building"]]:
-                    self.rack_elevations[record["building"]][record["name"]] = {}
                 room = self.room(
                     name=record["name"],
                     building=record["building"],
@@ -246,17 +431,16 @@ class Device42Adapter(DiffSync):
                 self.job.log_warning(message=f"{record['name']} is missing Building and won't be imported.")
                 continue
 
+    @uses_columns(
+        "get_racks", "name", "building", "room", "size", "numbering_start_from_bottom", "custom_fields", "tags"
+    )
     def load_racks(self):
         """Load Device42 racks."""
         self.job.log_info(message="Loading racks from Device42.")
-        for record in self.device42.get_racks():
-            _tags = record["tags"] if record.get("tags") else []
-            if len(_tags) > 1:
-                _tags.sort()
+        for record in self.get_dataset("get_racks"):
+            _tags = TagSet.of(record.get("tags"))
             if record.get("building") and record.get("room"):
-                self.rack_elevations[record["building"]][record["room"]][record["name"]] = {
-                    slot: [] for slot in range(1, record["size"] + 1)
-                }
+                self.rack_occupancy.add_rack((record["building"], record["room"], record["name"]), record["size"] or 1)
                 rack = self.rack(
                     name=record["name"],
                     building=record["building"],
@@ -280,9 +464,10 @@ class Device42Adapter(DiffSync):
                 self.job.log_warning(message=f"{record['name']} is missing Building and Room and won't be imported.")
                 continue
 
+    @uses_columns("get_vendors", "name", "custom_fields")
     def load_vendors(self):
         """Load Device42 vendors."""
-        for _vendor in self.device42.get_vendors():
+        for _vendor in self.get_dataset("get_vendors"):
             self.job.log_info(message=f"Loading vendor {_vendor['name']} from Device42.")
             vendor = self.vendor(
                 name=_vendor["name"],
@@ -291,9 +476,10 @@ class Device42Adapter(DiffSync):
             )
             self.add(vendor)
 
+    @uses_columns("get_hardware_models", "name", "manufacturer", "size", "depth", "part_no", "custom_fields")
     def load_hardware_models(self):
         """Load Device42 hardware models."""
-        for _model in self.device42.get_hardware_models():
+        for _model in self.get_dataset("get_hardware_models"):
             self.job.log_info(message=f"Loading hardware model {_model['name']} from Device42.")
             if _model.get("manufacturer"):
                 model = self.hardware(
@@ -321,11 +507,11 @@ class Device42Adapter(DiffSync):
         Returns:
             str: Name of cluster device is part of or empty string.
         """
-        for _cluster, _info in self.device42_clusters.items():
-            if device in _info["members"]:
-                return _cluster
+        if device in self.cluster_member_index:
+            return self.cluster_member_index[device][0]
         return ""
 
+    @uses_columns("get_devices", "name", "type", "tags", "custom_fields", "in_service")
     def load_cluster(self, cluster_info: dict):
         """Load Device42 clusters into DiffSync model.
 
@@ -343,12 +529,10 @@ class Device42Adapter(DiffSync):
         except ObjectNotFound:
             self.job.log_info(message=f"Cluster {cluster_info['name']} being loaded from Device42.")
             _clus = self.device42_clusters[cluster_info["name"]]
-            _tags = cluster_info["tags"] if cluster_info.get("tags") else []
-            if PLUGIN_CFG.get("ignore_tag") and PLUGIN_CFG["ignore_tag"] in _tags:
+            _tags = TagSet.of(cluster_info.get("tags"))
+            if get_rules(PLUGIN_CFG).is_ignored(_tags):
                 self.job.log_warning(message=f"Cluster {cluster_info['name']} has ignore tag so skipping.")
                 return
-            if len(_tags) > 1:
-                _tags.sort()
             _cluster = self.cluster(
                 name=cluster_info["name"][:64],
                 members=_clus["members"],
@@ -380,10 +564,26 @@ class Device42Adapter(DiffSync):
             )
             self.add(_device)
 
+    @uses_columns(
+        "get_devices",
+        "name",
+        "type",
+        "hw_model",
+        "tags",
+        "start_at",
+        "room",
+        "rack",
+        "orientation",
+        "os",
+        "osver",
+        "in_service",
+        "serial_no",
+        "custom_fields",
+    )
     def load_devices_and_clusters(self):
         """Load Device42 devices."""
         self.job.log_info(message="Retrieving devices from Device42.")
-        _devices = self.device42.get_devices()
+        _devices = self.get_dataset("get_devices")
 
         # Add all Clusters first
         for _record in _devices:
@@ -409,52 +609,35 @@ class Device42Adapter(DiffSync):
                         message=f"Unable to find hardware model {_record['hw_model']} for {_record['name']} so it will not be loaded. {err}"
                     )
                     continue
-                _tags = _record["tags"] if _record.get("tags") else []
-                if PLUGIN_CFG.get("ignore_tag") and PLUGIN_CFG["ignore_tag"] in _tags:
+                _tags = TagSet.of(_record.get("tags"))
+                if get_rules(PLUGIN_CFG).is_ignored(_tags):
                     self.job.log_warning(
                         message=f"Skipping loading {_record['name']} as it has the specified ignore tag."
                     )
                     continue
-                if len(_tags) > 1:
-                    _tags.sort()
-                # Get size of model to ensure appropriate number of rack Us are filled
-                if model:
-                    model_size = int(model.size)
-                    if _record.get("start_at"):
-                        rack_position = int(_record["start_at"])
-                        for slot in range(rack_position, rack_position + model_size + 1):
-                            if _building not in self.rack_elevations:
-                                self.rack_elevations[_building] = {}
-
-                            if _record["room"] not in self.rack_elevations[_building]:
-                                self.rack_elevations[_building][_record["room"]] = {}
-
-                            if _record["rack"] not in self.rack_elevations[_building][_record["room"]]:
-                                self.rack_elevations[_building][_record["room"]][_record["rack"]] = {}
-
-                            if slot not in self.rack_elevations[_building][_record["room"]][_record["rack"]]:
-                                self.rack_elevations[_building][_record["room"]][_record["rack"]][slot] = []
-
-                            self.rack_elevations[_building][_record["room"]][_record["rack"]][slot].append(
-                                _record["name"][:64]
-                            )
-
-                        if (
-                            len(
-                                self.rack_elevations[_building][_record["room"]][_record["rack"]][
-                                    int(_record["start_at"])
-                                ]
+                _orientation = "front" if _record.get("orientation") == 1 else "rear"
+                # Only the first Device placed in a rack unit keeps its position. Racks are keyed by their Device42
+                # Building, as in load_racks, rather than the Site the Device is mapped to.
+                if model and _record.get("start_at"):
+                    rack_position = int(_record["start_at"])
+                    if not self.rack_occupancy.reserve(
+                        (_record.get("building"), _record["room"], _record["rack"]),
+                        position=rack_position,
+                        size=int(model.size),
+                        faces=face_mask(_orientation, full_depth=model.depth == "Full Depth"),
+                    ):
+                        if self.job.kwargs.get("debug"):
+                            self.job.log_warning(
+                                message=f"Rack position {rack_position} of {_record['name']} in {_record['rack']} is already taken so it won't be set."
                             )
-                            > 1
-                        ):
-                            rack_position = None
+                        rack_position = None
                 _device = self.device(
                     name=_record["name"][:64],
                     building=_building,
                     room=_record["room"] if _record.get("room") else "",
                     rack=_record["rack"] if _record.get("rack") else "",
                     rack_position=rack_position,
-                    rack_orientation="front" if _record.get("orientation") == 1 else "rear",
+                    rack_orientation=_orientation,
                     hardware=sanitize_string(_record["hw_model"]),
                     os=get_netmiko_platform(_record["os"][:100]) if _record.get("os") else "",
                     os_version=re.sub(r"^[a-zA-Z]+\s", "", _record["osver"]) if _record.get("osver") else "",
@@ -495,7 +678,10 @@ class Device42Adapter(DiffSync):
                 _device.vc_position = 1
             else:
                 _device.vc_position = determine_vc_position(
-                    vc_map=self.device42_clusters, virtual_chassis=cluster_host, device_name=_record["name"]
+                    vc_map=self.device42_clusters,
+                    virtual_chassis=cluster_host,
+                    device_name=_record["name"],
+                    member_index=self.cluster_member_index,
                 )
 
     def assign_version_to_master_devices(self):
@@ -521,12 +707,11 @@ class Device42Adapter(DiffSync):
 
     def load_ports(self):
         """Load Device42 ports."""
-        vlan_ports = self.device42.get_ports_with_vlans()
-        no_vlan_ports = self.device42.get_ports_wo_vlans()
-        merged_ports = self.filter_ports(vlan_ports, no_vlan_ports)
-        default_cfs = self.device42.get_port_default_custom_fields()
-        _cfs = self.device42.get_port_custom_fields()
-        for _port in merged_ports:
+        default_cfs = self.d42_port_default_cfs
+        _cfs = self.get_dataset("get_port_custom_fields")
+        for _port in self.d42_netports:
+            if _port["port_name"] is None or (not _port["device_name"] and not _port.get("second_device_fk")):
+                continue
             if _port.get("second_device_fk"):
                 _device_name = self.d42_device_map[_port["second_device_fk"]]["name"]
             else:
@@ -545,10 +730,9 @@ class Device42Adapter(DiffSync):
                 continue
             if self.job.kwargs.get("debug"):
                 self.job.log_info(message=f"Loading Port {_port_name} for Device {_device_name}")
-            _tags = _port["tags"].split(",") if _port.get("tags") else []
-            if len(_tags) > 1:
-                _tags.sort()
-            _status = get_intf_status(port=_port)
+            _tags = TagSet.of(_port.get("tags"))
+            # The status of Ports without VLANs has only ever reflected their admin state, so `up` is left out for them.
+            _status = get_intf_status(port=_port if _port.get("vlan_pks") else {"up_admin": _port["up_admin"]})
             try:
                 self.get(self.port, {"device": _device_name, "name": _port_name})
             except ObjectNotFound:
@@ -586,35 +770,27 @@ class Device42Adapter(DiffSync):
                     new_port.custom_fields = _cfs[_device_name][_port_name]
                 self.add(new_port)
                 _dev.add_child(new_port)
+                self.index_mgmt_intf(new_port)
 
-    @staticmethod
-    def filter_ports(vlan_ports: List[dict], no_vlan_ports: List[dict]) -> List[dict]:
-        """Method to combine lists of ports while removing duplicates.
+    def index_mgmt_intf(self, port: dcim.Port):
+        """Remember `port` as its Device's management interface if it's preferred by `mgmt_interface_names`.
 
         Args:
-            vlan_ports (List[dict]): List of Ports with tagged VLANs.
-            no_vlan_ports (List[dict]): List of Ports without VLANs.
-
-        Returns:
-            List[dict]: Merged list of Ports with duplicates removed.
+            port (Port): DiffSyncModel Port object that was loaded.
         """
-        no_vlan_ports_only = []
-        for no_vlan_port in no_vlan_ports:
-            for vlan_port in vlan_ports:
-                if no_vlan_port["netport_pk"] == vlan_port["netport_pk"]:
-                    break
-            else:
-                no_vlan_ports_only.append(no_vlan_port)
-        return vlan_ports + no_vlan_ports_only
+        rank = get_rules(PLUGIN_CFG).mgmt_interface_rank(port.name)
+        if rank is None:
+            return
+        current = self.mgmt_intf_index.get(port.device)
+        if current is None or rank < current[0]:
+            self.mgmt_intf_index[port.device] = (rank, port)
 
     def load_vrfgroups(self):
         """Load Device42 VRFGroups."""
-        for _grp in self.device42.get_vrfgroups():
+        for _grp in self.get_dataset("get_vrfgroups"):
             self.job.log_info(message=f"Loading VRF group {_grp['name']} from Device42.")
             try:
-                _tags = _grp["tags"] if _grp.get("tags") else []
-                if len(_tags) > 1:
-                    _tags.sort()
+                _tags = TagSet.of(_grp.get("tags"))
                 new_vrf = self.vrf(
                     name=_grp["name"],
                     description=_grp["description"],
@@ -631,12 +807,10 @@ class Device42Adapter(DiffSync):
     def load_subnets(self):
         """Load Device42 Subnets."""
         self.job.log_info(message="Loading Subnets from Device42.")
-        default_cfs = self.device42.get_subnet_default_custom_fields()
-        _cfs = self.device42.get_subnet_custom_fields()
-        for _pf in self.device42.get_subnets():
-            _tags = _pf["tags"].split(",") if _pf.get("tags") else []
-            if len(_tags) > 1:
-                _tags.sort()
+        default_cfs = self.get_dataset("get_subnet_default_custom_fields")
+        _cfs = self.get_dataset("get_subnet_custom_fields")
+        for _pf in self.get_dataset("get_subnets"):
+            _tags = TagSet.of(_pf.get("tags"))
             if _pf["mask_bits"] != 0:
                 try:
                     new_pf = self.subnet(
@@ -665,7 +839,7 @@ class Device42Adapter(DiffSync):
     def load_ip_addresses(self):
         """Load Device42 IP Addresses."""
         self.job.log_info(message="Loading IP Addresses from Device42.")
-        _cfs = self.device42.get_ipaddr_custom_fields()
+        _cfs = self.get_dataset("get_ipaddr_custom_fields")
         for _ip in self.device42.get_ip_addrs():
             _ipaddr = f"{_ip['ip_address']}/{str(_ip['netmask'])}"
             try:
@@ -689,7 +863,7 @@ class Device42Adapter(DiffSync):
                     except ObjectNotFound:
                         # if the Device isn't being imported there's no reason to have the Device name and interface for it to try and match
                         _device_name, _port_name = "", ""
-                _tags = sorted(_ip["tags"].split(",")) if _ip.get("tags") != "" else []
+                _tags = TagSet.of(_ip.get("tags"))
                 new_ip = self.ipaddr(
                     address=_ipaddr,
                     available=_ip["available"],
@@ -705,6 +879,7 @@ class Device42Adapter(DiffSync):
                 if _cfs.get(_ipaddr):
                     new_ip.custom_fields = _cfs[_ipaddr]
                 self.add(new_ip)
+                self.index_ipaddr(new_ip)
             except ObjectAlreadyExists as err:
                 if self.job.kwargs.get("debug"):
                     self.job.log_warning(message=f"IP Address {_ipaddr} already exists.{err}")
@@ -712,15 +887,18 @@ class Device42Adapter(DiffSync):
 
     def load_vlans(self):
         """Load Device42 VLANs."""
-        _vlans = self.device42.get_vlans_with_location()
-        for _info in _vlans:
+        _vlans = {}
+        for _port in self.d42_netports:
+            for _pk, _name in zip(_port.get("vlan_pks") or [], _port.get("vlan_names") or []):
+                if _name is not None and _pk in self.d42_vlan_map and self.d42_vlan_map[_pk]["vid"] != 0:
+                    _vlans.setdefault((_pk, _name, _port["building"], _port["customer"]), None)
+        for _pk, _name, _building, _customer in _vlans:
+            _info = {**self.d42_vlan_map[_pk], "vlan_name": _name, "building": _building, "customer": _customer}
             _vlan_name = _info["vlan_name"].strip()
             building = None
-            if _info["vlan_pk"] in self.d42_vlan_map and self.d42_vlan_map[_info["vlan_pk"]].get("custom_fields"):
-                _cfs = get_custom_field_dict(self.d42_vlan_map[_info["vlan_pk"]]["custom_fields"])
-            else:
-                _cfs = {}
-            tags = _info["tags"].split(",").sort() if _info.get("tags") else []
+            # get_vlan_info has already keyed the custom fields by name.
+            _cfs = _info.get("custom_fields", {})
+            tags = TagSet.of(_info.get("tags"))
             if is_truthy(PLUGIN_CFG.get("customer_is_facility")) and _info.get("customer"):
                 building = self.d42_building_sitecode_map[_info["customer"].upper()]
             elif _info.get("building"):
@@ -766,6 +944,7 @@ class Device42Adapter(DiffSync):
                     self.job.log_warning(message=err)
                 continue
 
+    @uses_columns("get_vendor_pks", "name", "notes", "home_page", "account_no", "escalation_1", "escalation_2")
     def load_provider(self, provider_info: dict):
         """Load Device42 Providers."""
         _prov = self.d42_vendor_map[provider_info["vendor_fk"]]
@@ -784,11 +963,31 @@ class Device42Adapter(DiffSync):
             )
             self.add(new_provider)
 
+    @uses_columns(
+        "get_telcocircuits",
+        "vendor_fk",
+        "circuit_id",
+        "notes",
+        "type_name",
+        "status",
+        "turn_on_date",
+        "provision_date",
+        "bandwidth",
+        "unit",
+        "tags",
+        "origin_type",
+        "origin_netport_fk",
+        "origin_patchpanelport_fk",
+        "end_point_type",
+        "end_point_netport_fk",
+        "end_point_patchpanelport_fk",
+    )
+    @uses_columns("get_patch_panel_port_pks", "number", "name")
     def load_providers_and_circuits(self):
         """Load Device42 Providrs and Telco Circuits."""
-        _circuits = self.device42.get_telcocircuits()
+        _circuits = self.get_dataset("get_telcocircuits")
         origin_int, origin_dev, endpoint_int, endpoint_dev = False, False, False, False
-        ppanel_ports = self.device42.get_patch_panel_port_pks()
+        ppanel_ports = self.get_dataset("get_patch_panel_port_pks")
         for _tc in _circuits:
             self.load_provider(_tc)
             if _tc["origin_type"] == "Device Port" and _tc["origin_netport_fk"] is not None:
@@ -815,7 +1014,7 @@ class Device42Adapter(DiffSync):
                 endpoint_int=endpoint_int if endpoint_int else None,
                 endpoint_dev=endpoint_dev if endpoint_dev else None,
                 bandwidth=name_to_bits(f"{_tc['bandwidth']}{_tc['unit'].capitalize()}") / 1000,
-                tags=_tc["tags"].split(",") if _tc.get("tags") else [],
+                tags=TagSet.of(_tc.get("tags")),
                 uuid=None,
             )
             self.add(new_circuit)
@@ -855,18 +1054,33 @@ class Device42Adapter(DiffSync):
                 self.add(z_side_conn)
 
     def check_dns(self):
-        """Method to check if a Device has a DNS record and assign as primary if so."""
+        """Method to check if a Device has a DNS record and assign as primary if so.
+
+        The FQDNs of all Devices are resolved concurrently up front so assigning each Device's primary IP is served from
+        the resolver's cache.
+        """
+        _devices = []
         for _device in self.store.get_all(model=dcim.Device):
             if not re.search(r"\s-\s\w+\s?\d+", _device.name) and not re.search(
                 r"AP[A-F0-9]{4}\.[A-F0-9]{4}.[A-F0-9]{4}", _device.name
             ):
-                self.set_primary_from_dns(dev_name=_device.name)
+                _devices.append(_device.name)
             else:
                 self.job.log_warning(message=f"Skipping {_device.name} due to invalid Device name.")
-                continue
+        _fqdns = [_fqdn.group() for _fqdn in map(FQDN_PATTERN.search, _devices) if _fqdn]
+        start = time.perf_counter()
+        self.dns_resolver.resolve_all(_fqdns)
+        self.job.log_info(
+            message=f"Resolved {len(_fqdns)} Device FQDNs in {time.perf_counter() - start:.1f} seconds: "
+            + ", ".join(f"{count} {name}" for name, count in self.dns_resolver.stats.items())
+            + "."
+        )
+        for _device_name in _devices:
+            self.set_primary_from_dns(dev_name=_device_name)
+        self.dns_resolver.save()
 
     def get_management_intf(self, dev_name: str):
-        """Method to find a Device's management interface or create one if one doesn't exist.
+        """Method to find a Device's management interface from the interfaces indexed while loading Ports.
 
         Args:
             dev_name (str): Name of Device to find Management interface.
@@ -874,20 +1088,8 @@ class Device42Adapter(DiffSync):
         Returns:
             Port: DiffSyncModel Port object that's assumed to be Management interface if found. False if not found.
         """
-        try:
-            _intf = self.get(self.port, {"device": dev_name, "name": "mgmt0"})
-        except ObjectNotFound:
-            try:
-                _intf = self.get(self.port, {"device": dev_name, "name": "management"})
-            except ObjectNotFound:
-                try:
-                    _intf = self.get(self.port, {"device": dev_name, "name": "management0"})
-                except ObjectNotFound:
-                    try:
-                        _intf = self.get(self.port, {"device": dev_name, "name": "Management"})
-                    except ObjectNotFound:
-                        return False
-        return _intf
+        _intf = self.mgmt_intf_index.get(dev_name)
+        return _intf[1] if _intf else False
 
     def add_management_interface(self, dev_name: str):
         """Method to add a Management interface DiffSyncModel object.
@@ -904,7 +1106,7 @@ class Device42Adapter(DiffSync):
             mode="access",
             mtu=1500,
             mac_addr="",
-            custom_fields=self.device42.get_port_default_custom_fields(),
+            custom_fields=self.d42_port_default_cfs,
             tags=[],
             status="active",
             uuid=None,
@@ -913,6 +1115,7 @@ class Device42Adapter(DiffSync):
             self.add(_intf)
             _device = self.get(self.device, dev_name)
             _device.add_child(_intf)
+            self.mgmt_intf_index.setdefault(dev_name, (len(get_rules(PLUGIN_CFG).mgmt_interface_names), _intf))
             return _intf
         except ObjectAlreadyExists as err:
             self.job.log_warning(message=f"Management interface for {dev_name} already exists. {err}")
@@ -925,12 +1128,12 @@ class Device42Adapter(DiffSync):
         Args:
             dev_name (str): Name of Device to perform DNS query on.
         """
-        _devname = re.search(r"[a-zA-Z0-9\.\/\?\:\-_=#]+\.[a-zA-Z]{2,6}", dev_name)
+        _devname = FQDN_PATTERN.search(dev_name)
         if _devname:
             _devname = _devname.group()
         else:
             return ""
-        _a_record = get_dns_a_record(dev_name=_devname)
+        _a_record = get_dns_a_record(dev_name=_devname, resolver=self.dns_resolver)
         if _a_record:
             self.job.log_info(message=f"A record found for {_devname} {_a_record}.")
             _ip = self.find_ipaddr(address=_a_record)
@@ -948,25 +1151,42 @@ class Device42Adapter(DiffSync):
         else:
             self.job.log_warning(message=f"A record not found for {_devname}.")
 
+    def index_ipaddr(self, ipaddr: ipam.IPAddress):
+        """Method to add an IPAddress DiffSyncModel object to the host address index used by `find_ipaddr`.
+
+        Only the IPAddress with the longest prefix is kept for each host address in a VRF.
+
+        Args:
+            ipaddr (IPAddress): IPAddress DiffSyncModel object that has been loaded.
+        """
+        try:
+            _intf = ipaddress.ip_interface(ipaddr.address)
+        except ValueError:
+            return
+        _prefixlen = _intf.network.prefixlen
+        if _prefixlen == 0:
+            return
+        _index = self.ipaddr_index.setdefault((ipaddr.vrf, _intf.version), {})
+        _current = _index.get(int(_intf.ip))
+        if _current is None or _current[0] < _prefixlen:
+            _index[int(_intf.ip)] = (_prefixlen, ipaddr)
+
     def find_ipaddr(self, address: str):
-        """Method to find IPAddress DiffSyncModel object."""
-        if ":" in address:
-            bits = 128
-        else:
-            bits = 32
+        """Method to find IPAddress DiffSyncModel object.
 
-        while bits > 0:
-            _addr = f"{address}/{bits}"
-            for _vrf in self.get_all("vrf"):
-                try:
-                    return self.get(self.ipaddr, {"address": _addr, "vrf": _vrf.name})
-                except ObjectNotFound:
-                    pass
-            try:
-                return self.get(self.ipaddr, {"address": _addr, "vrf": None})
-            except ObjectNotFound:
-                bits = bits - 1
-        return False
+        The IPAddress with the longest prefix for the host address is returned. When several VRFs have the same prefix
+        length the first VRF loaded wins, with IPAddresses outside of a VRF considered last.
+        """
+        try:
+            _addr = ipaddress.ip_address(address)
+        except ValueError:
+            return False
+        _found, _longest = False, 0
+        for _vrf in [_vrf.name for _vrf in self.get_all("vrf")] + [None]:
+            _entry = self.ipaddr_index.get((_vrf, _addr.version), {}).get(int(_addr))
+            if _entry and _entry[0] > _longest:
+                _longest, _found = _entry
+        return _found
 
     def add_ipaddr(self, address: str, dev_name: str, interface: str):
         """Method to add IPAddress DiffSyncModel object if one isn't found.
@@ -986,11 +1206,16 @@ class Device42Adapter(DiffSync):
             uuid=None,
         )
         self.add(_ip)
+        self.index_ipaddr(_ip)
         return _ip
 
+    @uses_columns("get_customer_pks", "name")
+    @uses_columns("get_building_pks", "name")
+    @uses_columns("get_room_pks", "name")
+    @uses_columns("get_rack_pks", "name")
     def load_patch_panels_and_ports(self):
         """Load Device42 Patch Panels and Patch Panel Ports."""
-        panels = self.device42.get_patch_panels()
+        panels = self.get_dataset("get_patch_panels")
         for panel in panels:
             _building, _room, _rack = None, None, None
             if PLUGIN_CFG.get("hostname_mapping") and len(PLUGIN_CFG["hostname_mapping"]) > 0:
@@ -1079,6 +1304,7 @@ class Device42Adapter(DiffSync):
 
     def load(self):
         """Load data from Device42."""
+        self.prefetch_datasets()
         self.load_buildings()
         self.load_rooms()
         self.load_racks()
@@ -29,8 +29,10 @@ from nautobot.ipam.models import VLAN, VRF, IPAddress, Prefix
 from netutils.lib_mapper import ANSIBLE_LIB_MAPPER
 
 from nautobot_ssot_device42.constant import PLUGIN_CFG
+from nautobot_ssot_device42.diffsync.models.compact import use_compact_models
 from nautobot_ssot_device42.diffsync.models.nautobot import assets, circuits, dcim, ipam
 from nautobot_ssot_device42.utils import nautobot
+from nautobot_ssot_device42.utils.racks import RackOccupancy, face_mask
 
 try:
     from nautobot_device_lifecycle_mgmt.models import SoftwareLCM
@@ -116,6 +118,10 @@ class NautobotAdapter(DiffSync):
         self.sync = sync
         self.objects_to_delete = defaultdict(list)
         self.objects_to_create = defaultdict(list)
+        if PLUGIN_CFG.get("compact_models"):
+            use_compact_models(self)
+        # rack units taken by Devices keyed by Rack ID, see `reserve_rack_units`
+        self.rack_occupancy = RackOccupancy()
 
     def sync_complete(self, source: DiffSync, *args, **kwargs):
         """Clean up function for DiffSync sync.
@@ -511,6 +517,7 @@ class NautobotAdapter(DiffSync):
             if rack.name not in self.rack_map[rack.site.slug][rack.group.slug]:
                 self.rack_map[rack.site.slug][rack.group.slug][rack.name] = {}
             self.rack_map[rack.site.slug][rack.group.slug][rack.name] = rack.id
+            self.rack_occupancy.add_rack(rack.id, rack.u_height)
             try:
                 new_rack = self.rack(
                     name=rack.name,
@@ -578,6 +585,7 @@ class NautobotAdapter(DiffSync):
             "status", "device_type", "device_role", "site", "rack", "platform", "vc_master_for", "virtual_chassis"
         ).all():
             self.device_map[dev.name] = dev.id
+            self.reserve_rack_units(dev)
             # As patch panels are added as Devices, we need to filter them out for their own load method.
             if DeviceRole.objects.get(id=dev.device_role.id).name == "patch panel":
                 patch_panel = self.patchpanel(
@@ -633,6 +641,20 @@ class NautobotAdapter(DiffSync):
                         _dev.master_device = True
             self.add(_dev)
 
+    def reserve_rack_units(self, dev: Device):
+        """Mark the rack units taken by an existing Device so Devices created in them are left without a position.
+
+        Args:
+            dev (Device): Device loaded from Nautobot.
+        """
+        if dev.rack_id and dev.position:
+            self.rack_occupancy.reserve(
+                dev.rack_id,
+                position=int(dev.position),
+                size=int(dev.device_type.u_height),
+                faces=face_mask(dev.face, full_depth=dev.device_type.is_full_depth),
+            )
+
     def load_interfaces(self):
         """Add Nautobot Interface objects as DiffSync Port models."""
         for port in Interface.objects.select_related("device", "status").all():
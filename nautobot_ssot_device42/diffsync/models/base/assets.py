@@ -5,6 +5,8 @@ from uuid import UUID
 
 from diffsync import DiffSyncModel
 
+from nautobot_ssot_device42.utils.interning import InternedStr
+
 
 class PatchPanel(DiffSyncModel):
     """Base Patch Panel model."""
@@ -27,14 +29,14 @@ class PatchPanel(DiffSyncModel):
 
     name: str
     in_service: bool
-    vendor: str
-    model: str
-    orientation: str
+    vendor: InternedStr
+    model: InternedStr
+    orientation: InternedStr
     position: Optional[float]
     num_ports: int
-    building: Optional[str]
-    room: Optional[str]
-    rack: Optional[str]
+    building: Optional[InternedStr]
+    room: Optional[InternedStr]
+    rack: Optional[InternedStr]
     serial_no: Optional[str]
     uuid: Optional[UUID]
 
@@ -48,8 +50,8 @@ class PatchPanelRearPort(DiffSyncModel):
     _children = {}
 
     name: str
-    patchpanel: str
-    port_type: str
+    patchpanel: InternedStr
+    port_type: InternedStr
     uuid: Optional[UUID]
 
 
@@ -62,6 +64,6 @@ class PatchPanelFrontPort(DiffSyncModel):
     _children = {}
 
     name: str
-    patchpanel: str
-    port_type: str
+    patchpanel: InternedStr
+    port_type: InternedStr
     uuid: Optional[UUID]
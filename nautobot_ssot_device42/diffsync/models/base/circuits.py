@@ -1,10 +1,12 @@
 """Base Circuit subclasses DiffSyncModel for nautobot_ssot_device42 data sync."""
 
-from typing import List, Optional
+from typing import Optional
 from uuid import UUID
 
 from diffsync import DiffSyncModel
 
+from nautobot_ssot_device42.utils.interning import InternedStr, TagSet
+
 
 class Provider(DiffSyncModel):
     """Base Provider model."""
@@ -20,7 +22,7 @@ class Provider(DiffSyncModel):
     vendor_acct: Optional[str]
     vendor_contact1: Optional[str]
     vendor_contact2: Optional[str]
-    tags: Optional[List[str]]
+    tags: Optional[TagSet]
     uuid: Optional[UUID]
 
 
@@ -46,15 +48,15 @@ class Circuit(DiffSyncModel):
     )
     _children = {}
     circuit_id: str
-    provider: str
+    provider: InternedStr
     notes: Optional[str]
-    type: str
-    status: str
+    type: InternedStr
+    status: InternedStr
     install_date: Optional[str]
     origin_int: Optional[str]
-    origin_dev: Optional[str]
+    origin_dev: Optional[InternedStr]
     endpoint_int: Optional[str]
-    endpoint_dev: Optional[str]
+    endpoint_dev: Optional[InternedStr]
     bandwidth: Optional[int]
-    tags: Optional[List[str]]
+    tags: Optional[TagSet]
     uuid: Optional[UUID]
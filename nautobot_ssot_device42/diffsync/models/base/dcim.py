@@ -5,6 +5,8 @@ from uuid import UUID
 
 from diffsync import DiffSyncModel
 
+from nautobot_ssot_device42.utils.interning import InternedStr, TagSet
+
 
 class Building(DiffSyncModel):
     """Base Building model."""
@@ -20,7 +22,7 @@ class Building(DiffSyncModel):
     contact_name: Optional[str]
     contact_phone: Optional[str]
     rooms: List["Room"] = list()
-    tags: Optional[List[str]]
+    tags: Optional[TagSet]
     custom_fields: Optional[dict]
     uuid: Optional[UUID]
 
@@ -33,7 +35,7 @@ class Room(DiffSyncModel):
     _attributes = ("notes", "custom_fields")
     _children = {"rack": "racks"}
     name: str
-    building: str
+    building: InternedStr
     notes: Optional[str]
     racks: List["Rack"] = list()
     custom_fields: Optional[dict]
@@ -48,11 +50,11 @@ class Rack(DiffSyncModel):
     _attributes = ("height", "numbering_start_from_bottom", "tags", "custom_fields")
     _children = {}
     name: str
-    building: str
-    room: str
+    building: InternedStr
+    room: InternedStr
     height: int
     numbering_start_from_bottom: str
-    tags: Optional[List[str]]
+    tags: Optional[TagSet]
     custom_fields: Optional[dict]
     uuid: Optional[UUID]
 
@@ -77,7 +79,7 @@ class Hardware(DiffSyncModel):
     _attributes = ("manufacturer", "size", "depth", "part_number", "custom_fields")
     _children = {}
     name: str
-    manufacturer: str
+    manufacturer: InternedStr
     size: float
     depth: Optional[str]
     part_number: Optional[str]
@@ -94,7 +96,7 @@ class Cluster(DiffSyncModel):
     _children = {}
     name: str
     members: Optional[List[str]]
-    tags: Optional[List[str]]
+    tags: Optional[TagSet]
     custom_fields: Optional[dict]
     uuid: Optional[UUID]
 
@@ -122,20 +124,20 @@ class Device(DiffSyncModel):
         "vc_position",
     )
     _children = {"port": "interfaces"}
-    name: str
-    building: str
-    room: Optional[str]
-    rack: Optional[str]
+    name: InternedStr
+    building: InternedStr
+    room: Optional[InternedStr]
+    rack: Optional[InternedStr]
     rack_position: Optional[float]
-    rack_orientation: Optional[str]
-    hardware: str
-    os: Optional[str]
-    os_version: Optional[str]
+    rack_orientation: Optional[InternedStr]
+    hardware: InternedStr
+    os: Optional[InternedStr]
+    os_version: Optional[InternedStr]
     in_service: Optional[bool]
     interfaces: Optional[List["Port"]] = []
     serial_no: Optional[str]
-    tags: Optional[List[str]]
-    cluster_host: Optional[str]
+    tags: Optional[TagSet]
+    cluster_host: Optional[InternedStr]
     master_device: bool
     vc_position: Optional[int]
     custom_fields: Optional[dict]
@@ -160,16 +162,16 @@ class Port(DiffSyncModel):
         "custom_fields",
     )
     _children = {}
-    name: str
-    device: str
+    name: InternedStr
+    device: InternedStr
     enabled: Optional[bool]
     mtu: Optional[int]
     description: Optional[str]
     mac_addr: Optional[str]
-    type: str
-    tags: Optional[List[str]]
-    mode: str
-    status: str
+    type: InternedStr
+    tags: Optional[TagSet]
+    mode: InternedStr
+    status: InternedStr
     vlans: Optional[List[int]] = []
     custom_fields: Optional[dict]
     uuid: Optional[UUID]
@@ -183,15 +185,15 @@ class Connection(DiffSyncModel):
     _attributes = ("src_type", "dst_type")
     _children = {}
 
-    src_device: str
-    src_port: str
-    src_type: str
+    src_device: InternedStr
+    src_port: InternedStr
+    src_type: InternedStr
     src_port_mac: Optional[str]
-    dst_device: str
-    dst_port: str
-    dst_type: str
+    dst_device: InternedStr
+    dst_port: InternedStr
+    dst_type: InternedStr
     dst_port_mac: Optional[str]
-    tags: Optional[List[str]]
+    tags: Optional[TagSet]
     uuid: Optional[UUID]
 
 
@@ -1,10 +1,12 @@
 """Base IPAM subclasses DiffSyncModel for nautobot_ssot_device42 data sync."""
 
-from typing import List, Optional
+from typing import Optional
 from uuid import UUID
 
 from diffsync import DiffSyncModel
 
+from nautobot_ssot_device42.utils.interning import InternedStr, TagSet
+
 
 class VRFGroup(DiffSyncModel):
     """Base VRFGroup model."""
@@ -15,7 +17,7 @@ class VRFGroup(DiffSyncModel):
     _children = {}
     name: str
     description: Optional[str]
-    tags: Optional[List[str]]
+    tags: Optional[TagSet]
     custom_fields: Optional[dict]
     uuid: Optional[UUID]
 
@@ -34,8 +36,8 @@ class Subnet(DiffSyncModel):
     network: str
     mask_bits: int
     description: Optional[str]
-    vrf: Optional[str]
-    tags: Optional[List[str]]
+    vrf: Optional[InternedStr]
+    tags: Optional[TagSet]
     custom_fields: Optional[dict]
     uuid: Optional[UUID]
 
@@ -51,11 +53,11 @@ class IPAddress(DiffSyncModel):
     address: str
     available: bool
     label: Optional[str]
-    device: Optional[str]
-    interface: Optional[str]
+    device: Optional[InternedStr]
+    interface: Optional[InternedStr]
     primary: Optional[bool]
-    vrf: Optional[str]
-    tags: Optional[List[str]]
+    vrf: Optional[InternedStr]
+    tags: Optional[TagSet]
     custom_fields: Optional[dict]
     uuid: Optional[UUID]
 
@@ -74,7 +76,7 @@ class VLAN(DiffSyncModel):
     name: str
     vlan_id: int
     description: Optional[str]
-    building: Optional[str]
+    building: Optional[InternedStr]
     custom_fields: Optional[dict]
-    tags: Optional[List[str]]
+    tags: Optional[TagSet]
     uuid: Optional[UUID]
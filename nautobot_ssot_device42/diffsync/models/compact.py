@@ -0,0 +1,106 @@
+"""Compact variants of the high-cardinality DiffSync models, ie Ports and IP Addresses."""
+
+from operator import attrgetter
+from typing import Iterable, Type
+
+from diffsync import DiffSync, DiffSyncModel
+from pydantic.main import validate_model
+
+# Models of each adapter, by their DiffSync model name, that are replaced with compact variants when opted into.
+COMPACT_MODELS = ("port", "ipaddr")
+
+# Sets of the fields that were explicitly given, shared by every compact model with the same fields set.
+_FIELDS_SETS = {}
+# Compact variant of each model class, built the first time it's needed.
+_COMPACT_CLASSES = {}
+
+
+def _shared_fields_set(fields_set) -> frozenset:
+    """Return the shared, immutable copy of `fields_set`."""
+    fields_set = frozenset(fields_set)
+    return _FIELDS_SETS.setdefault(fields_set, fields_set)
+
+
+class CompactModelMixin:
+    """Mixin storing the fields of a DiffSync model in `__slots__` rather than a per-instance dict.
+
+    A pydantic model keeps its field values in a dict and the names of the fields it was given in a set, which together
+    take the bulk of its memory. Compact models keep each value in a slot named for its field, so reading a field is a
+    plain attribute lookup, and share the set of given fields with every other model that was given the same fields.
+    `__dict__` is derived from the slots so `dict()`, `copy()`, comparisons and the diff behave as they do for the model
+    being compacted. Assigned values are stored as given without validation, as for the models' default configuration.
+
+    Use `compact_model()` to build the compact variant of a model rather than subclassing this directly.
+    """
+
+    __slots__ = ()
+
+    def __init__(__pydantic_self__, **data):  # pylint: disable=no-self-argument
+        """Validate `data` as the model being compacted does and store the values in slots."""
+        values, fields_set, validation_error = validate_model(type(__pydantic_self__), data)
+        if validation_error:
+            raise validation_error
+        object.__setattr__(__pydantic_self__, "__dict__", values)
+        object.__setattr__(__pydantic_self__, "__fields_set__", _shared_fields_set(fields_set))
+        __pydantic_self__._init_private_attributes()  # pylint: disable=no-member
+
+    @property
+    def __dict__(self) -> dict:
+        """Field values of the model built from its slots."""
+        return dict(zip(self.__fields__, self._field_values(self)))  # pylint: disable=no-member
+
+    @__dict__.setter
+    def __dict__(self, values: dict):
+        """Store field values in the slots of the model."""
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name: str, value):
+        """Store an assigned field value in its slot and record the field as set."""
+        if name not in self.__fields__:  # pylint: disable=no-member
+            super().__setattr__(name, value)
+            return
+        object.__setattr__(self, name, value)
+        if name not in self.__fields_set__:
+            object.__setattr__(self, "__fields_set__", _shared_fields_set(self.__fields_set__ | {name}))
+
+
+def compact_model(model: Type[DiffSyncModel]) -> Type[DiffSyncModel]:
+    """Return the compact variant of `model`, which stores its fields in `__slots__` using `CompactModelMixin`.
+
+    The variant subclasses `model`, so it has the same fields, identifiers and create, update and delete methods, and it
+    can be used wherever `model` is, including alongside instances of `model` in a diff.
+
+    Args:
+        model (Type[DiffSyncModel]): DiffSync model to compact.
+
+    Returns:
+        Type[DiffSyncModel]: Compact variant of `model`, or `model` itself if it's already compact.
+    """
+    if issubclass(model, CompactModelMixin):
+        return model
+    compact = _COMPACT_CLASSES.get(model)
+    if compact is None:
+        fields = tuple(model.__fields__)
+        compact = _COMPACT_CLASSES[model] = type(model)(
+            f"Compact{model.__name__}",
+            (CompactModelMixin, model),
+            {
+                "__slots__": fields,
+                "__module__": model.__module__,
+                "__doc__": f"Compact {model.__name__} model storing its fields in slots.",
+                "_field_values": staticmethod(attrgetter(*fields)),
+            },
+        )
+    return compact
+
+
+def use_compact_models(adapter: DiffSync, names: Iterable[str] = COMPACT_MODELS):
+    """Replace the models of `adapter` named in `names` with their compact variants.
+
+    Args:
+        adapter (DiffSync): Adapter whose models are replaced. Only this instance is changed, not its class.
+        names (Iterable[str], optional): DiffSync model names to replace. Defaults to COMPACT_MODELS.
+    """
+    for name in names:
+        setattr(adapter, name, compact_model(getattr(adapter, name)))
@@ -34,6 +34,7 @@ from nautobot_ssot_device42.diffsync.models.base.dcim import (
     Vendor,
 )
 from nautobot_ssot_device42.utils import device42, nautobot
+from nautobot_ssot_device42.utils.racks import face_mask
 
 try:
     from nautobot_device_lifecycle_mgmt.models import SoftwareLCM
@@ -186,6 +187,7 @@ class NautobotRack(Rack):
         if slugify(ids["room"]) not in diffsync.rack_map[slugify(ids["building"])]:
             diffsync.rack_map[slugify(ids["building"])][slugify(ids["room"])] = {}
         diffsync.rack_map[slugify(ids["building"])][slugify(ids["room"])][ids["name"]] = new_rack.id
+        diffsync.rack_occupancy.add_rack(new_rack.id, new_rack.u_height)
         return super().create(ids=ids, diffsync=diffsync, attrs=attrs)
 
     def update(self, attrs):
@@ -423,8 +425,21 @@ class NautobotDevice(Device):
         )
         if attrs.get("rack"):
             new_device.rack_id = diffsync.rack_map[slugify(attrs["building"])][slugify(attrs["room"])][attrs["rack"]]
-            new_device.position = int(attrs["rack_position"]) if attrs["rack_position"] else None
             new_device.face = attrs["rack_orientation"] if attrs["rack_orientation"] else "front"
+            if attrs["rack_position"]:
+                # leave the position unset rather than fail validation when its units are already taken
+                devicetype = diffsync.get(NautobotHardware, attrs["hardware"])
+                if diffsync.rack_occupancy.reserve(
+                    new_device.rack_id,
+                    position=int(attrs["rack_position"]),
+                    size=int(devicetype.size),
+                    faces=face_mask(new_device.face, full_depth=devicetype.depth == "Full Depth"),
+                ):
+                    new_device.position = int(attrs["rack_position"])
+                else:
+                    diffsync.job.log_warning(
+                        message=f"Rack position {attrs['rack_position']} of {ids['name']} in {attrs['rack']} is already taken so it won't be set."
+                    )
         if attrs.get("os"):
             devicetype = diffsync.get(NautobotHardware, attrs["hardware"])
             new_device.platform_id = nautobot.verify_platform(
@@ -471,6 +486,7 @@ class NautobotDevice(Device):
         """Update Device object in Nautobot."""
         _dev = OrmDevice.objects.get(id=self.uuid)
         self.diffsync.job.log_info(message=f"Updating Device {self.name} in {_dev.site} with {attrs}")
+        _placement = (_dev.rack_id, _dev.position, _dev.face, _dev.device_type)
         if "building" in attrs:
             site_id = None
             try:
@@ -606,10 +622,35 @@ class NautobotDevice(Device):
             _dev.vc_position = attrs["vc_position"]
         try:
             _dev.validated_save()
-            return super().update(attrs)
         except ValidationError as err:
             self.diffsync.job.log_warning(message=f"Error updating Device {self.name} with {attrs}. {err}")
             return None
+        if _placement != (_dev.rack_id, _dev.position, _dev.face, _dev.device_type):
+            self._move_in_rack(_placement, _dev)
+        return super().update(attrs)
+
+    def _move_in_rack(self, placement: tuple, device: OrmDevice):
+        """Free the rack units a Device was taking before it was updated and take the ones it's in now.
+
+        Args:
+            placement (tuple): Rack ID, position, face and DeviceType of the Device before it was updated.
+            device (OrmDevice): Device after it was updated.
+        """
+        rack_id, position, face, devicetype = placement
+        if rack_id and position:
+            self.diffsync.rack_occupancy.release(
+                rack_id,
+                position=int(position),
+                size=int(devicetype.u_height),
+                faces=face_mask(face, full_depth=devicetype.is_full_depth),
+            )
+        if device.rack_id and device.position:
+            self.diffsync.rack_occupancy.reserve(
+                device.rack_id,
+                position=int(device.position),
+                size=int(device.device_type.u_height),
+                faces=face_mask(device.face, full_depth=device.device_type.is_full_depth),
+            )
 
     def delete(self):
         """Delete Device object from Nautobot.
@@ -9,7 +9,10 @@ from nautobot_ssot.jobs.base import DataMapping, DataSource
 from nautobot_ssot_device42.constant import PLUGIN_CFG
 from nautobot_ssot_device42.diffsync.adapters.device42 import Device42Adapter
 from nautobot_ssot_device42.diffsync.adapters.nautobot import NautobotAdapter
-from nautobot_ssot_device42.utils.device42 import Device42API
+from nautobot_ssot_device42.utils.device42 import CircuitBreaker, Device42API
+from nautobot_ssot_device42.utils.paging import PageSizer
+from nautobot_ssot_device42.utils.snapshot import SnapshotStore
+from nautobot_ssot_device42.utils.transport import RecordingAdapter, ReplayAdapter
 
 
 name = "Device42 SSoT"  # pylint: disable=invalid-name
@@ -20,6 +23,10 @@ class Device42DataSource(DataSource, Job):
 
     debug = BooleanVar(description="Enable for more verbose debug logging", default=False)
     bulk_import = BooleanVar(description="Enable using bulk create option for object creation.", default=False)
+    refresh_snapshots = BooleanVar(
+        description="Ignore existing snapshots and retrieve all datasets from Device42, refreshing the snapshots.",
+        default=False,
+    )
 
     class Meta:
         """Meta data for Device42."""
@@ -114,16 +121,81 @@ class Device42DataSource(DataSource, Job):
         """Load data from Device42 into DiffSync models."""
         if self.kwargs["debug"]:
             self.log_info(message="Connecting to Device42...")
+        snapshots = None
+        if PLUGIN_CFG.get("snapshot_dir"):
+            snapshots = SnapshotStore(
+                directory=PLUGIN_CFG["snapshot_dir"],
+                ttls=PLUGIN_CFG.get("snapshot_ttl", {}),
+                refresh=self.kwargs.get("refresh_snapshots", False),
+            )
+        transport = None
+        pool_size = max(PLUGIN_CFG.get("connection_pool_size", 10), PLUGIN_CFG.get("max_concurrent_requests", 1))
+        if PLUGIN_CFG.get("replay_path"):
+            self.log_warning(message=f"Replaying Device42 responses from {PLUGIN_CFG['replay_path']}.")
+            transport = ReplayAdapter(path=PLUGIN_CFG["replay_path"], latency=PLUGIN_CFG.get("replay_latency"))
+        elif PLUGIN_CFG.get("record_path"):
+            self.log_info(message=f"Recording Device42 responses to {PLUGIN_CFG['record_path']}.")
+            transport = RecordingAdapter(
+                path=PLUGIN_CFG["record_path"], pool_connections=pool_size, pool_maxsize=pool_size
+            )
+        page_sizer = None
+        if PLUGIN_CFG.get("adaptive_page_size") or PLUGIN_CFG.get("page_size_overrides"):
+            page_sizer = PageSizer(
+                adaptive=PLUGIN_CFG.get("adaptive_page_size", False),
+                target_latency=PLUGIN_CFG.get("page_size_target_latency", 2.0),
+                min_size=PLUGIN_CFG.get("page_size_min", 100),
+                max_size=PLUGIN_CFG.get("page_size_max", 5000),
+                overrides=PLUGIN_CFG.get("page_size_overrides", {}),
+                path=PLUGIN_CFG.get("page_size_cache"),
+            )
         client = Device42API(
             base_url=PLUGIN_CFG["device42_host"],
             username=PLUGIN_CFG["device42_username"],
             password=PLUGIN_CFG["device42_password"],
             verify=PLUGIN_CFG["verify_ssl"],
+            pool_size=PLUGIN_CFG.get("connection_pool_size", 10),
+            max_workers=PLUGIN_CFG.get("max_concurrent_requests", 1),
+            doql_chunk_sizes=PLUGIN_CFG.get("doql_chunk_sizes", {}),
+            max_retries=PLUGIN_CFG.get("max_retries", 3),
+            backoff_factor=PLUGIN_CFG.get("retry_backoff_factor", 1.0),
+            circuit_breaker=CircuitBreaker(
+                failure_threshold=PLUGIN_CFG.get("circuit_breaker_threshold", 5),
+                reset_timeout=PLUGIN_CFG.get("circuit_breaker_timeout", 60),
+            ),
+            snapshots=snapshots,
+            transport=transport,
+            page_sizer=page_sizer,
+            doql_output_type=PLUGIN_CFG.get("doql_output_type", "json"),
+            memoize=PLUGIN_CFG.get("memoize_requests", True),
         )
-        self.source_adapter = Device42Adapter(job=self, sync=self.sync, client=client)
-        if self.kwargs["debug"]:
-            self.log_info(message="Loading data from Device42...")
-        self.source_adapter.load()
+        try:
+            self.source_adapter = Device42Adapter(job=self, sync=self.sync, client=client)
+            if self.kwargs["debug"]:
+                self.log_info(message="Loading data from Device42...")
+            self.source_adapter.load()
+        finally:
+            self.log_client_stats(client)
+            client.close()
+
+    def log_client_stats(self, client: Device42API):
+        """Log the number of requests sent to Device42 along with any retries and failures."""
+        stats = client.stats
+        message = f"Sent {stats['requests']} requests to Device42 with {stats['retries']} retries and {stats['failures']} failures."
+        retries = ", ".join(f"{stat}: {count}" for stat, count in sorted(stats.items()) if stat.startswith("retries ("))
+        if retries:
+            message += f" Retries by cause: {retries}."
+        if stats["snapshot hits"] or stats["snapshot writes"]:
+            message += f" Served {stats['snapshot hits']} datasets from snapshots and wrote {stats['snapshot writes']} snapshots."
+        if stats["cache hits"] or stats["cache misses"]:
+            message += f" Request cache: {stats['cache hits']} hits and {stats['cache misses']} misses."
+        if stats["page size reductions"]:
+            message += f" Reduced the page size after {stats['page size reductions']} failed pages."
+        if stats["truncated responses"]:
+            message += f" Stopped paginating {stats['truncated responses']} responses with too many pages."
+        if stats["retries"] or stats["failures"] or stats["truncated responses"]:
+            self.log_warning(message=message)
+        else:
+            self.log_info(message=message)
 
     def load_target_adapter(self):
         """Load data from Nautobot into DiffSync models."""
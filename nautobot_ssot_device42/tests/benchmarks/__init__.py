@@ -0,0 +1 @@
+"""Performance benchmarks for nautobot_ssot_device42 plugin."""
@@ -0,0 +1,123 @@
+"""Benchmark of the memory used to load and diff Ports and IP Addresses with and without compact models.
+
+Run with `invoke benchmark --name compact` or `python -m nautobot_ssot_device42.tests.benchmarks.bench_compact`.
+"""
+
+import gc
+import time
+import tracemalloc
+import uuid
+
+from diffsync import DiffSync
+
+from nautobot_ssot_device42.diffsync.models.base.dcim import Port
+from nautobot_ssot_device42.diffsync.models.base.ipam import IPAddress
+from nautobot_ssot_device42.diffsync.models.compact import use_compact_models
+from nautobot_ssot_device42.utils.custom_fields import CustomFieldInterner
+from nautobot_ssot_device42.utils.interning import TagSet
+
+
+class BenchAdapter(DiffSync):
+    """Adapter holding only Ports and IP Addresses."""
+
+    port = Port
+    ipaddr = IPAddress
+
+    top_level = ["port", "ipaddr"]
+
+    def __init__(self, *args, compact: bool = False, **kwargs):
+        """Initialize BenchAdapter, using compact models if `compact` is set."""
+        super().__init__(*args, **kwargs)
+        if compact:
+            use_compact_models(self)
+
+    def load_records(self, total: int, with_uuids: bool, changed_every: int = 0):
+        """Load `total` Ports, each with an IP Address, like those loaded from Device42 or Nautobot.
+
+        Args:
+            total (int): Number of Ports and IP Addresses.
+            with_uuids (bool): Whether to give every model a UUID, as the Nautobot adapter does.
+            changed_every (int, optional): Change the description of every nth Port. Defaults to 0 for none.
+        """
+        custom_fields = CustomFieldInterner().freeze({"Rack Unit": ("1", None)}, fill_keys=("Patch Panel",))
+        for num in range(total):
+            device = f"switch{num // 48:05d}.testexample.com"
+            port = f"GigabitEthernet1/0/{num % 48 + 1}"
+            self.add(
+                self.port(
+                    name=port,
+                    device=device,
+                    enabled=True,
+                    mtu=1500,
+                    description="uplink" if changed_every and num % changed_every == 0 else "",
+                    mac_addr=f"{num:012x}",
+                    type="1000base-t",
+                    mode="access",
+                    status="active",
+                    tags=TagSet.of(["access", "managed"]),
+                    vlans=[],
+                    custom_fields=custom_fields,
+                    uuid=uuid.uuid4() if with_uuids else None,
+                )
+            )
+            self.add(
+                self.ipaddr(
+                    address=f"10.{num // 65536 % 256}.{num // 256 % 256}.{num % 256}/16",
+                    available=False,
+                    label=None,
+                    device=device,
+                    interface=port,
+                    primary=False,
+                    vrf="corporate",
+                    tags=TagSet.of(["managed"]),
+                    custom_fields=custom_fields,
+                    uuid=uuid.uuid4() if with_uuids else None,
+                )
+            )
+
+
+def measure(total: int, compact: bool) -> tuple:
+    """Load a Device42-like and a Nautobot-like adapter with `total` Ports and IP Addresses and diff them.
+
+    Returns:
+        tuple: MB held by the adapters once loaded, peak MB while loading and diffing them, and seconds taken.
+    """
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    source = BenchAdapter(compact=compact)
+    source.load_records(total, with_uuids=False, changed_every=100)
+    target = BenchAdapter(compact=compact)
+    target.load_records(total, with_uuids=True)
+    gc.collect()
+    loaded, _ = tracemalloc.get_traced_memory()
+    diff = target.diff_from(source)
+    _, peak = tracemalloc.get_traced_memory()
+    elapsed = time.perf_counter() - start
+    tracemalloc.stop()
+    assert diff.summary()["update"] == len(range(0, total, 100))
+    del source, target, diff
+    return loaded / 2**20, peak / 2**20, elapsed
+
+
+def main(sizes=(2_000, 10_000)):
+    """Report the memory used to load and diff plain and compact models for increasing numbers of Ports.
+
+    Tracing every allocation slows the diff considerably, so the sizes are kept small. Memory scales linearly.
+    """
+    print(
+        f"{'ports':>10} {'plain load (MB)':>16} {'compact load (MB)':>18} {'plain peak (MB)':>16} "
+        f"{'compact peak (MB)':>18} {'plain (s)':>10} {'compact (s)':>12}"
+    )
+    for size in sizes:
+        plain = measure(size, compact=False)
+        compact = measure(size, compact=True)
+        print(
+            f"{size:>10} {plain[0]:>16.1f} {compact[0]:>18.1f} {plain[1]:>16.1f} {compact[1]:>18.1f} "
+            f"{plain[2]:>10.2f} {compact[2]:>12.2f}",
+            flush=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
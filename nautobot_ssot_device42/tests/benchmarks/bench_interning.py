@@ -0,0 +1,105 @@
+"""Benchmark of the memory held by Port and IP Address models with and without interning.
+
+Run with `invoke benchmark --name interning` or `python -m nautobot_ssot_device42.tests.benchmarks.bench_interning`.
+"""
+
+import gc
+import json
+import tracemalloc
+from typing import List, Optional
+
+from nautobot_ssot_device42.diffsync.models.base.dcim import Port
+from nautobot_ssot_device42.diffsync.models.base.ipam import IPAddress
+
+
+class LegacyPort(Port):
+    """Port with plain string identifiers and Tag lists, as prior to interning."""
+
+    name: str
+    device: str
+    type: str
+    mode: str
+    status: str
+    tags: Optional[List[str]]
+
+
+class LegacyIPAddress(IPAddress):
+    """IP Address with plain string identifiers and Tag lists, as prior to interning."""
+
+    device: Optional[str]
+    interface: Optional[str]
+    vrf: Optional[str]
+    tags: Optional[List[str]]
+
+
+def build_records(total: int, ports_per_device: int = 48) -> tuple:
+    """Build synthetic Port and IP Address records decoded from JSON, so no two records share a string.
+
+    Args:
+        total (int): Number of Ports, each with an IP Address.
+        ports_per_device (int, optional): Ports per Device. Defaults to 48.
+
+    Returns:
+        tuple: Port records and IP Address records.
+    """
+    ports, ipaddrs = [], []
+    for num in range(total):
+        device = f"switch{num // ports_per_device:05d}.testexample.com"
+        port = f"GigabitEthernet1/0/{num % ports_per_device + 1}"
+        tags = ["access", "managed"] if num % 2 else ["uplink", "managed", "access"]
+        ports.append(
+            json.dumps(
+                {
+                    "name": port,
+                    "device": device,
+                    "type": "1000base-t",
+                    "mode": "access",
+                    "status": "active",
+                    "tags": tags,
+                }
+            )
+        )
+        ipaddrs.append(
+            json.dumps(
+                {
+                    "address": f"10.{num // 65536 % 256}.{num // 256 % 256}.{num % 256}/24",
+                    "available": False,
+                    "device": device,
+                    "interface": port,
+                    "vrf": "corporate",
+                    "tags": tags,
+                }
+            )
+        )
+    return ports, ipaddrs
+
+
+def measure(port_model, ipaddr_model, records: tuple) -> int:
+    """Return the bytes held by the models built from `records`, including their strings and Tags."""
+    ports, ipaddrs = records
+    gc.collect()
+    tracemalloc.start()
+    models = [port_model(**json.loads(port)) for port in ports]
+    models += [ipaddr_model(**json.loads(ipaddr)) for ipaddr in ipaddrs]
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del models
+    return size
+
+
+def main(sizes=(10_000, 100_000)):
+    """Report the memory held by interned and plain models for increasing numbers of Ports and IP Addresses."""
+    print(f"{'ports':>10} {'plain (MB)':>12} {'interned (MB)':>14} {'saved':>7}")
+    for size in sizes:
+        records = build_records(size)
+        plain = measure(LegacyPort, LegacyIPAddress, records)
+        interned = measure(Port, IPAddress, records)
+        print(
+            f"{size:>10} {plain / 2**20:>12.1f} {interned / 2**20:>14.1f} {(plain - interned) / plain:>7.0%}",
+            flush=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Benchmark of merging paginated Device42 API responses.
+
+Run with `invoke benchmark --name pagination` or `python -m nautobot_ssot_device42.tests.benchmarks.bench_pagination`.
+"""
+
+import time
+
+
+def build_pages(total: int, limit: int = 1000) -> list:
+    """Build synthetic paginated responses like those returned by the Device42 REST API.
+
+    Args:
+        total (int): Total number of records across all pages.
+        limit (int, optional): Number of records per page. Defaults to 1000.
+
+    Returns:
+        list: Paginated responses in offset order.
+    """
+    return [
+        {
+            "total_count": total,
+            "limit": limit,
+            "offset": offset,
+            "Devices": [
+                {"device_id": num, "name": f"device-{num}"} for num in range(offset, min(offset + limit, total))
+            ],
+        }
+        for offset in range(0, total, limit)
+    ]
+
+
+def legacy_merge(pages: list) -> dict:
+    """Merge pages by re-concatenating the accumulated list for every page, as was done prior to the page accumulator."""
+    return_data = pages[0]
+    for page in pages[1:]:
+        out = {}
+        for key, value in page.items():
+            if key in return_data:
+                out[key] = return_data[key] + value if isinstance(value, list) else value
+        return_data = out
+    return return_data
+
+
+def timed(func, pages: list) -> float:
+    """Return the number of seconds taken to merge `pages` with `func`."""
+    start = time.perf_counter()
+    func(pages)
+    return time.perf_counter() - start
+
+
+def main(sizes=(125_000, 250_000, 500_000, 1_000_000)):
+    """Time both merge strategies for increasing record counts and report how they scale."""
+    from nautobot_ssot_device42.utils.device42 import (  # pylint: disable=import-outside-toplevel
+        merge_paginated_responses,
+    )
+
+    previous = None
+    print(f"{'records':>10} {'pages':>6} {'legacy (s)':>11} {'growth':>7} {'linear (s)':>11} {'growth':>7}")
+    for size in sizes:
+        legacy = timed(legacy_merge, build_pages(size))
+        linear = timed(merge_paginated_responses, build_pages(size))
+        legacy_growth = f"{legacy / previous[0]:.1f}x" if previous else "-"
+        linear_growth = f"{linear / previous[1]:.1f}x" if previous else "-"
+        print(f"{size:>10} {size // 1000:>6} {legacy:>11.3f} {legacy_growth:>7} {linear:>11.3f} {linear_growth:>7}")
+        previous = (legacy, linear)
+
+
+if __name__ == "__main__":
+    import nautobot  # pylint: disable=import-outside-toplevel
+
+    nautobot.setup()
+    main()
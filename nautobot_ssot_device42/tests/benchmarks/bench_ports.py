@@ -0,0 +1,84 @@
+"""Benchmark of preparing the Device42 Ports for loading from one consolidated dataset versus merging two queries.
+
+Run with `invoke benchmark --name ports` or `python -m nautobot_ssot_device42.tests.benchmarks.bench_ports`.
+"""
+
+import time
+
+
+def build_netports(total: int, vlan_ratio: float = 0.5) -> list:
+    """Build synthetic Ports like those returned by `get_netports`, with the first `vlan_ratio` of them on a VLAN."""
+    with_vlans = int(total * vlan_ratio)
+    return [
+        {
+            "netport_pk": num,
+            "port_name": f"Ethernet{num}",
+            "hwaddress": f"{num:012x}",
+            "second_device_fk": None,
+            "device_name": f"switch{num // 48:05d}.testexample.com",
+            "vlan_pks": ["1"] if num < with_vlans else None,
+        }
+        for num in range(total)
+    ]
+
+
+def split_netports(netports: list) -> tuple:
+    """Split `netports` into the Ports with VLANs and every Port, as the two overlapping queries returned them."""
+    return [port for port in netports if port["vlan_pks"]], [dict(port, vlan_pks=None) for port in netports]
+
+
+def legacy_merge(vlan_ports: list, no_vlan_ports: list) -> list:
+    """Merge Ports by comparing every Port without VLANs against every Port with VLANs."""
+    no_vlan_ports_only = []
+    for no_vlan_port in no_vlan_ports:
+        for vlan_port in vlan_ports:
+            if no_vlan_port["netport_pk"] == vlan_port["netport_pk"]:
+                break
+        else:
+            no_vlan_ports_only.append(no_vlan_port)
+    return vlan_ports + no_vlan_ports_only
+
+
+def indexed_merge(vlan_ports: list, no_vlan_ports: list) -> list:
+    """Merge Ports by checking each Port without VLANs against an index of the primary keys of Ports with VLANs."""
+    vlan_port_pks = {port["netport_pk"] for port in vlan_ports}
+    return vlan_ports + [port for port in no_vlan_ports if port["netport_pk"] not in vlan_port_pks]
+
+
+def timed(func, *args) -> float:
+    """Return the number of seconds taken to call `func` with `args`."""
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main(sizes=(10_000, 100_000, 1_000_000), legacy_limit=100_000):
+    """Time each way of preparing the Ports and the Port primary key map for increasing Port counts.
+
+    The merges only combine the two queries that `get_netports` replaced, before their separate Port map is built, so
+    they understate the cost of the legacy path. The legacy merge is quadratic, so above `legacy_limit` Ports its time
+    is extrapolated from the largest measured run and marked with `~` rather than measured.
+    """
+    from nautobot_ssot_device42.utils.device42 import netport_pk_map  # pylint: disable=import-outside-toplevel
+
+    measured = None
+    print(f"{'ports':>10} {'legacy merge (s)':>17} {'indexed merge (s)':>18} {'netports (s)':>13}")
+    for size in sizes:
+        netports = build_netports(size)
+        ports = split_netports(netports)
+        indexed = timed(indexed_merge, *ports)
+        consolidated = timed(netport_pk_map, netports)
+        if size <= legacy_limit:
+            legacy = timed(legacy_merge, *ports)
+            measured = (size, legacy)
+            legacy_label = f"{legacy:.3f}"
+        else:
+            legacy_label = f"~{measured[1] * (size / measured[0]) ** 2:.0f}"
+        print(f"{size:>10} {legacy_label:>17} {indexed:>18.3f} {consolidated:>13.3f}", flush=True)
+
+
+if __name__ == "__main__":
+    import nautobot  # pylint: disable=import-outside-toplevel
+
+    nautobot.setup()
+    main()
@@ -1,5 +1,6 @@
 """Unit tests for the Device42 DiffSync adapter class."""
 import json
+import socket
 import uuid
 from unittest.mock import MagicMock, patch
 from diffsync.exceptions import ObjectAlreadyExists, ObjectNotFound
@@ -9,12 +10,15 @@ from nautobot.utilities.testing import TransactionTestCase
 from nautobot.extras.models import Job, JobResult
 from parameterized import parameterized
 from nautobot_ssot_device42.diffsync.adapters.device42 import (
+    DATASET_COLUMNS,
     Device42Adapter,
     get_dns_a_record,
     get_circuit_status,
     get_site_from_mapping,
 )
+from nautobot_ssot_device42.diffsync.models.compact import CompactModelMixin
 from nautobot_ssot_device42.jobs import Device42DataSource
+from nautobot_ssot_device42.utils.dns import DNSResolver
 
 
 def load_json(path):
@@ -29,7 +33,7 @@ RACK_FIXTURE = load_json("./nautobot_ssot_device42/tests/fixtures/get_racks_recv
 VENDOR_FIXTURE = load_json("./nautobot_ssot_device42/tests/fixtures/get_vendors_recv.json")
 HARDWARE_FIXTURE = load_json("./nautobot_ssot_device42/tests/fixtures/get_hardware_models_recv.json")
 VRFGROUP_FIXTURE = load_json("./nautobot_ssot_device42/tests/fixtures/get_vrfgroups_recv.json")
-VLAN_FIXTURE = load_json("./nautobot_ssot_device42/tests/fixtures/get_vlans_with_location.json")
+VLAN_INFO_FIXTURE = load_json("./nautobot_ssot_device42/tests/fixtures/get_vlan_info_recv.json")
 SUBNET_DEFAULT_CFS_FIXTURE = load_json(
     "./nautobot_ssot_device42/tests/fixtures/get_subnet_default_custom_fields_recv.json"
 )
@@ -37,8 +41,7 @@ SUBNET_CFS_FIXTURE = load_json("./nautobot_ssot_device42/tests/fixtures/get_subn
 SUBNET_FIXTURE = load_json("./nautobot_ssot_device42/tests/fixtures/get_subnets.json")
 DEVICE_FIXTURE = load_json("./nautobot_ssot_device42/tests/fixtures/get_devices_recv.json")
 CLUSTER_MEMBER_FIXTURE = load_json("./nautobot_ssot_device42/tests/fixtures/get_cluster_members_recv.json")
-PORTS_W_VLANS_FIXTURE = load_json("./nautobot_ssot_device42/tests/fixtures/get_ports_with_vlans_recv.json")
-PORTS_WO_VLANS_FIXTURE = load_json("./nautobot_ssot_device42/tests/fixtures/get_ports_wo_vlans_recv.json")
+NETPORTS_FIXTURE = load_json("./nautobot_ssot_device42/tests/fixtures/get_netports_recv.json")
 PORT_CUSTOM_FIELDS = load_json("./nautobot_ssot_device42/tests/fixtures/get_port_custom_fields_recv.json")
 IPADDRESS_FIXTURE = load_json("./nautobot_ssot_device42/tests/fixtures/get_ip_addrs.json")
 IPADDRESS_CF_FIXTURE = load_json("./nautobot_ssot_device42/tests/fixtures/get_ipaddr_custom_fields_recv.json")
@@ -59,14 +62,13 @@ class Device42AdapterTestCase(TransactionTestCase):  # pylint: disable=too-many-
         self.d42_client.get_vendors.return_value = VENDOR_FIXTURE
         self.d42_client.get_hardware_models.return_value = HARDWARE_FIXTURE
         self.d42_client.get_vrfgroups.return_value = VRFGROUP_FIXTURE
-        self.d42_client.get_vlans_with_location.return_value = VLAN_FIXTURE
+        self.d42_client.get_vlan_info.return_value = VLAN_INFO_FIXTURE
         self.d42_client.get_subnet_default_custom_fields.return_value = SUBNET_DEFAULT_CFS_FIXTURE
         self.d42_client.get_subnet_custom_fields.return_value = SUBNET_CFS_FIXTURE
         self.d42_client.get_subnets.return_value = SUBNET_FIXTURE
         self.d42_client.get_devices.return_value = DEVICE_FIXTURE
         self.d42_client.get_cluster_members.return_value = CLUSTER_MEMBER_FIXTURE
-        self.d42_client.get_ports_with_vlans.return_value = PORTS_W_VLANS_FIXTURE
-        self.d42_client.get_ports_wo_vlans.return_value = PORTS_WO_VLANS_FIXTURE
+        self.d42_client.get_netports.return_value = NETPORTS_FIXTURE
         self.d42_client.get_port_custom_fields.return_value = PORT_CUSTOM_FIELDS
         self.d42_client.get_ip_addrs.return_value = IPADDRESS_FIXTURE
         self.d42_client.get_ipaddr_custom_fields.return_value = IPADDRESS_CF_FIXTURE
@@ -127,8 +129,9 @@ class Device42AdapterTestCase(TransactionTestCase):  # pylint: disable=too-many-
         self.device42.load_vlans()
         self.assertEqual(
             {
-                f"{vlan['vid']}__{slugify(self.device42.d42_building_sitecode_map[vlan['customer']])}"
-                for vlan in VLAN_FIXTURE
+                f"{VLAN_INFO_FIXTURE[vlan_pk]['vid']}__{slugify(self.device42.d42_building_sitecode_map[port['customer']])}"
+                for port in NETPORTS_FIXTURE
+                for vlan_pk in port["vlan_pks"] or []
             },
             {vlan.get_unique_id() for vlan in self.device42.get_all("vlan")},
         )
@@ -144,15 +147,43 @@ class Device42AdapterTestCase(TransactionTestCase):  # pylint: disable=too-many-
         )
         self.device42.load_ports()
         self.assertEqual(
-            {f"{port['device_name']}__{port['port_name']}" for port in PORTS_WO_VLANS_FIXTURE},
+            {f"{port['device_name']}__{port['port_name']}" for port in NETPORTS_FIXTURE if port["port_name"]},
             {port.get_unique_id() for port in self.device42.get_all("port")},
         )
+        self.assertEqual(
+            {
+                name: self.device42.get("port", {"device": "core-router.testexample.com", "name": name}).status
+                for name in ("Ethernet1/1.100", "Management0", "GigabitEthernet1/0/1")
+            },
+            {"Ethernet1/1.100": "failed", "Management0": "active", "GigabitEthernet1/0/1": "active"},
+        )
         self.device42.load_ip_addresses()
         self.assertEqual(
             {f"{ipaddr['ip_address']}/{ipaddr['netmask']}__{ipaddr['vrf']}" for ipaddr in IPADDRESS_FIXTURE},
             {ipaddr.get_unique_id() for ipaddr in self.device42.get_all("ipaddr")},
         )
 
+    def test_data_loading_compact_models(self):
+        """Validate Ports and IP Addresses loaded into compact models match those loaded by default."""
+        with patch("nautobot_ssot_device42.diffsync.adapters.device42.PLUGIN_CFG", {"compact_models": True}):
+            compact = Device42Adapter(job=self.job, sync=None, client=self.d42_client)
+        self.assertFalse(issubclass(Device42Adapter.port, CompactModelMixin))
+        for adapter in (self.device42, compact):
+            adapter.load_buildings()
+            adapter.load_rooms()
+            adapter.load_racks()
+            adapter.load_vendors()
+            adapter.load_hardware_models()
+            adapter.load_devices_and_clusters()
+            adapter.load_ports()
+            adapter.load_ip_addresses()
+        self.assertTrue(all(isinstance(port, CompactModelMixin) for port in compact.get_all("port")))
+        self.assertTrue(all(isinstance(ipaddr, CompactModelMixin) for ipaddr in compact.get_all("ipaddr")))
+        self.assertFalse(any(isinstance(port, CompactModelMixin) for port in self.device42.get_all("port")))
+        self.assertEqual(compact.count("port"), self.device42.count("port"))
+        self.assertEqual(compact.count("ipaddr"), self.device42.count("ipaddr"))
+        self.assertFalse(compact.diff_from(self.device42).has_diffs())
+
     def test_load_buildings_duplicate_site(self):
         """Validate functionality of the load_buildings() function when duplicate site is loaded."""
         self.device42.load_buildings()
@@ -233,6 +264,50 @@ class Device42AdapterTestCase(TransactionTestCase):  # pylint: disable=too-many-
             message="Device stack01.testexample.com can't be loaded as we're unable to find associated Building."
         )
 
+    @patch(
+        "nautobot_ssot_device42.diffsync.adapters.device42.PLUGIN_CFG",
+        {"customer_is_facility": True},
+    )
+    def test_load_devices_rack_collisions(self):
+        """Validate Devices placed in rack units that are already taken are loaded without a rack position."""
+        core_router = DEVICE_FIXTURE[1]
+        self.d42_client.get_devices.return_value = [
+            core_router,
+            dict(core_router, name="front-collision.testexample.com"),
+            dict(core_router, name="rear.testexample.com", orientation=2),
+            dict(core_router, name="rear-collision.testexample.com", orientation=2),
+            dict(core_router, name="below.testexample.com", start_at=15.0),
+        ]
+        self.device42.load_buildings()
+        self.device42.load_hardware_models()
+        self.device42.load_devices_and_clusters()
+        self.assertEqual(
+            {dev.name: dev.rack_position for dev in self.device42.get_all("device")},
+            {
+                "core-router.testexample.com": 16,
+                "front-collision.testexample.com": None,
+                "rear.testexample.com": 16,
+                "rear-collision.testexample.com": None,
+                "below.testexample.com": 15,
+            },
+        )
+
+    @patch(
+        "nautobot_ssot_device42.diffsync.adapters.device42.PLUGIN_CFG",
+        {"customer_is_facility": True},
+    )
+    def test_load_devices_rack_occupancy_of_loaded_racks(self):
+        """Validate Devices take units in the racks loaded from Device42 rather than the Site they're mapped to."""
+        self.d42_client.get_devices.return_value = [dict(DEVICE_FIXTURE[1], rack="Server Rack")]
+        self.device42.load_buildings()
+        self.device42.load_rooms()
+        self.device42.load_racks()
+        self.device42.load_hardware_models()
+        self.device42.load_devices_and_clusters()
+        self.assertEqual(self.device42.get("device", "core-router.testexample.com").building, "apple-park")
+        self.assertFalse(self.device42.rack_occupancy.is_free(("Apple Park", "Server Room", "Server Rack"), 16, 1))
+        self.assertEqual(len(self.device42.rack_occupancy._ids), len(RACK_FIXTURE))  # pylint: disable=protected-access
+
     def test_assign_version_to_master_devices_with_valid_os_version(self):
         """Validate functionality of the assign_version_to_master_devices() function with valid os_version."""
         self.device42.device42_clusters = {"cluster1": {"members": [self.mock_device]}}
@@ -323,24 +398,27 @@ class Device42AdapterTestCase(TransactionTestCase):  # pylint: disable=too-many-
         expected = ""
         self.assertEqual(get_site_from_mapping(device_name="dfw.test.com"), expected)
 
-    @patch("nautobot_ssot_device42.diffsync.adapters.device42.is_fqdn_resolvable", return_value=True)
     @patch("nautobot_ssot_device42.diffsync.adapters.device42.fqdn_to_ip", return_value="192.168.0.1")
-    def test_get_dns_a_record_success(self, mock_fqdn_to_ip, mock_is_fqdn_resolvable):
+    def test_get_dns_a_record_success(self, mock_fqdn_to_ip):
         """Test the get_dns_a_record method success."""
         result = get_dns_a_record("example.com")
-        mock_is_fqdn_resolvable.assert_called_once_with("example.com")
         mock_fqdn_to_ip.assert_called_once_with("example.com")
         self.assertEqual(result, "192.168.0.1")
 
-    @patch("nautobot_ssot_device42.diffsync.adapters.device42.is_fqdn_resolvable", return_value=False)
-    @patch("nautobot_ssot_device42.diffsync.adapters.device42.fqdn_to_ip")
-    def test_get_dns_a_record_failure(self, mock_fqdn_to_ip, mock_is_fqdn_resolvable):
+    @patch("nautobot_ssot_device42.diffsync.adapters.device42.fqdn_to_ip", side_effect=socket.gaierror)
+    def test_get_dns_a_record_failure(self, mock_fqdn_to_ip):
         """Test the get_dns_a_record method failure."""
         result = get_dns_a_record("invalid-hostname")
-        mock_is_fqdn_resolvable.assert_called_once_with("invalid-hostname")
-        mock_fqdn_to_ip.assert_not_called()
+        mock_fqdn_to_ip.assert_called_once_with("invalid-hostname")
         self.assertFalse(result)
 
+    def test_get_dns_a_record_resolver(self):
+        """Test the get_dns_a_record method looks names up with the resolver when one is given."""
+        resolver = DNSResolver(resolve={"example.com": "192.168.0.1"}.__getitem__)
+        self.assertEqual(get_dns_a_record("example.com", resolver=resolver), "192.168.0.1")
+        self.assertEqual(get_dns_a_record("example.com", resolver=resolver), "192.168.0.1")
+        self.assertEqual(resolver.stats, {"hits": 1, "lookups": 1, "timeouts": 0})
+
     @patch(
         "nautobot_ssot_device42.diffsync.adapters.device42.PLUGIN_CFG",
         {"hostname_mapping": [{"^nyc.+|NYC.+": "new-york-city"}]},
@@ -363,13 +441,180 @@ class Device42AdapterTestCase(TransactionTestCase):  # pylint: disable=too-many-
         expected = ""
         self.assertEqual(self.device42.get_building_for_device(dev_record=mock_dev_record), expected)
 
-    def test_filter_ports(self):
-        """Method to test filter_ports success."""
-        vlan_ports = load_json("./nautobot_ssot_device42/tests/fixtures/ports_with_vlans.json")
-        no_vlan_ports = load_json("./nautobot_ssot_device42/tests/fixtures/ports_wo_vlans.json")
-        merged_ports = load_json("./nautobot_ssot_device42/tests/fixtures/merged_ports.json")
-        result = self.device42.filter_ports(vlan_ports, no_vlan_ports)
-        self.assertEqual(merged_ports, result)
+    @patch("nautobot_ssot_device42.diffsync.adapters.device42.PLUGIN_CFG", {"max_concurrent_datasets": 4})
+    def test_prefetch_datasets(self):
+        """Validate prefetch_datasets() retrieves all datasets up front and hands each out once."""
+        self.device42.prefetch_datasets()
+        self.assertEqual(set(self.device42.datasets), set(self.device42.prefetch))
+        self.d42_client.get_buildings.assert_called_once()
+        self.assertEqual(self.device42.get_dataset("get_buildings"), BUILDING_FIXTURE)
+        self.assertNotIn("get_buildings", self.device42.datasets)
+        self.device42.get_dataset("get_buildings")
+        self.assertEqual(self.d42_client.get_buildings.call_count, 2)
+
+    @patch("nautobot_ssot_device42.diffsync.adapters.device42.PLUGIN_CFG", {})
+    def test_prefetch_datasets_disabled(self):
+        """Validate prefetch_datasets() does nothing unless max_concurrent_datasets is greater than 1."""
+        self.device42.prefetch_datasets()
+        self.assertEqual(self.device42.datasets, {})
+        self.d42_client.get_buildings.assert_not_called()
+
+    def test_dataset_columns(self):
+        """Validate datasets are retrieved with the columns declared by every loader using them."""
+        self.assertTrue(
+            {"name", "customer", "building", "hw_model", "custom_fields"} <= set(DATASET_COLUMNS["get_devices"])
+        )
+        self.assertEqual(len(DATASET_COLUMNS["get_devices"]), len(set(DATASET_COLUMNS["get_devices"])))
+        self.device42.get_dataset("get_buildings")
+        self.d42_client.get_buildings.assert_called_once_with(columns=DATASET_COLUMNS["get_buildings"])
+        self.device42.get_dataset("get_vrfgroups")
+        self.d42_client.get_vrfgroups.assert_called_once_with()
+        self.assertEqual(self.device42.d42_rack_map, self.d42_client.get_rack_pks.return_value)
+        self.d42_client.get_rack_pks.assert_called_once_with(columns=("name",))
+
+    def test_lookup_maps_prefetched_and_lazy(self):
+        """Validate only the prefetch maps are retrieved on creation and the remainder on first use."""
+        self.d42_client.get_cluster_members.assert_called_once()
+        self.d42_client.get_netports.assert_called_once()
+        self.d42_client.get_building_pks.assert_not_called()
+        self.d42_client.get_building_pks.return_value = {1: {"name": "Microsoft HQ"}}
+        self.assertEqual(self.device42.d42_building_map, {1: {"name": "Microsoft HQ"}})
+        self.assertEqual(self.device42.d42_building_map, {1: {"name": "Microsoft HQ"}})
+        self.d42_client.get_building_pks.assert_called_once()
+        with self.assertRaises(AttributeError):
+            self.device42.d42_missing_map  # pylint: disable=pointless-statement
+
+    @patch("nautobot_ssot_device42.diffsync.adapters.device42.PLUGIN_CFG", {"max_concurrent_datasets": 3})
+    def test_prefetch_lookup_maps_concurrently(self):
+        """Validate prefetch_lookup_maps() retrieves maps on a worker pool and assigns each to the adapter."""
+        self.d42_client.get_rack_pks.return_value = {1: {"name": "Rack 1"}}
+        self.d42_client.get_room_pks.return_value = {2: {"name": "Room 2"}}
+        self.device42.prefetch_lookup_maps(("d42_rack_map", "d42_room_map"))
+        self.assertEqual(self.device42.d42_rack_map, {1: {"name": "Rack 1"}})
+        self.assertEqual(self.device42.d42_room_map, {2: {"name": "Room 2"}})
+        self.d42_client.get_rack_pks.assert_called_once()
+
+    @patch("nautobot_ssot_device42.diffsync.adapters.device42.PLUGIN_CFG", {})
+    def test_netports_shared(self):
+        """Validate the Port, VLAN and Port PK lookups are all served from the single netport dataset."""
+        self.assertEqual(
+            self.device42.d42_port_map[5],
+            {
+                "port": "GigabitEthernet1/0/48",
+                "netport_pk": 5,
+                "hwaddress": "0123456789ab",
+                "second_device_fk": None,
+                "device": "stack01.testexample.com - Switch 1",
+            },
+        )
+        self.assertEqual(self.device42.d42_port_map[6]["port"], "ba0987654321")
+        self.device42.load_vlans()
+        vlan = self.device42.get("vlan", {"vlan_id": 200, "building": "apple-park"})
+        self.assertEqual((vlan.name, vlan.description, vlan.tags), ("DMZ", "DMZ", ["dmz"]))
+        self.assertEqual(vlan.custom_fields, {"Purpose": {"key": "Purpose", "value": "Servers", "notes": None}})
+        self.d42_client.get_netports.assert_called_once()
+
+    def test_assign_cluster_host(self):
+        """Validate cluster hosts and VC positions are assigned from the cluster member index."""
+        self.device42.device42_clusters = {
+            "stack01": {"members": ["stack01 - Switch 2", "stack01 - Switch 1"], "is_network": "yes"},
+            "stack02": {"members": ["stack02 - Switch 1"], "is_network": "yes"},
+        }
+        self.assertEqual(self.device42.get_cluster_host("stack02 - Switch 1"), "stack02")
+        self.assertEqual(self.device42.get_cluster_host("standalone"), "")
+        device = MagicMock()
+        device.name = "stack01 - Switch 2"
+        self.device42.assign_cluster_host({"name": "stack01 - Switch 2"}, device)
+        self.assertEqual((device.cluster_host, device.vc_position), ("stack01", 3))
+        self.device42.device42_clusters = {"stack03": {"members": ["stack01 - Switch 2"], "is_network": "yes"}}
+        self.assertEqual(self.device42.get_cluster_host("stack01 - Switch 2"), "stack03")
+
+    def test_find_ipaddr(self):
+        """Validate find_ipaddr returns the indexed IPAddress with the longest prefix, preferring VRFs in load order."""
+        self.device42.load_vrfgroups()
+        vrf = VRFGROUP_FIXTURE[0]["name"]
+
+        def add_ip(address, vrf_name):
+            new_ip = self.device42.ipaddr(
+                address=address,
+                available=False,
+                label="",
+                device="",
+                interface="",
+                primary=False,
+                vrf=vrf_name,
+                tags=[],
+                custom_fields={},
+                uuid=None,
+            )
+            self.device42.add(new_ip)
+            self.device42.index_ipaddr(new_ip)
+            return new_ip
+
+        add_ip("10.0.0.1/24", vrf)
+        host = self.device42.add_ipaddr(address="10.0.0.1/32", dev_name="", interface="")
+        add_ip("10.0.0.2/24", None)
+        in_vrf = add_ip("10.0.0.2/24", vrf)
+        v6_addr = add_ip("2001:db8::a/64", None)
+        self.assertEqual(self.device42.find_ipaddr(address="10.0.0.1"), host)
+        self.assertEqual(self.device42.find_ipaddr(address="10.0.0.2"), in_vrf)
+        self.assertEqual(self.device42.find_ipaddr(address="2001:0db8:0000::a"), v6_addr)
+        self.assertFalse(self.device42.find_ipaddr(address="10.0.0.3"))
+        self.assertFalse(self.device42.find_ipaddr(address="::a"))
+        self.assertFalse(self.device42.find_ipaddr(address="not-an-ip"))
+
+    @patch(
+        "nautobot_ssot_device42.diffsync.adapters.device42.PLUGIN_CFG",
+        {"mgmt_interface_names": ["mgmt0", "(?i)management0?"]},
+    )
+    def test_get_management_intf(self):
+        """Validate get_management_intf returns the indexed Port matching the earliest `mgmt_interface_names` entry."""
+
+        def add_port(name, device):
+            new_port = self.device42.port(
+                name=name,
+                device=device,
+                enabled=True,
+                mtu=1500,
+                description="",
+                mac_addr="",
+                type="other",
+                tags=[],
+                mode="access",
+                status="active",
+                vlans=[],
+                custom_fields={},
+                uuid=None,
+            )
+            self.device42.add(new_port)
+            self.device42.index_mgmt_intf(new_port)
+            return new_port
+
+        add_port("Ethernet1/1", "router1")
+        management = add_port("Management0", "router1")
+        add_port("management0", "router2")
+        mgmt0 = add_port("mgmt0", "router2")
+        add_port("management1", "router3")
+        self.assertEqual(self.device42.get_management_intf(dev_name="router1"), management)
+        self.assertEqual(self.device42.get_management_intf(dev_name="router2"), mgmt0)
+        self.assertFalse(self.device42.get_management_intf(dev_name="router3"))
+        self.assertFalse(self.device42.get_management_intf(dev_name="router4"))
+
+    @patch("nautobot_ssot_device42.diffsync.adapters.device42.Device42Adapter.set_primary_from_dns")
+    def test_check_dns_resolves_up_front(self, mock_set_primary):
+        """Validate check_dns resolves every Device FQDN through the resolver before assigning primary IPs."""
+        resolver = MagicMock()
+        resolver.stats = {"hits": 0, "lookups": 2, "timeouts": 0}
+        self.device42.dns_resolver = resolver
+        self.device42.load_hardware_models()
+        self.device42.load_devices_and_clusters()
+        names = sorted(dev.name for dev in self.device42.get_all("device"))
+        self.assertIn("stack01.testexample.com - Switch 1", names)
+        self.device42.check_dns()
+        expected = [name for name in names if " - " not in name]
+        self.assertEqual(sorted(resolver.resolve_all.call_args[0][0]), [name for name in expected if "." in name])
+        self.assertEqual(sorted(call.kwargs["dev_name"] for call in mock_set_primary.call_args_list), expected)
+        resolver.save.assert_called_once()
 
     @patch("nautobot_ssot_device42.diffsync.adapters.device42.get_dns_a_record")
     @patch("nautobot_ssot_device42.diffsync.adapters.device42.Device42Adapter.find_ipaddr")
@@ -391,7 +636,7 @@ class Device42AdapterTestCase(TransactionTestCase):  # pylint: disable=too-many-
         dev_name = "router.test-example.com"
         self.device42.set_primary_from_dns(dev_name)
 
-        mock_dns_a_record.assert_called_once_with(dev_name=dev_name)
+        mock_dns_a_record.assert_called_once_with(dev_name=dev_name, resolver=self.device42.dns_resolver)
         mock_find_ipaddr.assert_called_once_with(address="10.0.0.1")
         mock_get_mgmt_intf.assert_called_once_with(dev_name=dev_name)
         mock_add_mgmt_intf.assert_not_called()
@@ -414,7 +659,7 @@ class Device42AdapterTestCase(TransactionTestCase):  # pylint: disable=too-many-
         self.job.log_warning = MagicMock()
         self.device42.set_primary_from_dns(dev_name=dev_name)
 
-        mock_dns_a_record.assert_called_once_with(dev_name=dev_name)
+        mock_dns_a_record.assert_called_once_with(dev_name=dev_name, resolver=self.device42.dns_resolver)
         mock_find_ipaddr.assert_not_called()
         mock_get_mgmt_intf.assert_not_called()
         mock_add_mgmt_intf.assert_not_called()
@@ -0,0 +1,110 @@
+"""Tests of the compact DiffSync models."""
+
+import copy
+import uuid
+
+from diffsync import DiffSync
+from nautobot.utilities.testing import TestCase
+from pydantic import ValidationError
+from nautobot_ssot_device42.diffsync.models.base.dcim import Port
+from nautobot_ssot_device42.diffsync.models.base.ipam import IPAddress
+from nautobot_ssot_device42.diffsync.models.compact import CompactModelMixin, compact_model, use_compact_models
+
+
+class PortAdapter(DiffSync):
+    """Adapter holding only Ports and IP Addresses."""
+
+    port = Port
+    ipaddr = IPAddress
+
+    top_level = ["port", "ipaddr"]
+
+    def load_ports(self, mtu: int = 1500):
+        """Load a Port with an IP Address."""
+        self.add(
+            self.port(
+                name="Ethernet1/1",
+                device="core-router",
+                mtu=mtu,
+                type="1000base-t",
+                mode="access",
+                status="active",
+                tags=["b", "a"],
+                uuid=uuid.UUID(int=1),
+            )
+        )
+        self.add(self.ipaddr(address="10.0.0.1/24", available=False, device="core-router", vrf="corporate"))
+
+
+def build_port(model=Port, **kwargs):
+    """Build a Port of `model` with `kwargs` overriding its defaults."""
+    return model(
+        **{"name": "Ethernet1/1", "device": "core-router", "type": "1000base-t", "mode": "access", "status": "active"},
+        **kwargs,
+    )
+
+
+class TestCompactModels(TestCase):
+    """Test compact_model and CompactModelMixin."""
+
+    def test_compact_model(self):
+        """Test compact variants subclass the model and are only built once."""
+        compact = compact_model(Port)
+        self.assertTrue(issubclass(compact, Port))
+        self.assertTrue(issubclass(compact, CompactModelMixin))
+        self.assertEqual(compact.__name__, "CompactPort")
+        self.assertEqual(compact.get_type(), "port")
+        self.assertIs(compact_model(Port), compact)
+        self.assertIs(compact_model(compact), compact)
+        self.assertIsNot(compact_model(IPAddress), compact)
+
+    def test_fields(self):
+        """Test compact models hold the same values and behave as the model they compact."""
+        plain = build_port(mtu=1500, tags="b,a", uuid=uuid.UUID(int=1))
+        compact = build_port(compact_model(Port), mtu=1500, tags="b,a", uuid=uuid.UUID(int=1))
+        self.assertEqual(compact.name, "Ethernet1/1")
+        self.assertEqual(compact.vlans, [])
+        self.assertEqual(compact.get_identifiers(), plain.get_identifiers())
+        self.assertEqual(compact.get_attrs(), plain.get_attrs())
+        self.assertEqual(compact.get_unique_id(), plain.get_unique_id())
+        self.assertEqual(compact.dict(exclude_unset=True), plain.dict(exclude_unset=True))
+        self.assertEqual(compact, plain)
+        self.assertEqual(compact.copy(), compact)
+        self.assertEqual(copy.deepcopy(compact), compact)
+        self.assertEqual(compact.copy(update={"mtu": 9000}).mtu, 9000)
+        self.assertEqual(compact.mtu, 1500)
+        with self.assertRaises(ValidationError):
+            build_port(compact_model(Port), mtu="jumbo")
+
+    def test_assignment(self):
+        """Test assigned values are stored, recorded as set and sharing of the set fields is kept."""
+        first = build_port(compact_model(Port))
+        second = build_port(compact_model(Port))
+        self.assertIs(first.__fields_set__, second.__fields_set__)
+        first.mtu = 9000
+        self.assertEqual(first.mtu, 9000)
+        self.assertEqual(first.get_attrs()["mtu"], 9000)
+        self.assertIn("mtu", first.__fields_set__)
+        self.assertNotIn("mtu", second.__fields_set__)
+        second.mtu = 1500
+        self.assertIs(first.__fields_set__, second.__fields_set__)
+        with self.assertRaises(ValueError):
+            first.speed = 1000
+
+    def test_adapters(self):
+        """Test compact models can be added, retrieved, diffed and synced alongside the models they compact."""
+        plain = PortAdapter()
+        plain.load_ports(mtu=9000)
+        compact = PortAdapter()
+        use_compact_models(compact)
+        self.assertIs(PortAdapter.port, Port)
+        compact.load_ports()
+        port = compact.get(compact.port, {"device": "core-router", "name": "Ethernet1/1"})
+        self.assertIsInstance(port, compact_model(Port))
+        self.assertIs(port.diffsync, compact)
+        self.assertIsInstance(compact.get("ipaddr", "10.0.0.1/24__corporate"), compact_model(IPAddress))
+        diff = compact.diff_from(plain)
+        self.assertEqual(diff.summary()["update"], 1)
+        compact.sync_from(plain)
+        self.assertEqual(port.mtu, 9000)
+        self.assertFalse(compact.diff_from(plain).has_diffs())
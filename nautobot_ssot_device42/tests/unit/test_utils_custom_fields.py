@@ -0,0 +1,78 @@
+"""Tests of the CustomField pivot and shared CustomField maps."""
+
+import copy
+import json
+import pickle  # nosec B403
+
+from nautobot.utilities.testing import TestCase
+from nautobot_ssot_device42.diffsync.models.base.dcim import Vendor
+from nautobot_ssot_device42.utils.custom_fields import CustomFieldInterner, FrozenDict, pivot_custom_fields
+
+ROWS = [
+    {"key": "Owner", "value": "AT&T", "notes": None, "ip_address": "1.1.1.1"},
+    {"key": "Visibility", "value": "Public", "notes": None, "ip_address": "1.1.1.1"},
+    {"key": "Owner", "value": "AT&T", "notes": None, "ip_address": "1.1.1.2"},
+    {"key": "Visibility", "value": "Public", "notes": None, "ip_address": "1.1.1.2"},
+    {"key": "Owner", "value": "Verizon", "notes": "Contract 42", "ip_address": "1.1.1.3"},
+]
+
+
+def cfield(key, value=None, notes=None):
+    """Return the field dict of a CustomField."""
+    return {"key": key, "value": value, "notes": notes}
+
+
+class TestPivotCustomFields(TestCase):
+    """Test pivot_custom_fields and the maps it returns."""
+
+    def test_pivot(self):
+        """Test each object only gets the fields it has a value for."""
+        result = pivot_custom_fields(ROWS, object_key=lambda row: row["ip_address"])
+        self.assertEqual(
+            result,
+            {
+                "1.1.1.1": {"Owner": cfield("Owner", "AT&T"), "Visibility": cfield("Visibility", "Public")},
+                "1.1.1.2": {"Owner": cfield("Owner", "AT&T"), "Visibility": cfield("Visibility", "Public")},
+                "1.1.1.3": {"Owner": cfield("Owner", "Verizon", "Contract 42")},
+            },
+        )
+
+    def test_fill(self):
+        """Test fields an object doesn't have a value for are added without a value and don't leak between objects."""
+        result = pivot_custom_fields(ROWS, object_key=lambda row: row["ip_address"], fill_seen=True)
+        self.assertEqual(
+            result["1.1.1.3"],
+            {"Owner": cfield("Owner", "Verizon", "Contract 42"), "Visibility": cfield("Visibility")},
+        )
+        self.assertEqual(result["1.1.1.1"]["Owner"], cfield("Owner", "AT&T"))
+        result = pivot_custom_fields(ROWS[4:], object_key=lambda row: row["ip_address"], fill_keys=["Department"])
+        self.assertEqual(
+            result["1.1.1.3"], {"Owner": cfield("Owner", "Verizon", "Contract 42"), "Department": cfield("Department")}
+        )
+
+    def test_shared(self):
+        """Test objects with the same fields, and the same field in different objects, share one instance."""
+        interner = CustomFieldInterner()
+        result = pivot_custom_fields(ROWS, object_key=lambda row: row["ip_address"], interner=interner)
+        self.assertIs(result["1.1.1.1"], result["1.1.1.2"])
+        self.assertEqual(len(interner), 2)
+        again = pivot_custom_fields(ROWS[:2], object_key=lambda row: row["ip_address"], interner=interner)
+        self.assertIs(again["1.1.1.1"], result["1.1.1.1"])
+        self.assertIs(interner.freeze({}, fill_keys=["Owner"])["Owner"], interner.field("Owner"))
+        unhashable = interner.freeze({"Owner": (["AT&T"], None)})
+        self.assertEqual(unhashable, {"Owner": cfield("Owner", ["AT&T"])})
+
+    def test_frozen(self):
+        """Test the maps can't be changed but can be copied, pickled, serialized and used as model attributes."""
+        frozen = pivot_custom_fields(ROWS, object_key=lambda row: row["ip_address"])["1.1.1.1"]
+        with self.assertRaises(TypeError):
+            frozen["Owner"] = cfield("Owner")
+        with self.assertRaises(TypeError):
+            frozen["Owner"]["value"] = "Verizon"
+        with self.assertRaises(TypeError):
+            frozen.update({})
+        self.assertIs(copy.deepcopy(frozen), frozen)
+        self.assertEqual(pickle.loads(pickle.dumps(frozen)), frozen)  # nosec B301
+        self.assertIsInstance(pickle.loads(pickle.dumps(frozen)), FrozenDict)  # nosec B301
+        self.assertEqual(json.loads(json.dumps(frozen)), frozen)
+        self.assertIs(Vendor(name="Cisco", custom_fields=frozen).custom_fields, frozen)
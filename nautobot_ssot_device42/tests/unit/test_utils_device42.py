@@ -1,8 +1,16 @@
 """Tests of Device42 utility methods."""
 
+import asyncio
+import gzip
+import io
 import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import MagicMock, patch
+from urllib.parse import parse_qs, urlparse
 
+import requests
 import responses
 from django.conf import settings
 from nautobot.utilities.testing import TestCase
@@ -40,6 +48,29 @@ class TestUtilsDevice42(TestCase):
         second_dict = {"total_count": 10, "limit": 2, "offset": 4, "Objects": ["c", "d"]}
         result_dict = {"total_count": 10, "limit": 2, "offset": 4, "Objects": ["a", "b", "c", "d"]}
         self.assertEqual(device42.merge_offset_dicts(orig_dict=first_dict, offset_dict=second_dict), result_dict)
+        self.assertEqual(first_dict["Objects"], ["a", "b"])
+
+    def test_merge_paginated_responses(self):
+        pages = [
+            {"total_count": 5, "limit": 2, "offset": 0, "Objects": ["a", "b"]},
+            {"total_count": 5, "limit": 2, "offset": 2, "Objects": ["c", "d"]},
+            {"total_count": 5, "limit": 2, "offset": 4, "Objects": ["e"]},
+        ]
+        first_list = pages[0]["Objects"]
+        result = device42.merge_paginated_responses(pages)
+        self.assertEqual(result, {"total_count": 5, "limit": 2, "offset": 4, "Objects": ["a", "b", "c", "d", "e"]})
+        self.assertIs(result["Objects"], first_list)
+
+    def test_iter_json_array(self):
+        records = [{"name": "a", "tags": "x,y"}, {"name": 'b "]}'}, 10, 2.5, None, "c"]
+        text = json.dumps(records)
+        for size in (1, 3, 7, len(text)):
+            chunks = (text[i : i + size] for i in range(0, len(text), size))
+            self.assertEqual(list(device42.iter_json_array(chunks)), records)
+        self.assertEqual(list(device42.iter_json_array(iter(["[", " ]"]))), [])
+        self.assertEqual(list(device42.iter_json_array(iter(['{"msg": ', '"error"}']))), [{"msg": "error"}])
+        with self.assertRaises(json.JSONDecodeError):
+            list(device42.iter_json_array(iter(['[{"name": "a"}, {"na'])))
 
     def test_get_intf_type_eth_intf(self):
         # test physical Ethernet interfaces
@@ -216,6 +247,105 @@ class TestUtilsDevice42(TestCase):
         actual = device42.get_custom_field_dict(cfields=mock_custom_fields)
         self.assertEqual(actual, expected)
 
+    @parameterized.expand(
+        [
+            ("empty", "{}", []),
+            ("numbers", "{1,2}", ["1", "2"]),
+            ("empty_string", '{""}', [""]),
+            ("quoted", '{"a b",NULL,"NULL","x\\"y"}', ["a b", None, "NULL", 'x"y']),
+        ],
+        skip_on_empty=True,
+    )
+    def test_parse_doql_array(self, name, sent, received):  # pylint: disable=unused-argument
+        """Test parse_doql_array parses PostgreSQL array literals."""
+        self.assertEqual(device42.parse_doql_array(sent), received)
+
+    def test_doql_select(self):
+        """Test doql_select projects the given columns and always includes the key."""
+        self.assertEqual(device42.doql_select(None, key="building_pk"), "*")
+        self.assertEqual(device42.doql_select(("name", "building_pk"), key="building_pk"), "building_pk, name")
+        self.assertEqual(
+            device42.doql_select(("number",), key="patchpanelport_pk", prefix="p."), "p.patchpanelport_pk, p.number"
+        )
+        self.assertEqual(device42.include_columns(None), {})
+        self.assertEqual(device42.include_columns(("name", "tags", "name")), {"include_cols": "name,tags"})
+
+    def test_iter_csv_records(self):
+        """Test iter_csv_records converts typed columns and leaves text columns as strings."""
+        lines = io.StringIO('netport_pk,vlan_pks,up,mtu,tags\r\n1,"{1,2}",t,1500,"a,b"\r\n2,{},f,,\r\n')
+        types = {"netport_pk": "int", "vlan_pks": "array", "up": "bool", "mtu": "int"}
+        self.assertEqual(
+            list(device42.iter_csv_records(lines, types)),
+            [
+                {"netport_pk": 1, "vlan_pks": ["1", "2"], "up": True, "mtu": 1500, "tags": "a,b"},
+                {"netport_pk": 2, "vlan_pks": [], "up": False, "mtu": None, "tags": ""},
+            ],
+        )
+        self.assertEqual(list(device42.iter_csv_records(io.StringIO(""), types)), [])
+
+    def test_iter_csv_records_null_text(self):
+        """Test iter_csv_records returns flagged text columns as None and removes the flag columns."""
+        self.assertEqual(
+            device42.doql_null_flags({"netport_pk": "int", "description": "text"}, alias="q"),
+            ', q."description" IS NULL AS "description__is_null"',
+        )
+        self.assertEqual(device42.doql_null_flags({"netport_pk": "int"}, alias="q"), "")
+        lines = io.StringIO("netport_pk,description,description__is_null\r\n1,,t\r\n2,,f\r\n3,Uplink,f\r\n")
+        self.assertEqual(
+            list(device42.iter_csv_records(lines, {"netport_pk": "int", "description": "text"})),
+            [
+                {"netport_pk": 1, "description": None},
+                {"netport_pk": 2, "description": ""},
+                {"netport_pk": 3, "description": "Uplink"},
+            ],
+        )
+
+
+class TestAsyncDevice42Api(TestCase):
+    """Test AsyncDevice42API facade."""
+
+    def setUp(self):
+        """Setup a fake client tracking how many calls are in flight."""
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+        def slow_call(result):
+            def call():
+                with self.lock:
+                    self.in_flight += 1
+                    self.max_in_flight = max(self.max_in_flight, self.in_flight)
+                time.sleep(0.05)
+                with self.lock:
+                    self.in_flight -= 1
+                return result
+
+            return call
+
+        self.client = MagicMock(spec=device42.Device42API)
+        self.client.get_buildings.side_effect = slow_call(["building"])
+        self.client.get_rooms.side_effect = slow_call(["room"])
+        self.client.get_racks.side_effect = slow_call(["rack"])
+        self.client.get_vendors.side_effect = slow_call(["vendor"])
+
+    def test_fetch_bounded_concurrency(self):
+        """Test fetch retrieves datasets concurrently without exceeding max_concurrency."""
+        with device42.AsyncDevice42API(client=self.client, max_concurrency=2) as async_client:
+            result = async_client.fetch("get_buildings", "get_rooms", "get_racks", "get_vendors")
+        self.assertEqual(
+            result,
+            {"get_buildings": ["building"], "get_rooms": ["room"], "get_racks": ["rack"], "get_vendors": ["vendor"]},
+        )
+        self.assertEqual(self.max_in_flight, 2)
+
+    def test_method_surface(self):
+        """Test client methods are exposed as coroutines while other attributes are not."""
+        async_client = device42.AsyncDevice42API(client=self.client)
+        self.assertEqual(asyncio.run(async_client.get_buildings()), ["building"])
+        with self.assertRaises(AttributeError):
+            async_client.close_session  # pylint: disable=pointless-statement
+        async_client.close()
+
 
 class TestDevice42Api(TestCase):  # pylint: disable=too-many-public-methods
     """Test Base Device42 API Client and Calls."""
@@ -258,6 +388,423 @@ class TestDevice42Api(TestCase):  # pylint: disable=too-many-public-methods
         validate_url = self.dev42.validate_url("api_endpoint")
         self.assertEqual(validate_url, "https://device42.testexample.com/api_endpoint")
 
+    def test_session_configuration(self):
+        """Test the pooled session is configured once with auth, headers, verify and pool size."""
+        self.dev42 = device42.Device42API(self.uri, self.username, self.password, self.verify, pool_size=4)
+        self.assertEqual(self.dev42.session.auth, (self.username, self.password))
+        self.assertEqual(self.dev42.session.headers["Content-Type"], "application/x-www-form-urlencoded")
+        self.assertFalse(self.dev42.session.verify)
+        adapter = self.dev42.session.get_adapter(self.uri)
+        self.assertEqual(adapter._pool_connections, 4)  # pylint: disable=protected-access
+        self.assertEqual(adapter._pool_maxsize, 4)  # pylint: disable=protected-access
+
+    @responses.activate
+    def test_api_call_pagination_uses_session(self):
+        """Test api_call sends the first page and all pagination pages through the pooled session."""
+        url = "https://device42.testexample.com/api/1.0/buildings"
+        responses.add(
+            responses.GET, url, json={"total_count": 3, "limit": 2, "offset": 0, "buildings": ["a", "b"]}, status=200
+        )
+        responses.add(
+            responses.GET, url, json={"total_count": 3, "limit": 2, "offset": 2, "buildings": ["c"]}, status=200
+        )
+        with patch.object(self.dev42.session, "request", wraps=self.dev42.session.request) as mock_request:
+            result = self.dev42.api_call(path="api/1.0/buildings")
+        self.assertEqual(mock_request.call_count, 2)
+        self.assertEqual(result["buildings"], ["a", "b", "c"])
+        self.assertNotIn("offset", result)
+        self.assertTrue(all(call.request.headers["Authorization"].startswith("Basic") for call in responses.calls))
+
+    @responses.activate
+    def test_api_call_concurrent_pagination(self):
+        """Test api_call fetches remaining pages in parallel and reassembles them in offset order."""
+
+        def page_callback(request):
+            offset = int(parse_qs(urlparse(request.url).query).get("offset", ["0"])[0])
+            body = {
+                "total_count": 7,
+                "limit": 2,
+                "offset": offset,
+                "buildings": list(range(offset, min(offset + 2, 7))),
+            }
+            return (200, {}, json.dumps(body))
+
+        url = "https://device42.testexample.com/api/1.0/buildings"
+        responses.add_callback(responses.GET, url, callback=page_callback, content_type="application/json")
+        self.dev42 = device42.Device42API(self.uri, self.username, self.password, self.verify, max_workers=3)
+        result = self.dev42.api_call(path="api/1.0/buildings")
+        self.assertEqual(result["buildings"], [0, 1, 2, 3, 4, 5, 6])
+        self.assertEqual(result["total_count"], 7)
+        self.assertNotIn("offset", result)
+        self.assertEqual(len(responses.calls), 4)
+
+    @responses.activate
+    def test_api_call_concurrent_pagination_without_limit(self):
+        """Test api_call returns the first page as is when its limit is 0."""
+        url = "https://device42.testexample.com/api/1.0/buildings"
+        responses.add(
+            responses.GET, url, json={"total_count": 3, "limit": 0, "offset": 0, "buildings": ["a"]}, status=200
+        )
+        self.dev42 = device42.Device42API(self.uri, self.username, self.password, self.verify, max_workers=3)
+        self.assertEqual(self.dev42.api_call(path="api/1.0/buildings")["buildings"], ["a"])
+        self.assertEqual(len(responses.calls), 1)
+
+    @responses.activate
+    def test_api_call_http_error(self):
+        """Test api_call logs an error returned by Device42 and returns False."""
+        responses.add(responses.GET, "https://device42.testexample.com/api/1.0/rooms", status=404)
+        with self.assertLogs("nautobot_ssot_device42.utils.device42", level="ERROR") as logs:
+            self.assertFalse(self.dev42.api_call(path="api/1.0/rooms"))
+        self.assertIn("404", logs.output[0])
+
+    @responses.activate
+    @patch.object(device42.Device42API, "MAX_PAGES", 2)
+    def test_api_call_concurrent_pagination_truncated(self):
+        """Test api_call stops after MAX_PAGES further pages, logging and counting the truncated response."""
+        url = "https://device42.testexample.com/api/1.0/buildings"
+
+        def page_callback(request):
+            offset = int(parse_qs(urlparse(request.url).query).get("offset", ["0"])[0])
+            return (200, {}, json.dumps({"total_count": 10, "limit": 1, "offset": offset, "buildings": [offset]}))
+
+        responses.add_callback(responses.GET, url, callback=page_callback)
+        self.dev42 = device42.Device42API(self.uri, self.username, self.password, self.verify, max_workers=3)
+        with self.assertLogs("nautobot_ssot_device42.utils.device42", level="WARNING") as logs:
+            result = self.dev42.api_call(path="api/1.0/buildings")
+        self.assertEqual(result["buildings"], [0, 1, 2, 3])
+        self.assertEqual(self.dev42.stats["truncated responses"], 1)
+        self.assertIn(url, logs.output[0])
+
+    @responses.activate
+    def test_doql_query_iter(self):
+        """Test doql_query_iter streams and yields each record of the DOQL response."""
+        records = [{"netport_pk": num, "port_name": f"Ethernet{num}"} for num in range(500)]
+        responses.add(
+            responses.GET,
+            "https://device42.testexample.com/services/data/v1.0/query/?query=SELECT netport_pk, port AS port_name FROM view_netport_v1&output_type=json&_paging=1&_return_as_object=1&_max_results=1000",
+            json=records,
+            status=200,
+        )
+        response = self.dev42.doql_query_iter(query="SELECT netport_pk, port AS port_name FROM view_netport_v1")
+        self.assertEqual(len(responses.calls), 0)
+        self.assertEqual(next(response), records[0])
+        self.assertEqual(list(response), records[1:])
+        self.assertEqual(len(responses.calls), 1)
+
+    @responses.activate
+    def test_doql_query_iter_http_error(self):
+        """Test doql_query_iter raises when Device42 returns an error rather than yielding nothing."""
+        responses.add(responses.GET, "https://device42.testexample.com/services/data/v1.0/query/", status=404)
+        with self.assertRaises(requests.exceptions.HTTPError):
+            list(self.dev42.doql_query_iter(query="SELECT * FROM view_netport_v1"))
+
+    @responses.activate
+    def test_doql_query_chunked(self):
+        """Test doql_query_chunked pages through a DOQL query by keyset until a short chunk is returned."""
+        records = [{"netport_fk": num // 2, "key": f"cf{num % 2}", "value": "x"} for num in range(5)]
+        queries = []
+
+        def doql_callback(request):
+            queries.append(parse_qs(urlparse(request.url).query)["query"][0])
+            body = records[(len(queries) - 1) * 2 : len(queries) * 2]
+            return (200, {}, json.dumps(body))
+
+        responses.add_callback(
+            responses.GET,
+            "https://device42.testexample.com/services/data/v1.0/query/",
+            callback=doql_callback,
+            content_type="application/json",
+        )
+        query = "SELECT cf.netport_fk, cf.key, cf.value FROM view_netport_custom_fields_v1 cf"
+        result = list(self.dev42.doql_query_chunked(query=query, keys=("netport_fk", "key"), chunk_size=2))
+        self.assertEqual(result, records)
+        self.assertEqual(
+            queries,
+            [
+                f'SELECT * FROM ({query}) chunk ORDER BY chunk."netport_fk", chunk."key" LIMIT 2',
+                f'SELECT * FROM ({query}) chunk WHERE (chunk."netport_fk", chunk."key") > (0, \'cf1\') ORDER BY chunk."netport_fk", chunk."key" LIMIT 2',
+                f'SELECT * FROM ({query}) chunk WHERE (chunk."netport_fk", chunk."key") > (1, \'cf1\') ORDER BY chunk."netport_fk", chunk."key" LIMIT 2',
+            ],
+        )
+
+    @responses.activate
+    def test_doql_query_chunked_csv(self):
+        """Test doql_query_chunked flags NULL text columns within each chunk when retrieving CSV."""
+        responses.add(
+            responses.GET,
+            "https://device42.testexample.com/services/data/v1.0/query/",
+            body="netport_pk,description,description__is_null\r\n1,,t\r\n",
+            content_type="text/csv",
+        )
+        self.dev42 = device42.Device42API(self.uri, self.username, self.password, self.verify, doql_output_type="csv")
+        query = "SELECT n.netport_pk, n.description FROM view_netport_v1 n"
+        types = {"netport_pk": "int", "description": "text"}
+        result = list(self.dev42.doql_query_chunked(query=query, keys=("netport_pk",), chunk_size=2, types=types))
+        self.assertEqual(result, [{"netport_pk": 1, "description": None}])
+        self.assertEqual(
+            parse_qs(urlparse(responses.calls[0].request.url).query)["query"],
+            [
+                f'SELECT chunk.*, chunk."description" IS NULL AS "description__is_null" FROM ({query}) chunk '
+                'ORDER BY chunk."netport_pk" LIMIT 2'
+            ],
+        )
+
+    @responses.activate
+    @patch("nautobot_ssot_device42.utils.device42.time.sleep")
+    def test_doql_query_chunked_failed_chunk(self, mock_sleep):  # pylint: disable=unused-argument
+        """Test doql_query_chunked raises when a chunk fails instead of treating it as the end of the records."""
+        records = [{"netport_pk": num} for num in range(4)]
+        calls = []
+
+        def doql_callback(request):  # pylint: disable=unused-argument
+            calls.append(request)
+            if len(calls) == 1:
+                return (200, {}, json.dumps(records[:2]))
+            return (500, {}, "")
+
+        responses.add_callback(
+            responses.GET,
+            "https://device42.testexample.com/services/data/v1.0/query/",
+            callback=doql_callback,
+            content_type="application/json",
+        )
+        result = []
+        with self.assertRaises(requests.exceptions.HTTPError):
+            for record in self.dev42.doql_query_chunked(
+                query="SELECT netport_pk FROM view_netport_v1", keys=("netport_pk",), chunk_size=2
+            ):
+                result.append(record)
+        self.assertEqual(result, records[:2])
+
+    @responses.activate
+    def test_get_netports(self):
+        """Test get_netports retrieves every Port with its VLANs and Building in a single scan of the netports."""
+        expected = load_json("./nautobot_ssot_device42/tests/fixtures/get_netports_recv.json")
+        responses.add(
+            responses.GET, "https://device42.testexample.com/services/data/v1.0/query/", json=expected, status=200
+        )
+        response = self.dev42.get_netports()
+        self.assertEqual(response, expected)
+        self.assertEqual(len(responses.calls), 1)
+        query = parse_qs(urlparse(responses.calls[0].request.url).query)["query"][0]
+        self.assertEqual(query.count("view_netport_v1"), 1)
+        self.assertIn("array_agg(vn.vlan_name ORDER BY vn.vlan_fk)", query)
+
+    def test_netport_pk_map(self):
+        """Test netport_pk_map maps every Port to its primary key, falling back to the MAC address for Ports without a name."""
+        netports = load_json("./nautobot_ssot_device42/tests/fixtures/get_netports_recv.json")
+        netports.append(dict(netports[0], netport_pk=7, device_name=None))
+        result = device42.netport_pk_map(netports)
+        self.assertEqual(sorted(result), [1, 2, 3, 4, 5, 6])
+        self.assertEqual(
+            result[2],
+            {
+                "port": "Management0",
+                "netport_pk": 2,
+                "hwaddress": "1234567890ab",
+                "second_device_fk": None,
+                "device": "core-router.testexample.com",
+            },
+        )
+        self.assertEqual(result[6]["port"], "ba0987654321")
+
+    @responses.activate
+    def test_get_netports_csv_gzip(self):
+        """Test get_netports is retrieved as gzip compressed CSV and returns the same records, and NULLs, as JSON."""
+        text = ("port_name", "description", "discovered_type", "hwaddress", "port_type", "port_speed", "tags")
+        text += ("device_name", "building", "customer")
+        body = (
+            "netport_pk,port_name,description,up,up_admin,discovered_type,hwaddress,port_type,port_speed,mtu,tags,"
+            "second_device_fk,device_name,building,customer,vlan_pks,vlan_names,"
+            + ",".join(f"{column}__is_null" for column in text)
+            + "\r\n"
+            '4,GigabitEthernet1/0/1,"Uplink, primary",t,f,ethernetCsmacd,abcdef012345,physical,1.0 Gbps,1518,'
+            '"first-tag,second-tag",,core-router.testexample.com,,,"{1,2}","{Public,DMZ}",f,f,f,f,f,f,f,f,t,t\r\n'
+            "5,,,f,t,,,,,,,,core-router.testexample.com,,,,,t,t,t,f,t,t,f,f,t,t\r\n"
+        )
+        responses.add(
+            responses.GET,
+            "https://device42.testexample.com/services/data/v1.0/query/",
+            body=gzip.compress(body.encode()),
+            headers={"Content-Encoding": "gzip"},
+            content_type="text/csv",
+            status=200,
+        )
+        self.dev42 = device42.Device42API(self.uri, self.username, self.password, self.verify, doql_output_type="csv")
+        response = self.dev42.get_netports()
+        self.assertEqual(
+            response,
+            [
+                {
+                    "netport_pk": 4,
+                    "port_name": "GigabitEthernet1/0/1",
+                    "description": "Uplink, primary",
+                    "up": True,
+                    "up_admin": False,
+                    "discovered_type": "ethernetCsmacd",
+                    "hwaddress": "abcdef012345",
+                    "port_type": "physical",
+                    "port_speed": "1.0 Gbps",
+                    "mtu": 1518,
+                    "tags": "first-tag,second-tag",
+                    "second_device_fk": None,
+                    "device_name": "core-router.testexample.com",
+                    "building": None,
+                    "customer": None,
+                    "vlan_pks": ["1", "2"],
+                    "vlan_names": ["Public", "DMZ"],
+                },
+                {
+                    "netport_pk": 5,
+                    "port_name": None,
+                    "description": None,
+                    "up": False,
+                    "up_admin": True,
+                    "discovered_type": None,
+                    "hwaddress": "",
+                    "port_type": None,
+                    "port_speed": None,
+                    "mtu": None,
+                    "tags": "",
+                    "second_device_fk": None,
+                    "device_name": "core-router.testexample.com",
+                    "building": None,
+                    "customer": None,
+                    "vlan_pks": None,
+                    "vlan_names": None,
+                },
+            ],
+        )
+        query = parse_qs(urlparse(responses.calls[0].request.url).query)
+        self.assertEqual(query["output_type"], ["csv"])
+        self.assertTrue(query["query"][0].startswith('SELECT q.*, q."port_name" IS NULL AS "port_name__is_null", '))
+
+    @responses.activate
+    def test_doql_query_iter_gzip(self):
+        """Test doql_query_iter decompresses a gzip compressed JSON response."""
+        records = [{"netport_pk": num} for num in range(100)]
+        responses.add(
+            responses.GET,
+            "https://device42.testexample.com/services/data/v1.0/query/",
+            body=gzip.compress(json.dumps(records).encode()),
+            headers={"Content-Encoding": "gzip"},
+            content_type="application/json",
+            status=200,
+        )
+        self.assertEqual(list(self.dev42.doql_query_iter(query="SELECT netport_pk FROM view_netport_v1")), records)
+
+    @responses.activate
+    @patch("nautobot_ssot_device42.utils.device42.time.sleep")
+    def test_api_call_retries_transient_errors(self, mock_sleep):
+        """Test api_call retries 502/503 responses with backoff before succeeding."""
+        url = "https://device42.testexample.com/api/1.0/buildings"
+        responses.add(responses.GET, url, status=503)
+        responses.add(responses.GET, url, status=502)
+        responses.add(responses.GET, url, json={"buildings": ["a"]}, status=200)
+        self.assertEqual(self.dev42.api_call(path="api/1.0/buildings"), {"buildings": ["a"]})
+        self.assertEqual(mock_sleep.call_count, 2)
+        self.assertEqual(self.dev42.stats["requests"], 3)
+        self.assertEqual(self.dev42.stats["retries"], 2)
+        self.assertEqual(self.dev42.stats["retries (503)"], 1)
+        self.assertEqual(self.dev42.stats["retries (502)"], 1)
+
+    @responses.activate
+    @patch("nautobot_ssot_device42.utils.device42.time.sleep")
+    def test_api_call_honours_retry_after(self, mock_sleep):
+        """Test the Retry-After header of a 429 response is used as the retry delay."""
+        url = "https://device42.testexample.com/api/1.0/buildings"
+        responses.add(responses.GET, url, status=429, headers={"Retry-After": "7"})
+        responses.add(responses.GET, url, json={"buildings": []}, status=200)
+        self.dev42.api_call(path="api/1.0/buildings")
+        mock_sleep.assert_called_once_with(7.0)
+
+    @responses.activate
+    @patch("nautobot_ssot_device42.utils.device42.time.sleep")
+    def test_api_call_retries_exhausted(self, mock_sleep):
+        """Test api_call returns False once retries have been exhausted."""
+        responses.add(responses.GET, "https://device42.testexample.com/api/1.0/buildings", status=503)
+        self.dev42 = device42.Device42API(self.uri, self.username, self.password, self.verify, max_retries=2)
+        self.assertFalse(self.dev42.api_call(path="api/1.0/buildings"))
+        self.assertEqual(len(responses.calls), 3)
+        self.assertEqual(mock_sleep.call_count, 2)
+        self.assertEqual(self.dev42.stats["failures"], 1)
+
+    @responses.activate
+    @patch("nautobot_ssot_device42.utils.device42.time.sleep")
+    def test_api_call_retries_failed_page_only(self, mock_sleep):  # pylint: disable=unused-argument
+        """Test a failed pagination page is retried on its own without restarting the dataset."""
+        url = "https://device42.testexample.com/api/1.0/buildings"
+        responses.add(
+            responses.GET, url, json={"total_count": 3, "limit": 2, "offset": 0, "buildings": ["a", "b"]}, status=200
+        )
+        responses.add(responses.GET, url, status=502)
+        responses.add(
+            responses.GET, url, json={"total_count": 3, "limit": 2, "offset": 2, "buildings": ["c"]}, status=200
+        )
+        result = self.dev42.api_call(path="api/1.0/buildings")
+        self.assertEqual(result["buildings"], ["a", "b", "c"])
+        self.assertEqual(len(responses.calls), 3)
+        self.assertIn("offset=2", responses.calls[1].request.url)
+        self.assertIn("offset=2", responses.calls[2].request.url)
+
+    @responses.activate
+    @patch("nautobot_ssot_device42.utils.device42.time.sleep")
+    def test_circuit_breaker_fails_fast(self, mock_sleep):  # pylint: disable=unused-argument
+        """Test requests are refused once the circuit breaker has opened."""
+        responses.add(responses.GET, "https://device42.testexample.com/api/1.0/buildings", status=503)
+        self.dev42 = device42.Device42API(
+            self.uri,
+            self.username,
+            self.password,
+            self.verify,
+            max_retries=5,
+            circuit_breaker=device42.CircuitBreaker(failure_threshold=3, reset_timeout=60),
+        )
+        with self.assertRaises(device42.CircuitBreakerOpen):
+            self.dev42.api_call(path="api/1.0/buildings")
+        self.assertEqual(len(responses.calls), 3)
+
+    def test_circuit_breaker_half_open(self):
+        """Test the circuit breaker lets a trial request through after the reset timeout and closes on success."""
+        breaker = device42.CircuitBreaker(failure_threshold=2, reset_timeout=10)
+        breaker.record_failure()
+        breaker.before_request()
+        breaker.record_failure()
+        with self.assertRaises(device42.CircuitBreakerOpen):
+            breaker.before_request()
+        breaker.opened_at -= 10
+        breaker.before_request()
+        with self.assertRaises(device42.CircuitBreakerOpen):
+            breaker.before_request()
+        breaker.record_success()
+        self.assertIsNone(breaker.opened_at)
+        self.assertEqual(breaker.failures, 0)
+        breaker.before_request()
+
+    def test_circuit_breaker_trial_failure(self):
+        """Test a failed trial re-opens the circuit and an abandoned trial lets another request through."""
+        breaker = device42.CircuitBreaker(failure_threshold=1, reset_timeout=10)
+        breaker.record_failure()
+        breaker.opened_at -= 10
+        breaker.before_request()
+        breaker.record_failure()
+        with self.assertRaises(device42.CircuitBreakerOpen):
+            breaker.before_request()
+        breaker.opened_at -= 10
+        breaker.before_request()
+        breaker.trial_at -= 10
+        breaker.before_request()
+        breaker.record_rate_limited()
+        self.assertIsNone(breaker.opened_at)
+        breaker.before_request()
+
+    def test_close_via_context_manager(self):
+        """Test the session is closed when the client is used as a context manager."""
+        with patch.object(self.dev42.session, "close") as mock_close:
+            with self.dev42 as client:
+                self.assertIs(client, self.dev42)
+            mock_close.assert_called_once()
+
     @responses.activate
     def test_get_buildings(self):
         """Test get_buildings success."""
@@ -273,6 +820,131 @@ class TestDevice42Api(TestCase):  # pylint: disable=too-many-public-methods
         self.assertEqual(response, expected)
         self.assertTrue(len(responses.calls) == 1)
 
+    @responses.activate
+    def test_memoized_requests(self):
+        """Test repeated memoized queries are served from the memo while other and failed requests are always sent."""
+        url = "https://device42.testexample.com/services/data/v1.0/query/"
+        query = "SELECT cf.key, cf.value, cf.notes FROM view_subnet_custom_fields_v1 cf"
+        responses.add(responses.GET, url, json=[{"key": "Owner", "value": None, "notes": None}], status=200)
+        first = self.dev42.doql_query(query=query, memoize=True)
+        first[0]["value"] = "changed"
+        second = self.dev42.doql_query(query=query, memoize=True)
+        self.assertEqual(second, [{"key": "Owner", "value": None, "notes": None}])
+        self.assertEqual(len(responses.calls), 1)
+        self.dev42.doql_query(query=query)
+        list(self.dev42.doql_query_iter(query=query))
+        self.assertEqual(len(responses.calls), 3)
+        self.assertEqual(self.dev42.stats["cache hits"], 1)
+        self.assertEqual(self.dev42.stats["cache misses"], 1)
+        self.assertEqual(list(self.dev42.memo.responses.values()), [responses.calls[0].response.content])
+
+        responses.add(responses.GET, "https://device42.testexample.com/api/1.0/rooms", status=404)
+        self.assertFalse(self.dev42.api_call(path="api/1.0/rooms", memoize=True))
+        self.assertFalse(self.dev42.api_call(path="api/1.0/rooms", memoize=True))
+        self.assertEqual(len(responses.calls), 5)
+
+        self.dev42 = device42.Device42API(self.uri, self.username, self.password, self.verify, memoize=False)
+        self.dev42.doql_query(query=query, memoize=True)
+        self.assertEqual(len(responses.calls), 6)
+
+    @responses.activate
+    def test_memoized_requests_pagination(self):
+        """Test further pages of a memoized paginated request are always sent."""
+        url = "https://device42.testexample.com/api/1.0/vendors"
+
+        def page_callback(request):
+            offset = int(parse_qs(urlparse(request.url).query).get("offset", ["0"])[0])
+            body = {"vendors": [{"name": f"vendor{offset}"}], "offset": offset, "limit": 1, "total_count": 2}
+            return (200, {}, json.dumps(body))
+
+        responses.add_callback(responses.GET, url, callback=page_callback)
+        for _ in range(2):
+            result = self.dev42.api_call(path="api/1.0/vendors", memoize=True)
+            self.assertEqual(result["vendors"], [{"name": "vendor0"}, {"name": "vendor1"}])
+        self.assertEqual(len(responses.calls), 3)
+        self.assertEqual(len(self.dev42.memo.responses), 1)
+
+    @responses.activate
+    def test_memoized_requests_single_flight(self):
+        """Test concurrent callers of the same request share one request to Device42."""
+        started, release = threading.Event(), threading.Event()
+
+        def slow_callback(request):  # pylint: disable=unused-argument
+            started.set()
+            release.wait(5)
+            return (200, {}, json.dumps([{"vendor_pk": 1, "name": "Cisco"}]))
+
+        responses.add_callback(
+            responses.GET, "https://device42.testexample.com/services/data/v1.0/query/", callback=slow_callback
+        )
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(self.dev42.get_vendor_pks) for _ in range(4)]
+            started.wait(5)
+            time.sleep(0.05)
+            release.set()
+            results = [future.result() for future in futures]
+        self.assertEqual(results, [{1: {"vendor_pk": 1, "name": "Cisco"}}] * 4)
+        self.assertEqual(len(responses.calls), 1)
+        self.assertEqual(self.dev42.stats["cache misses"], 1)
+        self.assertEqual(self.dev42.stats["cache hits"], 3)
+
+    def test_request_memo_shares_errors(self):
+        """Test a failed request is raised to every caller waiting on it and isn't memoized."""
+        memo = device42.RequestMemo()
+        with self.assertRaises(device42.requests.exceptions.ConnectionError):
+            memo.get("key", MagicMock(side_effect=device42.requests.exceptions.ConnectionError))
+        self.assertEqual(memo.get("key", MagicMock(return_value=b"[]")), (b"[]", False))
+        self.assertEqual(memo.get("key", MagicMock()), (b"[]", True))
+
+    def test_request_memo_size_bound(self):
+        """Test the least recently used bodies are forgotten once the memo exceeds its size."""
+        memo = device42.RequestMemo(max_bytes=10)
+        memo.get("first", MagicMock(return_value=b"1234"))
+        memo.get("second", MagicMock(return_value=b"5678"))
+        memo.get("first", MagicMock())
+        memo.get("third", MagicMock(return_value=b"90ab"))
+        self.assertEqual(list(memo.responses), ["first", "third"])
+        self.assertEqual(memo.size, 8)
+        self.assertEqual(memo.get("large", MagicMock(return_value=b"x" * 11)), (b"x" * 11, False))
+        self.assertNotIn("large", memo.responses)
+        memo.clear()
+        self.assertEqual((memo.responses, memo.size), ({}, 0))
+
+    @responses.activate
+    def test_get_devices_columns(self):
+        """Test get_devices only requests the given fields from the REST endpoint."""
+        responses.add(
+            responses.GET,
+            "https://device42.testexample.com/api/1.0/devices/all/",
+            json={"Devices": [{"name": "core-router.testexample.com", "hw_model": "C9300"}]},
+            status=200,
+        )
+        response = self.dev42.get_devices(columns=("name", "hw_model"))
+        self.assertEqual(response, [{"name": "core-router.testexample.com", "hw_model": "C9300"}])
+        query = parse_qs(urlparse(responses.calls[0].request.url).query)
+        self.assertEqual(query["is_it_switch"], ["yes"])
+        self.assertEqual(query["include_cols"], ["name,hw_model"])
+
+    @responses.activate
+    def test_get_pks_columns(self):
+        """Test the primary key lookup queries only select the given columns along with the primary key."""
+        responses.add(
+            responses.GET,
+            "https://device42.testexample.com/services/data/v1.0/query/",
+            json=[{"vendor_pk": 1, "patchpanelport_pk": 1, "name": "Vendor", "number": 1}],
+            status=200,
+        )
+        self.dev42.get_vendor_pks(columns=("name", "notes"))
+        self.dev42.get_patch_panel_port_pks(columns=("number", "name"))
+        queries = [parse_qs(urlparse(call.request.url).query)["query"][0] for call in responses.calls]
+        self.assertEqual(
+            queries,
+            [
+                "SELECT vendor_pk, name, notes FROM view_vendor_v1",
+                "SELECT p.patchpanelport_pk, p.number, a.name FROM view_patchpanelport_v1 p JOIN view_asset_v1 a ON a.asset_pk = p.patchpanel_asset_fk",
+            ],
+        )
+
     @responses.activate
     def test_get_building_pks(self):
         """Test get_building_pks success."""
@@ -418,36 +1090,6 @@ class TestDevice42Api(TestCase):  # pylint: disable=too-many-public-methods
             == "https://device42.testexample.com/services/data/v1.0/query/?query=SELECT+m.name+as+cluster%2C+string_agg%28d.name%2C+%27%253B+%27%29+as+members%2C+h.name+as+hardware%2C+d.network_device%2C+d.os_name+as+os%2C+b.name+as+customer%2C+d.tags+FROM+view_device_v1+m+JOIN+view_devices_in_cluster_v1+c+ON+c.parent_device_fk+%3D+m.device_pk+JOIN+view_device_v1+d+ON+d.device_pk+%3D+c.child_device_fk+JOIN+view_hardware_v1+h+ON+h.hardware_pk+%3D+d.hardware_fk+JOIN+view_customer_v1+b+ON+b.customer_pk+%3D+d.customer_fk+WHERE+m.type+like+%27%25cluster%25%27+GROUP+BY+m.name%2C+h.name%2C+d.network_device%2C+d.os_name%2C+b.name%2C+d.tags&output_type=json&_paging=1&_return_as_object=1&_max_results=1000"
         )
 
-    @responses.activate
-    def test_get_ports_with_vlans(self):
-        """Test get_ports_with_vlans success."""
-        test_query = load_json("./nautobot_ssot_device42/tests/fixtures/get_ports_with_vlans_sent.json")
-        responses.add(
-            responses.GET,
-            "https://device42.testexample.com/services/data/v1.0/query/?query=SELECT array_agg( distinct concat (v.vlan_pk)) AS vlan_pks, n.netport_pk, n.port AS port_name, n.description, n.up, n.up_admin, n.discovered_type, n.hwaddress, n.port_type, n.port_speed, n.mtu, n.tags, n.second_device_fk, d.name AS device_name FROM view_vlan_v1 v LEFT JOIN view_vlan_on_netport_v1 vn ON vn.vlan_fk = v.vlan_pk LEFT JOIN view_netport_v1 n ON n.netport_pk = vn.netport_fk LEFT JOIN view_device_v1 d ON d.device_pk = n.device_fk WHERE n.port is not null GROUP BY n.netport_pk, n.port, n.description, n.up, n.up_admin, n.discovered_type, n.hwaddress, n.port_type, n.port_speed, n.mtu, n.tags, n.second_device_fk, d.name&output_type=json&_paging=1&_return_as_object=1&_max_results=1000",
-            json=test_query,
-            status=200,
-        )
-        expected = load_json("./nautobot_ssot_device42/tests/fixtures/get_ports_with_vlans_recv.json")
-        response = self.dev42.get_ports_with_vlans()
-        self.assertEqual(response, expected)
-        self.assertTrue(len(responses.calls) == 1)
-
-    @responses.activate
-    def test_get_ports_wo_vlans(self):
-        """Test get_ports_wo_vlans success."""
-        test_query = load_json("./nautobot_ssot_device42/tests/fixtures/get_ports_wo_vlans_sent.json")
-        responses.add(
-            responses.GET,
-            "https://device42.testexample.com/services/data/v1.0/query/?query=SELECT m.netport_pk, m.port as port_name, m.description, m.up_admin, m.discovered_type, m.hwaddress, m.port_type, m.port_speed, m.mtu, m.tags, m.second_device_fk, d.name as device_name FROM view_netport_v1 m JOIN view_device_v1 d on d.device_pk = m.device_fk WHERE m.port is not null GROUP BY m.netport_pk, m.port, m.description, m.up_admin, m.discovered_type, m.hwaddress, m.port_type, m.port_speed, m.mtu, m.tags, m.second_device_fk, d.name&output_type=json&_paging=1&_return_as_object=1&_max_results=1000",
-            json=test_query,
-            status=200,
-        )
-        expected = load_json("./nautobot_ssot_device42/tests/fixtures/get_ports_wo_vlans_recv.json")
-        response = self.dev42.get_ports_wo_vlans()
-        self.assertEqual(response, expected)
-        self.assertTrue(len(responses.calls) == 1)
-
     @responses.activate
     def test_get_port_default_custom_fields(self):
         """Test get_port_default_custom_fields success."""
@@ -475,7 +1117,7 @@ class TestDevice42Api(TestCase):  # pylint: disable=too-many-public-methods
         test_query = load_json("./nautobot_ssot_device42/tests/fixtures/get_port_custom_fields_sent.json")
         responses.add(
             responses.GET,
-            "https://device42.testexample.com/services/data/v1.0/query/?query=SELECT cf.key, cf.value, cf.notes, np.port as port_name, d.name as device_name FROM view_netport_custom_fields_v1 cf LEFT JOIN view_netport_v1 np ON np.netport_pk = cf.netport_fk LEFT JOIN view_device_v1 d ON d.device_pk = np.device_fk&output_type=json&_paging=1&_return_as_object=1&_max_results=1000",
+            "https://device42.testexample.com/services/data/v1.0/query/?query=SELECT cf.netport_fk, cf.key, cf.value, cf.notes, np.port as port_name, d.name as device_name FROM view_netport_custom_fields_v1 cf LEFT JOIN view_netport_v1 np ON np.netport_pk = cf.netport_fk LEFT JOIN view_device_v1 d ON d.device_pk = np.device_fk&output_type=json&_paging=1&_return_as_object=1&_max_results=1000",
             json=test_query,
             status=200,
         )
@@ -556,13 +1198,13 @@ class TestDevice42Api(TestCase):  # pylint: disable=too-many-public-methods
         test_query = load_json("./nautobot_ssot_device42/tests/fixtures/get_ip_addrs.json")
         responses.add(
             responses.GET,
-            "https://device42.testexample.com/services/data/v1.0/query/?query=SELECT i.ip_address, i.available, i.label, i.tags, np.netport_pk, s.network as subnet, s.mask_bits as netmask, v.name as vrf FROM view_ipaddress_v1 i LEFT JOIN view_subnet_v1 s ON s.subnet_pk = i.subnet_fk LEFT JOIN view_netport_v1 np ON np.netport_pk = i.netport_fk LEFT JOIN view_vrfgroup_v1 v ON v.vrfgroup_pk = s.vrfgroup_fk WHERE s.mask_bits <> 0&output_type=json&_paging=1&_return_as_object=1&_max_results=1000",
+            "https://device42.testexample.com/services/data/v1.0/query/?query=SELECT i.ipaddress_pk, i.ip_address, i.available, i.label, i.tags, np.netport_pk, s.network as subnet, s.mask_bits as netmask, v.name as vrf FROM view_ipaddress_v1 i LEFT JOIN view_subnet_v1 s ON s.subnet_pk = i.subnet_fk LEFT JOIN view_netport_v1 np ON np.netport_pk = i.netport_fk LEFT JOIN view_vrfgroup_v1 v ON v.vrfgroup_pk = s.vrfgroup_fk WHERE s.mask_bits <> 0&output_type=json&_paging=1&_return_as_object=1&_max_results=1000",
             json=test_query,
             status=200,
         )
         expected = load_json("./nautobot_ssot_device42/tests/fixtures/get_ip_addrs.json")
         response = self.dev42.get_ip_addrs()
-        self.assertEqual(response, expected)
+        self.assertEqual(list(response), expected)
         self.assertTrue(len(responses.calls) == 1)
 
     @responses.activate
@@ -586,7 +1228,7 @@ class TestDevice42Api(TestCase):  # pylint: disable=too-many-public-methods
         test_query = load_json("./nautobot_ssot_device42/tests/fixtures/get_ipaddr_custom_fields_sent.json")
         responses.add(
             responses.GET,
-            "https://device42.testexample.com/services/data/v1.0/query/?query=SELECT cf.key, cf.value, cf.notes, i.ip_address, s.mask_bits FROM view_ipaddress_custom_fields_v1 cf LEFT JOIN view_ipaddress_v1 i ON i.ipaddress_pk = cf.ipaddress_fk LEFT JOIN view_subnet_v1 s ON s.subnet_pk = i.subnet_fk&output_type=json&_paging=1&_return_as_object=1&_max_results=1000",
+            "https://device42.testexample.com/services/data/v1.0/query/?query=SELECT cf.ipaddress_fk, cf.key, cf.value, cf.notes, i.ip_address, s.mask_bits FROM view_ipaddress_custom_fields_v1 cf LEFT JOIN view_ipaddress_v1 i ON i.ipaddress_pk = cf.ipaddress_fk LEFT JOIN view_subnet_v1 s ON s.subnet_pk = i.subnet_fk&output_type=json&_paging=1&_return_as_object=1&_max_results=1000",
             json=test_query,
             status=200,
         )
@@ -602,28 +1244,13 @@ class TestDevice42Api(TestCase):  # pylint: disable=too-many-public-methods
         response = self.dev42.get_all_custom_fields(test_sample)
         self.assertEqual(response, expected)
 
-    @responses.activate
-    def test_get_vlans_with_location(self):
-        """Test get_vlans_with_location success."""
-        test_query = load_json("./nautobot_ssot_device42/tests/fixtures/get_vlans_with_location.json")
-        responses.add(
-            responses.GET,
-            "https://device42.testexample.com/services/data/v1.0/query/?query=SELECT v.vlan_pk, v.number AS vid, v.description, v.tags, vn.vlan_name, b.name as building, c.name as customer FROM view_vlan_v1 v LEFT JOIN view_vlan_on_netport_v1 vn ON vn.vlan_fk = v.vlan_pk LEFT JOIN view_netport_v1 n on n.netport_pk = vn.netport_fk LEFT JOIN view_device_v2 d on d.device_pk = n.device_fk LEFT JOIN view_building_v1 b ON b.building_pk = d.building_fk LEFT JOIN view_customer_v1 c ON c.customer_pk = d.customer_fk WHERE vn.vlan_name is not null and v.number <> 0 GROUP BY v.vlan_pk, v.number, v.description, v.tags, vn.vlan_name, b.name, c.name&output_type=json&_paging=1&_return_as_object=1&_max_results=1000",
-            json=test_query,
-            status=200,
-        )
-        expected = load_json("./nautobot_ssot_device42/tests/fixtures/get_vlans_with_location.json")
-        response = self.dev42.get_vlans_with_location()
-        self.assertEqual(response, expected)
-        self.assertTrue(len(responses.calls) == 1)
-
     @responses.activate
     def test_get_vlan_info(self):
         """Test get_vlan_info success."""
         vinfo_query = load_json("./nautobot_ssot_device42/tests/fixtures/get_vlan_info_vlaninfo.json")
         responses.add(
             responses.GET,
-            "https://device42.testexample.com/services/data/v1.0/query/?query=SELECT v.vlan_pk, v.name, v.number as vid FROM view_vlan_v1 v&output_type=json&_paging=1&_return_as_object=1&_max_results=1000",
+            "https://device42.testexample.com/services/data/v1.0/query/?query=SELECT v.vlan_pk, v.name, v.number as vid, v.description, v.tags FROM view_vlan_v1 v&output_type=json&_paging=1&_return_as_object=1&_max_results=1000",
             json=vinfo_query,
             status=200,
         )
@@ -656,23 +1283,6 @@ class TestDevice42Api(TestCase):  # pylint: disable=too-many-public-methods
         self.assertEqual(response, expected)
         self.assertTrue(len(responses.calls) == 1)
 
-    @responses.activate
-    def test_get_port_pks(self):
-        """Test get_port_pks success."""
-        test_query = load_json("./nautobot_ssot_device42/tests/fixtures/get_port_pks_sent.json")
-        responses.add(
-            responses.GET,
-            "https://device42.testexample.com/services/data/v1.0/query/?query=SELECT np.port, np.netport_pk, np.hwaddress, np.second_device_fk, d.name as device FROM view_netport_v1 np JOIN view_device_v1 d ON d.device_pk = np.device_fk&output_type=json&_paging=1&_return_as_object=1&_max_results=1000",
-            json=test_query,
-            status=200,
-        )
-        with open("./nautobot_ssot_device42/tests/fixtures/get_port_pks_recv.json", "r", encoding="utf-8") as file:
-            json_data = file.read()
-        expected = json.loads(json_data, object_hook=lambda d: {int(k) if k.isdigit() else k: v for k, v in d.items()})
-        response = self.dev42.get_port_pks()
-        self.assertEqual(response, expected)
-        self.assertTrue(len(responses.calls) == 1)
-
     @responses.activate
     def test_get_port_connections(self):
         """Test get_port_connections success."""
@@ -685,7 +1295,7 @@ class TestDevice42Api(TestCase):  # pylint: disable=too-many-public-methods
         )
         expected = load_json("./nautobot_ssot_device42/tests/fixtures/get_port_connections.json")
         response = self.dev42.get_port_connections()
-        self.assertEqual(response, expected)
+        self.assertEqual(list(response), expected)
         self.assertTrue(len(responses.calls) == 1)
 
     @responses.activate
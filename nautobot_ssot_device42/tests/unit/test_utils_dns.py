@@ -0,0 +1,124 @@
+"""Tests of concurrent, cached DNS resolution."""
+
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+from unittest.mock import patch
+
+from nautobot.utilities.testing import TestCase
+from nautobot_ssot_device42.utils.dns import DNSResolver
+
+RECORDS = {"core-router.testexample.com": "10.0.0.1", "distro-switch.testexample.com": "10.0.0.2"}
+
+
+class StubResolver:
+    """Resolve names from RECORDS, counting lookups and blocking on names listed in `hang`."""
+
+    def __init__(self, hang=()):
+        """Initialize StubResolver."""
+        self.calls = []
+        self.hang = hang
+        self.release = threading.Event()
+
+    def __call__(self, name: str) -> str:
+        """Return the address of `name` or raise socket.gaierror if it isn't in RECORDS."""
+        self.calls.append(name)
+        if name in self.hang:
+            self.release.wait(5)
+        if name not in RECORDS:
+            raise socket.gaierror(f"{name} not found")
+        return RECORDS[name]
+
+
+class TestDNSResolver(TestCase):
+    """Test DNSResolver."""
+
+    def setUp(self):
+        """Setup a temporary cache path."""
+        self.tmpdir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(self.tmpdir.cleanup)
+        self.path = os.path.join(self.tmpdir.name, "dns.json")
+
+    def test_resolve_all(self):
+        """Test found and missing names are resolved once each and then served from the cache."""
+        stub = StubResolver()
+        resolver = DNSResolver(max_workers=4, resolve=stub)
+        names = ["core-router.testexample.com", "missing.testexample.com", "core-router.testexample.com"]
+        expected = {"core-router.testexample.com": "10.0.0.1", "missing.testexample.com": False}
+        self.assertEqual(resolver.resolve_all(names), expected)
+        self.assertEqual(resolver.resolve_all(names), expected)
+        self.assertEqual(resolver.lookup("missing.testexample.com"), False)
+        self.assertEqual(sorted(stub.calls), ["core-router.testexample.com", "missing.testexample.com"])
+        self.assertEqual(resolver.stats, {"hits": 3, "lookups": 2, "timeouts": 0})
+
+    def test_ttl(self):
+        """Test missing names are looked up again once their shorter negative TTL expires."""
+        stub = StubResolver()
+        resolver = DNSResolver(ttl=600, negative_ttl=60, resolve=stub)
+        resolver.resolve_all(["core-router.testexample.com", "missing.testexample.com"])
+        with patch("nautobot_ssot_device42.utils.dns.time.time", return_value=time.time() + 120):
+            resolver.resolve_all(["core-router.testexample.com", "missing.testexample.com"])
+        self.assertEqual(stub.calls.count("core-router.testexample.com"), 1)
+        self.assertEqual(stub.calls.count("missing.testexample.com"), 2)
+
+    def test_timeout(self):
+        """Test a lookup that doesn't finish in time is reported missing without holding up the others or being cached."""
+        stub = StubResolver(hang=("core-router.testexample.com",))
+        resolver = DNSResolver(max_workers=2, timeout=0.1, resolve=stub)
+        result = resolver.resolve_all(["core-router.testexample.com", "distro-switch.testexample.com"])
+        stub.release.set()
+        self.assertEqual(result, {"core-router.testexample.com": False, "distro-switch.testexample.com": "10.0.0.2"})
+        self.assertEqual(resolver.stats["timeouts"], 1)
+        self.assertIsNone(resolver.cached("core-router.testexample.com"))
+
+    def test_timeout_not_retried(self):
+        """Test a name whose lookup timed out isn't looked up again during the run or saved for later runs."""
+        stub = StubResolver(hang=("core-router.testexample.com",))
+        resolver = DNSResolver(max_workers=1, timeout=0.1, path=self.path, resolve=stub)
+        self.addCleanup(stub.release.set)
+        result = resolver.resolve_all(["core-router.testexample.com", "distro-switch.testexample.com"])
+        self.assertEqual(result, {"core-router.testexample.com": False, "distro-switch.testexample.com": False})
+        self.assertFalse(resolver.lookup("core-router.testexample.com"))
+        self.assertEqual(stub.calls, ["core-router.testexample.com"])
+        self.assertEqual(resolver.timed_out, {"core-router.testexample.com"})
+        resolver.save()
+        with open(self.path, "r", encoding="utf-8") as file:
+            self.assertEqual(json.load(file), {})
+
+    def test_timeout_deadline(self):
+        """Test hanging lookups take about one timeout per worker and names that never started aren't timed out."""
+        names = [f"device{num}.testexample.com" for num in range(10)]
+        stub = StubResolver(hang=names)
+        self.addCleanup(stub.release.set)
+        resolver = DNSResolver(max_workers=2, timeout=0.05, resolve=stub)
+        start = time.monotonic()
+        result = resolver.resolve_all(names)
+        elapsed = time.monotonic() - start
+        self.assertEqual(result, dict.fromkeys(names, False))
+        self.assertLess(elapsed, 0.45)
+        self.assertEqual(resolver.timed_out, set(stub.calls))
+        self.assertEqual(len(resolver.timed_out), 2)
+        self.assertEqual(resolver.stats["timeouts"], 2)
+
+    def test_save_and_load(self):
+        """Test the cache is remembered across runs without its expired entries."""
+        resolver = DNSResolver(path=self.path, resolve=StubResolver())
+        resolver.resolve_all(["core-router.testexample.com", "missing.testexample.com"])
+        resolver.cache["expired.testexample.com"] = ("10.0.0.3", time.time() - 1)
+        resolver.save()
+        with open(self.path, "r", encoding="utf-8") as file:
+            self.assertEqual(sorted(json.load(file)), ["core-router.testexample.com", "missing.testexample.com"])
+        stub = StubResolver()
+        resolver = DNSResolver(path=self.path, resolve=stub)
+        self.assertEqual(resolver.lookup("core-router.testexample.com"), "10.0.0.1")
+        self.assertFalse(resolver.lookup("missing.testexample.com"))
+        self.assertEqual(stub.calls, [])
+
+    def test_load_unreadable(self):
+        """Test a corrupt cache file is ignored."""
+        with open(self.path, "w", encoding="utf-8") as file:
+            file.write("not json")
+        self.assertEqual(DNSResolver(path=self.path).cache, {})
@@ -0,0 +1,70 @@
+"""Tests of the interning of identifier strings and Tags."""
+
+import copy
+import json
+
+from nautobot.utilities.testing import TestCase
+from parameterized import parameterized
+from nautobot_ssot_device42.diffsync.models.base.dcim import Port
+from nautobot_ssot_device42.utils.interning import TagSet, intern_str
+
+
+def build_port(device: str, tags) -> Port:
+    """Build a Port from strings that aren't shared with any other Port."""
+    return Port(
+        name="".join(["Ethernet", "1/1"]),
+        device="".join(device),
+        type="1000base-t",
+        mode="access",
+        status="active",
+        tags=tags,
+        uuid=None,
+    )
+
+
+class TestInterning(TestCase):
+    """Test intern_str and TagSet."""
+
+    def test_intern_str(self):
+        """Test equal strings are the same object and other values pass through."""
+        self.assertIs(intern_str("".join(["core", "-router"])), intern_str("".join(["core-", "router"])))
+        self.assertIsNone(intern_str(None))
+        self.assertEqual(intern_str(42), 42)
+
+    @parameterized.expand(
+        [
+            ("list", ["b", "a", "b"], ("a", "b")),
+            ("string", "b,a", ("a", "b")),
+            ("tuple", ("a",), ("a",)),
+            ("empty_string", "", ()),
+            ("none", None, ()),
+        ],
+        skip_on_empty=True,
+    )
+    def test_tag_set(self, name, tags, expected):  # pylint: disable=unused-argument
+        """Test Tags are sorted, de-duplicated and shared."""
+        tag_set = TagSet.of(tags)
+        self.assertEqual(tag_set, expected)
+        self.assertEqual(tag_set, list(expected))
+        self.assertEqual(list(expected), tag_set)
+        self.assertIs(TagSet.of(list(expected)), tag_set)
+        self.assertIs(TagSet.of(tag_set), tag_set)
+
+    def test_tag_set_compare(self):
+        """Test TagSets only compare equal to the same Tags in order and can be copied and serialized."""
+        tag_set = TagSet.of(["a", "b"])
+        self.assertNotEqual(tag_set, ["b", "a"])
+        self.assertNotEqual(tag_set, TagSet.of(["a"]))
+        self.assertIn(tag_set, {("a", "b")})
+        self.assertIs(copy.deepcopy(tag_set), tag_set)
+        self.assertEqual(json.dumps(tag_set), '["a", "b"]')
+
+    def test_models(self):
+        """Test models share identifier strings and Tags however they were given."""
+        first = build_port(["core", "-router"], ["b", "a"])
+        second = build_port(["core-", "router"], "a,b")
+        self.assertIs(first.device, second.device)
+        self.assertIs(first.name, second.name)
+        self.assertIs(first.tags, second.tags)
+        self.assertEqual(first.get_attrs()["tags"], ["a", "b"])
+        self.assertIsNone(build_port(["core-router"], None).tags)
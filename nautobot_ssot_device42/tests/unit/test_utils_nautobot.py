@@ -11,6 +11,7 @@ from nautobot.ipam.models import VLAN
 from nautobot_ssot_device42.diffsync.models.nautobot.dcim import NautobotDevice
 from nautobot_ssot_device42.utils.nautobot import (
     verify_platform,
+    build_vc_member_index,
     determine_vc_position,
     update_custom_fields,
     apply_vlans_to_port,
@@ -152,6 +153,31 @@ class TestNautobotUtils(TransactionTestCase):  # pylint: disable=too-many-instan
         )
         self.assertEqual(fw_pos, 2)
 
+    def test_determine_vc_position_from_index(self):
+        """Test determine_vc_position looks up positions in the member index without sorting the members."""
+        vc_map = {
+            "node_vc_example": {"members": ["node_vc_example - node2", "node_vc_example - node0", "shared"]},
+            "other_vc_example": {"members": ["shared", "other - node0"]},
+        }
+        index = build_vc_member_index(vc_map)
+        self.assertEqual(
+            index,
+            {
+                "node_vc_example - node0": ("node_vc_example", 2),
+                "node_vc_example - node2": ("node_vc_example", 3),
+                "shared": ("node_vc_example", 4),
+                "other - node0": ("other_vc_example", 2),
+            },
+        )
+        for virtual_chassis, info in vc_map.items():
+            for member in info["members"]:
+                self.assertEqual(
+                    determine_vc_position(
+                        vc_map=vc_map, virtual_chassis=virtual_chassis, device_name=member, member_index=index
+                    ),
+                    determine_vc_position(vc_map=vc_map, virtual_chassis=virtual_chassis, device_name=member),
+                )
+
     def test_update_custom_fields_add_cf(self):
         """Test the update_custom_fields method adds a CustomField."""
         test_site = Site.objects.create(name="Test", slug="test")
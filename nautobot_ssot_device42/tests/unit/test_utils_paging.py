@@ -0,0 +1,148 @@
+"""Tests of adaptive page sizing for Device42 REST endpoints."""
+
+import json
+import os
+import tempfile
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlsplit
+
+import responses
+from nautobot.utilities.testing import TestCase
+from nautobot_ssot_device42.utils import device42, paging
+
+BASE_URL = "https://device42.testexample.com"
+
+
+class TestPageSizer(TestCase):
+    """Test PageSizer."""
+
+    def setUp(self):
+        """Setup an adaptive PageSizer."""
+        self.sizer = paging.PageSizer(adaptive=True, target_latency=2.0, min_size=100, max_size=4000)
+
+    def test_grow_and_shrink(self):
+        """Test the page size grows on fast pages, shrinks on slow or failed pages and stays within its bounds."""
+        url = f"{BASE_URL}/api/1.0/vendors/"
+        self.assertEqual(self.sizer.size(url), 1000)
+        self.assertEqual(self.sizer.record(url, 1000, 0.5), 2000)
+        self.assertEqual(self.sizer.record(url, 2000, 0.5), 4000)
+        self.assertEqual(self.sizer.record(url, 4000, 0.5), 4000)
+        self.assertEqual(self.sizer.record(url, 4000, 1.5), 4000)
+        self.assertEqual(self.sizer.record(url, 4000, 3.0), 2000)
+        self.assertEqual(self.sizer.record(url, 150, None), 100)
+        self.assertEqual(self.sizer.size("api/1.0/vendors"), 100)
+
+    def test_overrides(self):
+        """Test endpoints with an override always use the configured size."""
+        sizer = paging.PageSizer(adaptive=True, overrides={"/api/1.0/devices/all/": 250})
+        url = f"{BASE_URL}/api/1.0/devices/all"
+        self.assertEqual(sizer.size(url), 250)
+        self.assertEqual(sizer.record(url, 250, 0.1), 250)
+        self.assertEqual(sizer.size(url), 250)
+
+    def test_not_adaptive(self):
+        """Test page sizes aren't learned unless adaptive."""
+        sizer = paging.PageSizer()
+        self.assertEqual(sizer.record("api/1.0/vendors", 1000, 0.1), 1000)
+        self.assertEqual(sizer.size("api/1.0/vendors"), 1000)
+
+    def test_save_and_load(self):
+        """Test learned page sizes are remembered across runs."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "page_sizes.json")
+            sizer = paging.PageSizer(adaptive=True, path=path)
+            sizer.record("api/1.0/vendors", 1000, 0.1)
+            sizer.save()
+            with open(path, "r", encoding="utf-8") as file:
+                self.assertEqual(json.load(file), {"api/1.0/vendors": 2000})
+            self.assertEqual(paging.PageSizer(adaptive=True, path=path).size("api/1.0/vendors"), 2000)
+            self.assertEqual(paging.PageSizer(adaptive=True, path=path, max_size=1500).size("api/1.0/vendors"), 1500)
+
+    def test_load_unreadable(self):
+        """Test a corrupt file of learned page sizes is ignored."""
+        with tempfile.NamedTemporaryFile("w", suffix=".json") as file:
+            file.write("not json")
+            file.flush()
+            self.assertEqual(paging.PageSizer(adaptive=True, path=file.name).sizes, {})
+
+
+class TestDevice42ApiPageSizing(TestCase):
+    """Test Device42API with a PageSizer."""
+
+    def setUp(self):
+        """Setup a paginated endpoint that serves the page requested."""
+        self.records = [{"name": f"vendor{index}"} for index in range(10)]
+        self.requested = []
+
+    def callback(self, request):
+        """Serve the page of vendors at the requested offset and page size."""
+        query = parse_qs(urlsplit(request.url).query)
+        offset, limit = int(query.get("offset", ["0"])[0]), int(query["_max_results"][0])
+        self.requested.append((offset, limit))
+        body = {
+            "total_count": len(self.records),
+            "offset": offset,
+            "limit": limit,
+            "vendors": self.records[offset : offset + limit],
+        }
+        return (200, {}, json.dumps(body))
+
+    @responses.activate
+    def test_pages_grow(self):
+        """Test each page is requested with the size learned from the pages before it."""
+        responses.add_callback(responses.GET, f"{BASE_URL}/api/1.0/vendors", callback=self.callback)
+        sizer = paging.PageSizer(default=2, adaptive=True, min_size=1, max_size=8)
+        dev42 = device42.Device42API(BASE_URL, "testuser", "testpassword", False, page_sizer=sizer)
+        result = dev42.api_call(path="api/1.0/vendors")
+        self.assertEqual(result["vendors"], self.records)
+        self.assertEqual(self.requested, [(0, 2), (2, 4), (6, 8)])
+        self.assertEqual(sizer.size("api/1.0/vendors"), 8)
+
+    @responses.activate
+    @patch("nautobot_ssot_device42.utils.device42.time.sleep")
+    def test_failed_page_shrinks(self, mock_sleep):
+        """Test a failed page is retried with a smaller page size."""
+
+        def failing_callback(request):
+            if int(parse_qs(urlsplit(request.url).query)["_max_results"][0]) > 2:
+                return (504, {}, "Gateway Timeout")
+            return self.callback(request)
+
+        responses.add_callback(responses.GET, f"{BASE_URL}/api/1.0/vendors", callback=failing_callback)
+        sizer = paging.PageSizer(default=2, adaptive=True, min_size=1, max_size=4)
+        dev42 = device42.Device42API(BASE_URL, "testuser", "testpassword", False, max_retries=0, page_sizer=sizer)
+        result = dev42.api_call(path="api/1.0/vendors")
+        self.assertEqual(result["vendors"], self.records)
+        self.assertEqual(self.requested, [(0, 2), (2, 2), (4, 2), (6, 2), (8, 2)])
+        self.assertEqual(dev42.stats["page size reductions"], 4)
+        mock_sleep.assert_not_called()
+
+    @responses.activate
+    @patch("nautobot_ssot_device42.utils.device42.time.sleep")
+    def test_failed_page_shrinks_concurrently(self, mock_sleep):  # pylint: disable=unused-argument
+        """Test a failed page fetched in parallel is retried with a smaller size and later pages use that size."""
+
+        def failing_callback(request):
+            query = parse_qs(urlsplit(request.url).query)
+            if query.get("offset") and int(query["_max_results"][0]) > 2:
+                return (504, {}, "Gateway Timeout")
+            return self.callback(request)
+
+        responses.add_callback(responses.GET, f"{BASE_URL}/api/1.0/vendors", callback=failing_callback)
+        sizer = paging.PageSizer(default=4, adaptive=True, min_size=1, max_size=4)
+        dev42 = device42.Device42API(
+            BASE_URL, "testuser", "testpassword", False, max_retries=0, page_sizer=sizer, max_workers=2
+        )
+        result = dev42.api_call(path="api/1.0/vendors")
+        self.assertEqual(result["vendors"], self.records)
+        self.assertEqual(sorted(self.requested), [(0, 4), (4, 2), (6, 2), (8, 2)])
+        self.assertEqual(dev42.stats["page size reductions"], 1)
+
+    @responses.activate
+    def test_override(self):
+        """Test an endpoint override sets the page size requested."""
+        responses.add_callback(responses.GET, f"{BASE_URL}/api/1.0/vendors", callback=self.callback)
+        sizer = paging.PageSizer(overrides={"api/1.0/vendors": 5})
+        dev42 = device42.Device42API(BASE_URL, "testuser", "testpassword", False, page_sizer=sizer)
+        self.assertEqual(dev42.api_call(path="api/1.0/vendors")["vendors"], self.records)
+        self.assertEqual(self.requested, [(0, 5), (5, 5)])
@@ -0,0 +1,60 @@
+"""Tests of rack unit occupancy."""
+
+from nautobot.utilities.testing import TestCase
+from parameterized import parameterized
+from nautobot_ssot_device42.utils import racks
+
+
+class TestRackOccupancy(TestCase):
+    """Test RackOccupancy."""
+
+    def setUp(self):
+        """Setup a 42U rack with a 2U full depth Device in U10-11 and a half depth Device on the rear of U20."""
+        self.occupancy = racks.RackOccupancy()
+        self.occupancy.add_rack("rack1", 42)
+        self.assertTrue(self.occupancy.reserve("rack1", position=10, size=2))
+        self.assertTrue(self.occupancy.reserve("rack1", position=20, size=1, faces=racks.REAR))
+
+    @parameterized.expand(
+        [
+            ("overlap_top", 11, 1, racks.BOTH, False),
+            ("overlap_bottom", 9, 2, racks.BOTH, False),
+            ("half_depth_overlap", 10, 1, racks.FRONT, False),
+            ("adjacent", 12, 1, racks.BOTH, True),
+            ("other_face", 20, 1, racks.FRONT, True),
+            ("same_face", 20, 1, racks.REAR, False),
+            ("full_depth_over_half_depth", 20, 1, racks.BOTH, False),
+            ("zero_u", 12, 0, racks.BOTH, True),
+            ("beyond_height", 42, 4, racks.BOTH, True),
+        ],
+        skip_on_empty=True,
+    )
+    def test_reserve(self, name, position, size, faces, expected):  # pylint: disable=unused-argument,too-many-arguments
+        """Test units are only taken when none of them are taken on the same face."""
+        self.assertEqual(self.occupancy.reserve("rack1", position=position, size=size, faces=faces), expected)
+        self.assertFalse(self.occupancy.is_free("rack1", position=position, size=size, faces=faces))
+
+    def test_unknown_rack(self):
+        """Test racks that weren't sized up front are added when a Device is placed in them."""
+        self.assertTrue(self.occupancy.is_free("rack2", position=5, size=1))
+        self.assertTrue(self.occupancy.reserve("rack2", position=5, size=1))
+        self.assertFalse(self.occupancy.reserve("rack2", position=5, size=1))
+        self.assertTrue(self.occupancy.reserve("rack1", position=5, size=1))
+        self.assertEqual(self.occupancy.rack_id("rack2"), 1)
+
+    def test_release(self):
+        """Test released units can be taken again without freeing the other face."""
+        self.occupancy.reserve("rack1", position=20, size=1, faces=racks.FRONT)
+        self.occupancy.release("rack1", position=10, size=2)
+        self.occupancy.release("rack1", position=20, size=1, faces=racks.REAR)
+        self.assertTrue(self.occupancy.reserve("rack1", position=10, size=2))
+        self.assertTrue(self.occupancy.is_free("rack1", position=20, size=1, faces=racks.REAR))
+        self.assertFalse(self.occupancy.is_free("rack1", position=20, size=1, faces=racks.FRONT))
+        self.occupancy.release("rack2", position=1, size=1)
+
+    def test_face_mask(self):
+        """Test half depth Devices only take the face they're mounted on."""
+        self.assertEqual(racks.face_mask("front"), racks.BOTH)
+        self.assertEqual(racks.face_mask("front", full_depth=False), racks.FRONT)
+        self.assertEqual(racks.face_mask("rear", full_depth=False), racks.REAR)
+        self.assertEqual(racks.face_mask("", full_depth=False), racks.FRONT)
@@ -0,0 +1,109 @@
+"""Tests of the compiled plugin settings rules."""
+
+import re
+
+from nautobot.utilities.testing import TestCase
+from parameterized import parameterized
+from nautobot_ssot_device42.utils import rules
+
+HOSTNAME_MAPPING = [
+    {"^aus.+|AUS.+": "austin"},
+    {"^(?P<city>dfw|DFW)-": "dallas", "^dfw": "dallas-fallback"},
+    {"^(ny)(c)": "new-york-city"},
+    {".*-lab$": "lab"},
+]
+
+
+def sequential_site(device_name: str, mapping: list) -> str:
+    """Match each hostname pattern in turn, as was done prior to compiling them."""
+    for entry in mapping:
+        for pattern, slug in entry.items():
+            if re.match(pattern, device_name):
+                return slug
+    return ""
+
+
+class TestPluginRules(TestCase):
+    """Test PluginRules."""
+
+    @parameterized.expand(
+        [
+            ("austin", "aus-core-01"),
+            ("dallas", "dfw-core-01"),
+            ("dallas_fallback", "dfwcore01"),
+            ("nyc", "nyc-core-01"),
+            ("lab", "sea-core-lab"),
+            ("first_pattern_wins", "AUS-lab"),
+            ("missing", "sea-core-01"),
+        ],
+        skip_on_empty=True,
+    )
+    def test_site_for_device(self, name, device_name):  # pylint: disable=unused-argument
+        """Test the combined hostname patterns match the same Site as matching each pattern in order."""
+        plugin_rules = rules.PluginRules(hostname_mapping=HOSTNAME_MAPPING)
+        self.assertEqual(plugin_rules.site_for_device(device_name), sequential_site(device_name, HOSTNAME_MAPPING))
+        self.assertIsNotNone(plugin_rules._combined)  # pylint: disable=protected-access
+
+    def test_site_for_device_uncombinable(self):
+        """Test patterns with backreferences or inline flags are matched one at a time."""
+        mapping = [{r"^(\w)\1-": "double"}, {"(?i)^aus": "austin"}]
+        plugin_rules = rules.PluginRules(hostname_mapping=mapping)
+        self.assertEqual(plugin_rules.site_for_device("aa-core"), "double")
+        self.assertEqual(plugin_rules.site_for_device("AUS-core"), "austin")
+        self.assertIsNone(plugin_rules._combined)  # pylint: disable=protected-access
+        plugin_rules = rules.PluginRules(hostname_mapping=[{"^nyc": "new-york-city"}, {"(?i)^aus": "austin"}])
+        self.assertEqual(plugin_rules.site_for_device("AUS-core"), "austin")
+        self.assertIsNone(plugin_rules._combined)  # pylint: disable=protected-access
+
+    def test_site_for_device_memoized(self):
+        """Test each hostname is only matched against the patterns once."""
+        plugin_rules = rules.PluginRules(hostname_mapping=HOSTNAME_MAPPING)
+        self.assertEqual(plugin_rules.site_for_device("aus-core-01"), "austin")
+        plugin_rules._combined = None  # pylint: disable=protected-access
+        plugin_rules._compiled = []  # pylint: disable=protected-access
+        self.assertEqual(plugin_rules.site_for_device("aus-core-01"), "austin")
+        self.assertEqual(plugin_rules.site_for_device("dfw-core-01"), "")
+
+    @parameterized.expand(
+        [
+            ("literal", "sitecode-", ["core", "sitecode-DFW", "sitecode-AUS"], "DFW"),
+            ("literal_repeated", "site-", ["a-site-site-b"], "a-b"),
+            ("regex", "^site(code)?-", ["core", "sitecode-DFW"], "DFW"),
+            ("missing", "sitecode-", ["core"], None),
+        ],
+        skip_on_empty=True,
+    )
+    def test_prepend(self, name, prepend, tags, expected):  # pylint: disable=unused-argument
+        """Test literal and regex prepends strip the first matching Tag like re.search and re.sub."""
+        plugin_rules = rules.PluginRules(facility_prepend=prepend, role_prepend=prepend)
+        self.assertEqual(plugin_rules.facility(tags), expected)
+        self.assertEqual(plugin_rules.device_role(tags), expected)
+        self.assertEqual(rules.is_literal(prepend), name != "regex")
+
+    def test_is_ignored(self):
+        """Test the ignore tag is only found when set and present."""
+        self.assertTrue(rules.PluginRules(ignore_tag="skip").is_ignored(["a", "skip"]))
+        self.assertFalse(rules.PluginRules(ignore_tag="skip").is_ignored(["a"]))
+        self.assertFalse(rules.PluginRules(ignore_tag="skip").is_ignored(None))
+        self.assertFalse(rules.PluginRules().is_ignored(["skip"]))
+
+    def test_mgmt_interface_rank(self):
+        """Test Port names are ranked by the first literal name or regex pattern matching the whole name."""
+        plugin_rules = rules.PluginRules(mgmt_interface_names=["mgmt0", "(?i)management0?", "Management"])
+        self.assertEqual(plugin_rules.mgmt_interface_rank("mgmt0"), 0)
+        self.assertEqual(plugin_rules.mgmt_interface_rank("Management"), 1)
+        self.assertEqual(plugin_rules.mgmt_interface_rank("MANAGEMENT0"), 1)
+        self.assertIsNone(plugin_rules.mgmt_interface_rank("management1"))
+        self.assertIsNone(plugin_rules.mgmt_interface_rank("mgmt01"))
+        self.assertEqual(rules.PluginRules().mgmt_interface_rank("management0"), 2)
+        self.assertIsNone(rules.PluginRules(mgmt_interface_names=[]).mgmt_interface_rank("mgmt0"))
+
+    def test_get_rules(self):
+        """Test the rules are compiled once and compiled again when the settings change."""
+        settings = {"hostname_mapping": HOSTNAME_MAPPING, "facility_prepend": "sitecode-"}
+        compiled = rules.get_rules(settings)
+        self.assertIs(rules.get_rules(dict(settings)), compiled)
+        settings["facility_prepend"] = "facility-"
+        self.assertIsNot(rules.get_rules(settings), compiled)
+        self.assertEqual(rules.get_rules(settings).facility(["facility-DFW"]), "DFW")
+        self.assertEqual(rules.get_rules({"hostname_mapping": list(HOSTNAME_MAPPING)}).facility(["x"]), None)
@@ -0,0 +1,102 @@
+"""Tests of Device42 dataset snapshots."""
+
+import tempfile
+import time
+from unittest.mock import patch
+
+import responses
+from nautobot.utilities.testing import TestCase
+from nautobot_ssot_device42.utils import device42, snapshot
+
+
+class TestSnapshotStore(TestCase):
+    """Test SnapshotStore and the snapshot views."""
+
+    def setUp(self):
+        """Setup a SnapshotStore in a temporary directory."""
+        self.tmpdir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(self.tmpdir.cleanup)
+        self.store = snapshot.SnapshotStore(directory=self.tmpdir.name, ttls={"get_buildings": 60, "get_vlan_info": 60})
+
+    def test_list_roundtrip(self):
+        """Test a list dataset is served back as a lazy sequence of the same records."""
+        buildings = [{"name": "Microsoft HQ", "tags": ["a", "b"]}, {"name": "Dallas", "tags": []}]
+        self.store.save("get_buildings", buildings)
+        result = self.store.load("get_buildings")
+        self.assertIsInstance(result, snapshot.SnapshotList)
+        self.assertEqual(len(result), 2)
+        self.assertEqual(result[1], {"name": "Dallas", "tags": []})
+        self.assertEqual(result[-1], {"name": "Dallas", "tags": []})
+        self.assertEqual(result, buildings)
+        self.assertEqual(result + [{"name": "Austin"}], buildings + [{"name": "Austin"}])
+        with self.assertRaises(IndexError):
+            result[2]  # pylint: disable=pointless-statement
+
+    def test_dict_roundtrip_preserves_keys(self):
+        """Test a dict dataset keeps integer keys and is served back as a lazy mapping."""
+        vlans = {1: {"name": "default", "vid": 1}, 42: {"name": "servers", "vid": 42}}
+        self.store.save("get_vlan_info", vlans)
+        result = self.store.load("get_vlan_info")
+        self.assertIsInstance(result, snapshot.SnapshotDict)
+        self.assertIn(42, result)
+        self.assertNotIn("42", result)
+        self.assertEqual(result[42], {"name": "servers", "vid": 42})
+        self.assertEqual(dict(result), vlans)
+
+    def test_expired_snapshot(self):
+        """Test a snapshot older than its TTL isn't served."""
+        self.store.save("get_buildings", [{"name": "Microsoft HQ"}])
+        self.assertIsNotNone(self.store.load("get_buildings"))
+        with patch("nautobot_ssot_device42.utils.snapshot.time.time", return_value=time.time() + 120):
+            self.assertIsNone(self.store.load("get_buildings"))
+
+    def test_refresh_and_disabled(self):
+        """Test snapshots aren't served when refreshing or for datasets without a TTL."""
+        self.store.save("get_buildings", [{"name": "Microsoft HQ"}])
+        self.store.save("get_rooms", [{"name": "Network Closet"}])
+        self.assertIsNone(self.store.load("get_rooms"))
+        self.store.refresh = True
+        self.assertIsNone(self.store.load("get_buildings"))
+
+    def test_corrupt_snapshot(self):
+        """Test a file that isn't a snapshot is ignored."""
+        with open(self.store.path("get_buildings"), "wb") as file:
+            file.write(b"not a snapshot")
+        self.assertIsNone(self.store.load("get_buildings"))
+
+    @responses.activate
+    def test_device42api_snapshot(self):
+        """Test Device42API serves a snapshotted dataset from disk on the second call."""
+        responses.add(
+            responses.GET,
+            "https://device42.testexample.com/api/1.0/buildings",
+            json={"buildings": [{"name": "Microsoft HQ"}]},
+            status=200,
+        )
+        dev42 = device42.Device42API(
+            "https://device42.testexample.com", "testuser", "testpassword", False, snapshots=self.store
+        )
+        self.assertEqual(dev42.get_buildings(), [{"name": "Microsoft HQ"}])
+        self.assertEqual(dev42.get_buildings(), [{"name": "Microsoft HQ"}])
+        self.assertEqual(len(responses.calls), 1)
+        self.assertEqual(dev42.stats["snapshot writes"], 1)
+        self.assertEqual(dev42.stats["snapshot hits"], 1)
+
+    @responses.activate
+    def test_device42api_snapshot_columns(self):
+        """Test a dataset retrieved with a subset of its columns is snapshotted separately for each set of columns."""
+        responses.add(
+            responses.GET,
+            "https://device42.testexample.com/api/1.0/buildings",
+            json={"buildings": [{"name": "Microsoft HQ"}]},
+            status=200,
+        )
+        dev42 = device42.Device42API(
+            "https://device42.testexample.com", "testuser", "testpassword", False, snapshots=self.store
+        )
+        dev42.get_buildings(columns=("name",))
+        dev42.get_buildings(columns=("name",))
+        dev42.get_buildings()
+        self.assertEqual(len(responses.calls), 2)
+        self.assertEqual(dev42.stats["snapshot writes"], 2)
+        self.assertEqual(dev42.stats["snapshot hits"], 1)
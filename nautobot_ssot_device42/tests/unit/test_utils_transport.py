@@ -0,0 +1,75 @@
+"""Tests of Device42 record and replay transports."""
+
+import os
+import tempfile
+from unittest.mock import patch
+
+import responses
+from nautobot.utilities.testing import TestCase
+from nautobot_ssot_device42.utils import device42, transport
+
+BASE_URL = "https://device42.testexample.com"
+
+
+class TestRecordReplay(TestCase):
+    """Test RecordingAdapter and ReplayAdapter."""
+
+    def setUp(self):
+        """Setup a temporary archive path."""
+        self.tmpdir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(self.tmpdir.cleanup)
+        self.path = os.path.join(self.tmpdir.name, "device42.zip")
+
+    def client(self, adapter):
+        """Return a Device42API client sending requests through `adapter`."""
+        return device42.Device42API(BASE_URL, "testuser", "testpassword", False, transport=adapter)
+
+    @responses.activate
+    def record(self):
+        """Record a paginated REST call and a streamed DOQL query."""
+        url = f"{BASE_URL}/api/1.0/buildings"
+        responses.add(
+            responses.GET, url, json={"total_count": 3, "limit": 2, "offset": 0, "buildings": ["a", "b"]}, status=200
+        )
+        responses.add(
+            responses.GET, url, json={"total_count": 3, "limit": 2, "offset": 2, "buildings": ["c"]}, status=200
+        )
+        responses.add(
+            responses.GET, f"{BASE_URL}/services/data/v1.0/query/", json=[{"netport_pk": 1}, {"netport_pk": 2}]
+        )
+        with self.client(transport.RecordingAdapter(path=self.path)) as client:
+            buildings = client.api_call(path="api/1.0/buildings")["buildings"]
+            ports = list(client.doql_query_iter(query="SELECT netport_pk FROM view_netport_v1"))
+        return buildings, ports
+
+    def test_record_then_replay(self):
+        """Test responses recorded from Device42 are replayed identically without network access."""
+        recorded = self.record()
+        self.assertEqual(recorded, (["a", "b", "c"], [{"netport_pk": 1}, {"netport_pk": 2}]))
+        with self.client(transport.ReplayAdapter(path=self.path)) as client:
+            buildings = client.api_call(path="api/1.0/buildings")["buildings"]
+            ports = list(client.doql_query_iter(query="SELECT netport_pk FROM view_netport_v1"))
+        self.assertEqual((buildings, ports), recorded)
+
+    def test_replay_missing_request(self):
+        """Test replaying a request that wasn't recorded raises ReplayMissError."""
+        self.record()
+        with self.client(transport.ReplayAdapter(path=self.path)) as client:
+            with self.assertRaises(transport.ReplayMissError):
+                client.api_call(path="api/1.0/rooms")
+
+    @patch("nautobot_ssot_device42.utils.transport.time.sleep")
+    def test_replay_latency(self, mock_sleep):
+        """Test a fixed latency is injected before each replayed response."""
+        self.record()
+        with self.client(transport.ReplayAdapter(path=self.path, latency=0.25)) as client:
+            client.api_call(path="api/1.0/buildings")
+        self.assertEqual(mock_sleep.call_count, 2)
+        mock_sleep.assert_called_with(0.25)
+
+    def test_request_key(self):
+        """Test request keys ignore the host, trailing slashes and query parameter order."""
+        self.assertEqual(
+            transport.request_key("get", "https://a.example.com/api/1.0/devices/?b=2&a=1"),
+            transport.request_key("GET", "https://b.example.com/api/1.0/devices?a=1&b=2"),
+        )
@@ -0,0 +1,127 @@
+"""Immutable, shared CustomField maps pivoted from the one row per field that Device42 DOQL returns."""
+
+import sys
+from typing import Callable, Hashable, Iterable, Optional
+
+# Value and notes of a CustomField without a value.
+EMPTY = (None, None)
+
+
+class FrozenDict(dict):
+    """Dictionary that can't be changed once it's created so a single instance can be shared by many objects.
+
+    It remains a `dict` so it's passed through pydantic validation as is and serialized like any other dict.
+    """
+
+    __slots__ = ()
+
+    def _immutable(self, *args, **kwargs):
+        """Refuse to change the dictionary."""
+        raise TypeError(f"{type(self).__name__} can't be changed.")
+
+    __setitem__ = __delitem__ = __ior__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
+
+    def __copy__(self):
+        """Return the dictionary itself as it can't be changed."""
+        return self
+
+    def __deepcopy__(self, memo: dict):
+        """Return the dictionary itself as it can't be changed."""
+        return self
+
+    def __reduce__(self):
+        """Pickle the dictionary by its items as `dict` does it one item at a time."""
+        return (type(self), (dict(self),))
+
+
+class CustomFieldInterner:
+    """Builds the CustomField map of each object, sharing one instance between objects with the same fields.
+
+    The keys of each map are interned as a sorted tuple shared by every map with the same fields, and each map is
+    identified by that tuple and a tuple of its (value, notes) pairs. Maps and the field dicts in them are only created
+    the first time each combination is seen.
+    """
+
+    def __init__(self):
+        """Initialize CustomFieldInterner."""
+        self._keys = {}
+        self._fields = {}
+        self._maps = {}
+
+    def __len__(self) -> int:
+        """Return the number of distinct maps created."""
+        return len(self._maps)
+
+    def field(self, key: str, value=None, notes: Optional[str] = None) -> FrozenDict:
+        """Return the shared field dict of a CustomField, ie `{"key": "Owner", "value": "AT&T", "notes": None}`."""
+        try:
+            return self._fields[(key, value, notes)]
+        except KeyError:
+            field = self._fields[(key, value, notes)] = FrozenDict(key=key, value=value, notes=notes)
+            return field
+        except TypeError:
+            # unhashable values, ie lists, aren't shared
+            return FrozenDict(key=key, value=value, notes=notes)
+
+    def freeze(self, values: dict, fill_keys: Iterable[str] = ()) -> FrozenDict:
+        """Return the shared map of CustomField key to field dict for an object.
+
+        Args:
+            values (dict): Mapping of CustomField key to (value, notes) of the fields the object has values for.
+            fill_keys (Iterable[str], optional): Keys of the fields every object has, which are added without a value
+                when the object has none. Defaults to ().
+
+        Returns:
+            FrozenDict: Map of CustomField key to its field dict.
+        """
+        keys = tuple(sorted(set(fill_keys).union(values)))
+        keys = self._keys.setdefault(keys, tuple(sys.intern(key) for key in keys))
+        row = tuple(values.get(key, EMPTY) for key in keys)
+        try:
+            return self._maps[(keys, row)]
+        except KeyError:
+            frozen = self._maps[(keys, row)] = self._build(keys, row)
+            return frozen
+        except TypeError:
+            return self._build(keys, row)
+
+    def _build(self, keys: tuple, row: tuple) -> FrozenDict:
+        """Create the map of `keys` to the field dicts of their (value, notes) in `row`."""
+        return FrozenDict((key, self.field(key, value, notes)) for key, (value, notes) in zip(keys, row))
+
+
+def pivot_custom_fields(
+    rows: Iterable[dict],
+    object_key: Callable[[dict], Hashable],
+    fill_keys: Iterable[str] = (),
+    fill_seen: bool = False,
+    interner: Optional[CustomFieldInterner] = None,
+) -> dict:
+    """Pivot CustomField rows, one per field of an object, into a CustomField map per object in a single pass.
+
+    Args:
+        rows (Iterable[dict]): Rows with the `key`, `value` and `notes` of a field along with the object it belongs to.
+        object_key (Callable[[dict], Hashable]): Function returning the key of the object a row belongs to.
+        fill_keys (Iterable[str], optional): Keys of the fields every object has, which are added without a value when
+            the object has none. Defaults to ().
+        fill_seen (bool, optional): Whether every object has each field that any object has a value for. Defaults to
+            False.
+        interner (CustomFieldInterner, optional): Interner sharing maps across datasets. Defaults to None for a new one.
+
+    Returns:
+        dict: Mapping of object key to its FrozenDict of CustomField key to field dict.
+    """
+    if interner is None:
+        interner = CustomFieldInterner()
+    fill_keys = set(fill_keys)
+    values = {}
+    for row in rows:
+        obj = object_key(row)
+        fields = values.get(obj)
+        if fields is None:
+            fields = values[obj] = {}
+        fields[row["key"]] = (row["value"], row.get("notes"))
+        if fill_seen:
+            fill_keys.add(row["key"])
+    return {obj: interner.freeze(fields, fill_keys) for obj, fields in values.items()}
@@ -1,16 +1,50 @@
 """Utility functions for Device42 API."""
 
+import asyncio
+import codecs
+import csv
+import functools
+import json
+import logging
+import random
 import re
-from typing import List
+import threading
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Iterable, Iterator, List, Optional
 
 import requests
 import urllib3
 from diffsync.exceptions import ObjectNotFound
 from nautobot.core.settings_funcs import is_truthy
 from netutils.lib_mapper import PYATS_LIB_MAPPER
+from requests.adapters import HTTPAdapter
 
 from nautobot_ssot_device42.constant import DEFAULTS, FC_INTF_MAP, INTF_NAME_MAP, PHY_INTF_MAP, PLUGIN_CFG
 from nautobot_ssot_device42.diffsync.models.base.ipam import VLAN
+from nautobot_ssot_device42.utils.custom_fields import CustomFieldInterner, pivot_custom_fields
+from nautobot_ssot_device42.utils.paging import PageSizer
+from nautobot_ssot_device42.utils.rules import get_rules
+from nautobot_ssot_device42.utils.snapshot import SnapshotStore, snapshot
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+try:
+    import ijson
+
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
 
 
 class MissingConfigSetting(Exception):
@@ -27,6 +61,144 @@ class MissingConfigSetting(Exception):
         super().__init__(self.message)
 
 
+class CircuitBreakerOpen(Exception):
+    """Exception raised when requests to Device42 are refused as the appliance is failing.
+
+    Attributes:
+        message (str): Returned explanation of Error.
+    """
+
+    def __init__(self, retry_in: float):
+        """Initialize Exception with the number of seconds until requests will be attempted again."""
+        self.retry_in = retry_in
+        self.message = f"Device42 appears to be unavailable, refusing requests for another {retry_in:.0f} seconds."
+        super().__init__(self.message)
+
+
+class CircuitBreaker:
+    """Thread-safe circuit breaker that fails fast after a number of consecutive failed requests.
+
+    Once `failure_threshold` consecutive requests have failed, the circuit opens and all requests are refused for
+    `reset_timeout` seconds. After that the circuit is half-open: a single trial request is let through while all others
+    are still refused. Success closes the circuit again while another failure re-opens it. A trial that hasn't
+    completed within `reset_timeout` is abandoned and another request is let through in its place.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 60.0):
+        """Initialize CircuitBreaker.
+
+        Args:
+            failure_threshold (int, optional): Consecutive failures before the circuit opens. Defaults to 5.
+            reset_timeout (float, optional): Seconds the circuit stays open before a trial request. Defaults to 60.0.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.trial_at = None
+        self._lock = threading.Lock()
+
+    def before_request(self):
+        """Raise CircuitBreakerOpen if requests are currently being refused, letting a single trial through."""
+        with self._lock:
+            if self.opened_at is None:
+                return
+            now = time.monotonic()
+            elapsed = now - self.opened_at
+            if elapsed < self.reset_timeout:
+                raise CircuitBreakerOpen(retry_in=self.reset_timeout - elapsed)
+            if self.trial_at is not None and now - self.trial_at < self.reset_timeout:
+                raise CircuitBreakerOpen(retry_in=self.reset_timeout - (now - self.trial_at))
+            self.trial_at = now
+
+    def record_success(self):
+        """Close the circuit after a successful request."""
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_at = None
+
+    def record_rate_limited(self):
+        """Close a half-open circuit after a rate limited trial, as Device42 is answering, without counting a failure."""
+        with self._lock:
+            if self.trial_at is not None:
+                self.failures = 0
+                self.opened_at = None
+                self.trial_at = None
+
+    def record_failure(self):
+        """Count a failed request, opening the circuit once the threshold has been reached or a trial has failed."""
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold or self.trial_at is not None:
+                self.opened_at = time.monotonic()
+                self.trial_at = None
+
+
+class RequestMemo:
+    """Thread-safe memoization of response bodies with single-flight semantics.
+
+    The first caller for a key performs the request while concurrent callers for the same key wait for and share its
+    body. Only the bodies of successful requests are kept, and once they exceed `max_bytes` in total the least recently
+    used are forgotten.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 2**20):
+        """Initialize RequestMemo.
+
+        Args:
+            max_bytes (int, optional): Maximum total size of the memoized bodies. Defaults to 32 MiB.
+        """
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.responses = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, request):
+        """Return the memoized body for `key`, calling `request` to retrieve it if needed.
+
+        Args:
+            key (Hashable): Key identifying the request.
+            request (Callable[[], bytes]): Function performing the request and returning its body, raising if it failed.
+
+        Returns:
+            tuple: The body and whether it was served without performing the request.
+        """
+        with self._lock:
+            if key in self.responses:
+                self.responses.move_to_end(key)
+                return self.responses[key], True
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+        if not owner:
+            return future.result(), True
+        try:
+            content = request()
+        except BaseException as err:
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_exception(err)
+            raise
+        with self._lock:
+            self._inflight.pop(key, None)
+            if len(content) <= self.max_bytes:
+                self.responses[key] = content
+                self.size += len(content)
+                while self.size > self.max_bytes:
+                    self.size -= len(self.responses.popitem(last=False)[1])
+        future.set_result(content)
+        return content, False
+
+    def clear(self):
+        """Forget all memoized bodies."""
+        with self._lock:
+            self.responses.clear()
+            self.size = 0
+
+
 def merge_offset_dicts(orig_dict: dict, offset_dict: dict) -> dict:
     """Method to merge two dicts and merge a list if found.
 
@@ -37,16 +209,244 @@ def merge_offset_dicts(orig_dict: dict, offset_dict: dict) -> dict:
     Returns:
         dict: Dict with merged data from both dicts.
     """
+    orig_dict = {key: list(value) if isinstance(value, list) else value for key, value in orig_dict.items()}
+    return merge_paginated_responses([orig_dict, offset_dict])
+
+
+def merge_paginated_responses(pages: List[dict]) -> dict:
+    """Method to merge a list of paginated responses into a single response in one pass.
+
+    List payloads are chained together in page order while all other keys take the value from the last page. The list
+    from the first page is extended in place so each record is copied at most once, regardless of the number of pages.
+
+    Args:
+        pages (List[dict]): Paginated responses in offset order.
+
+    Returns:
+        dict: Dict with merged data from all pages.
+    """
     out = {}
-    for key, value in offset_dict.items():
-        if key in orig_dict and key in offset_dict:
-            if isinstance(value, list):
-                out[key] = orig_dict[key] + value
-            else:
-                out[key] = value
+    first, last = pages[0], pages[-1]
+    for key, value in last.items():
+        if key not in first:
+            continue
+        if isinstance(value, list):
+            merged = first[key]
+            for page in pages[1:]:
+                merged.extend(page.get(key, []))
+            out[key] = merged
+        else:
+            out[key] = value
     return out
 
 
+def iter_json_array(chunks: Iterable[str]) -> Iterator:
+    """Method to incrementally parse a JSON array from chunks of text, yielding each element as soon as it's complete.
+
+    Only the text of the element currently being parsed is held in memory. If the document isn't an array, the whole
+    document is parsed and yielded as a single element.
+
+    Args:
+        chunks (Iterable[str]): Chunks of text making up the JSON document.
+
+    Yields:
+        Iterator: Each element of the JSON array.
+    """
+    decoder = json.JSONDecoder()
+    separator = re.compile(r"[\s,]*")
+    whitespace = re.compile(r"\s*")
+    buffer, pos, started = "", 0, False
+    for chunk in chunks:
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        while True:
+            pos = separator.match(buffer, pos).end()
+            if pos >= len(buffer):
+                break
+            if not started:
+                if buffer[pos] != "[":
+                    yield json_loads(buffer[pos:] + "".join(chunks))
+                    return
+                started = True
+                pos += 1
+                continue
+            if buffer[pos] == "]":
+                return
+            try:
+                element, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                break
+            delimiter = whitespace.match(buffer, end).end()
+            if delimiter >= len(buffer) or buffer[delimiter] not in ",]":
+                # Without a following delimiter a scalar, such as a number, may continue in the next chunk.
+                break
+            yield element
+            pos = end
+    if buffer[pos:].strip():
+        raise json.JSONDecodeError("Unterminated JSON array", buffer, pos)
+
+
+DOQL_ARRAY_ELEMENT = re.compile(r'\s*(?:"(?P<quoted>(?:[^"\\]|\\.)*)"|(?P<bare>[^,]*?))\s*(?:,|$)')
+
+
+def parse_doql_array(value: str) -> list:
+    """Method to parse a PostgreSQL array literal, ie `{1,"a b",NULL}`, from DOQL CSV output into a list of strings.
+
+    Args:
+        value (str): Array literal to be parsed.
+
+    Returns:
+        list: Elements of the array with NULL elements as None.
+    """
+    inner = value.strip()
+    if inner.startswith("{") and inner.endswith("}"):
+        inner = inner[1:-1]
+    elements, pos = [], 0
+    while pos < len(inner):
+        match = DOQL_ARRAY_ELEMENT.match(inner, pos)
+        if match.group("quoted") is not None:
+            elements.append(re.sub(r"\\(.)", r"\1", match.group("quoted")))
+        else:
+            elements.append(None if match.group("bare") == "NULL" else match.group("bare"))
+        pos = match.end()
+    return elements
+
+
+DOQL_CSV_TYPES = {
+    "str": str,
+    "int": int,
+    "float": float,
+    "bool": lambda value: value.lower() in ("t", "true", "1", "yes"),
+    "array": parse_doql_array,
+}
+# Suffix of the columns added to CSV queries flagging which `text` columns are NULL, see `doql_null_flags`.
+DOQL_NULL_FLAG_SUFFIX = "__is_null"
+
+
+def iter_text_lines(chunks: Iterable[str]) -> Iterator[str]:
+    """Method to split chunks of text into lines, keeping their line endings, as they're received.
+
+    Args:
+        chunks (Iterable[str]): Chunks of text.
+
+    Yields:
+        Iterator[str]: Each line of the text.
+    """
+    buffer = ""
+    for chunk in chunks:
+        *lines, buffer = (buffer + chunk).split("\n")
+        for line in lines:
+            yield line + "\n"
+    if buffer:
+        yield buffer
+
+
+def doql_null_flags(types: dict, alias: str) -> str:
+    """Method to build the extra output columns flagging which `text` columns of a DOQL query are NULL.
+
+    CSV can't distinguish an empty string from NULL, so each column typed `text` is paired with a boolean column that's
+    true when it's NULL, letting `iter_csv_records` return NULL text as None as the JSON output does.
+
+    Args:
+        types (dict): Type of each output column, see `iter_csv_records`.
+        alias (str): Alias of the subquery whose columns are flagged.
+
+    Returns:
+        str: Flag columns to append to the column list of a SELECT, each preceded by a comma, or an empty string.
+    """
+    return "".join(
+        f', {alias}."{column}" IS NULL AS "{column}{DOQL_NULL_FLAG_SUFFIX}"'
+        for column, kind in types.items()
+        if kind == "text"
+    )
+
+
+def iter_csv_records(lines: Iterable[str], types: dict) -> Iterator[dict]:
+    """Method to parse DOQL CSV output into records matching the shape of its JSON output.
+
+    The first row holds the column names. Values of the columns listed in `types` are converted, with an empty value
+    becoming None, and all other columns are returned as strings. Columns typed `text` are also returned as strings but
+    are None where the flag column added by `doql_null_flags` is true, as CSV can't otherwise distinguish an empty
+    string from NULL. The flag columns are removed from the records.
+
+    Args:
+        lines (Iterable[str]): Text of the CSV document, ie a file object or chunks split on line boundaries.
+        types (dict): Type of each column, one of `text`, `int`, `float`, `bool` or `array`, keyed by column name.
+
+    Yields:
+        Iterator[dict]: Each record of the CSV document.
+    """
+    reader = csv.reader(lines)
+    header = next(reader, None)
+    if header is None:
+        return
+    converters = [DOQL_CSV_TYPES[types[column]] if types.get(column, "text") != "text" else None for column in header]
+    flags = [
+        (column, column[: -len(DOQL_NULL_FLAG_SUFFIX)])
+        for column in header
+        if column.endswith(DOQL_NULL_FLAG_SUFFIX) and column[: -len(DOQL_NULL_FLAG_SUFFIX)] in header
+    ]
+    is_true = DOQL_CSV_TYPES["bool"]
+    for row in reader:
+        if not row:
+            continue
+        record = {
+            column: value if converter is None else (converter(value) if value != "" else None)
+            for column, value, converter in zip(header, row, converters)
+        }
+        for flag, column in flags:
+            if is_true(record.pop(flag)):
+                record[column] = None
+        yield record
+
+
+def doql_select(columns: Optional[Iterable[str]], key: Optional[str] = None, prefix: str = "") -> str:
+    """Method to build the column list of a DOQL SELECT projecting only the given columns.
+
+    Args:
+        columns (Iterable[str], optional): Names of the columns to select, or None to select every column.
+        key (str, optional): Column that's always selected, ie the primary key a result is mapped by. Defaults to None.
+        prefix (str, optional): Table alias each column is qualified with, ie `p.`. Defaults to "".
+
+    Returns:
+        str: Comma separated column list for the SELECT.
+    """
+    if not columns:
+        return f"{prefix}*"
+    selected = dict.fromkeys(([key] if key else []) + list(columns))
+    return ", ".join(f"{prefix}{column}" for column in selected)
+
+
+def include_columns(columns: Optional[Iterable[str]]) -> dict:
+    """Method to build the parameters limiting the fields returned by a Device42 REST list endpoint.
+
+    Args:
+        columns (Iterable[str], optional): Names of the fields to return, or None to return every field.
+
+    Returns:
+        dict: Parameters for `Device42API.api_call`.
+    """
+    return {"include_cols": ",".join(dict.fromkeys(columns))} if columns else {}
+
+
+def doql_literal(value) -> str:
+    """Method to render a Python value as a SQL literal for use in a DOQL query.
+
+    Args:
+        value (Any): Value to be rendered.
+
+    Returns:
+        str: SQL literal for the value.
+    """
+    if value is None:
+        return "NULL"
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, (int, float)):
+        return str(value)
+    return "'" + str(value).replace("'", "''") + "'"
+
+
 def get_intf_type(intf_record: dict) -> str:  # pylint: disable=too-many-branches
     """Method to determine an Interface type based on a few factors.
 
@@ -152,22 +552,18 @@ def find_device_role_from_tags(tag_list: List[str]) -> str:
     Returns:
         str: The Default device role defined in plugin settings.
     """
-    _prepend = PLUGIN_CFG.get("role_prepend")
-    if _prepend:
-        for _tag in tag_list:
-            if re.search(_prepend, _tag):
-                return re.sub(_prepend, "", _tag)
+    _role = get_rules(PLUGIN_CFG).device_role(tag_list)
+    if _role is not None:
+        return _role
     return DEFAULTS.get("device_role")
 
 
-def get_facility(tags: List[str], diffsync=None):  # pylint: disable=inconsistent-return-statements
+def get_facility(tags: List[str], diffsync=None):
     """Determine Site facility from a specified Tag."""
     if not PLUGIN_CFG.get("facility_prepend"):
         diffsync.log_failure(message="The `facility_prepend` setting is missing or invalid.")
         raise MissingConfigSetting("facility_prepend")
-    for _tag in tags:
-        if re.search(PLUGIN_CFG.get("facility_prepend"), _tag):
-            return re.sub(PLUGIN_CFG.get("facility_prepend"), "", _tag)
+    return get_rules(PLUGIN_CFG).facility(tags)
 
 
 def get_custom_field_dict(cfields: List[dict]) -> dict:
@@ -185,6 +581,28 @@ def get_custom_field_dict(cfields: List[dict]) -> dict:
     return cf_dict
 
 
+def netport_pk_map(netports: Iterable[dict]) -> dict:
+    """Method to map the Ports of Devices returned by `get_netports` to their primary key for reference in other functions.
+
+    Args:
+        netports (Iterable[dict]): Ports as returned by `Device42API.get_netports`.
+
+    Returns:
+        dict: Dict of ports where key is the primary key of the Port with the port name, MAC address and Device name.
+    """
+    return {
+        _port["netport_pk"]: {
+            "port": _port["port_name"] if _port["port_name"] or not _port.get("hwaddress") else _port["hwaddress"],
+            "netport_pk": _port["netport_pk"],
+            "hwaddress": _port["hwaddress"],
+            "second_device_fk": _port["second_device_fk"],
+            "device": _port["device_name"],
+        }
+        for _port in netports
+        if _port.get("device_name") is not None
+    }
+
+
 def load_vlan(  # pylint: disable=dangerous-default-value, too-many-arguments
     diffsync,
     vlan_id: int,
@@ -222,20 +640,216 @@ def load_vlan(  # pylint: disable=dangerous-default-value, too-many-arguments
         diffsync.add(new_vlan)
 
 
-class Device42API:  # pylint: disable=too-many-public-methods
+class Device42API:  # pylint: disable=too-many-public-methods,too-many-instance-attributes
     """Device42 API class."""
 
-    def __init__(self, base_url: str, username: str, password: str, verify: bool = True):
-        """Create Device42 API connection."""
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+    MAX_BACKOFF = 120.0
+    # Number of further pages a paginated response is cut off after, guarding against an endless pagination loop.
+    MAX_PAGES = 10000
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        base_url: str,
+        username: str,
+        password: str,
+        verify: bool = True,
+        pool_size: int = 10,
+        max_workers: int = 1,
+        doql_chunk_sizes: dict = None,
+        max_retries: int = 3,
+        backoff_factor: float = 1.0,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        snapshots: Optional[SnapshotStore] = None,
+        transport: Optional[HTTPAdapter] = None,
+        page_sizer: Optional[PageSizer] = None,
+        doql_output_type: str = "json",
+        memoize: bool = True,
+    ):
+        """Create Device42 API connection.
+
+        Args:
+            base_url (str): Base URL of the Device42 instance.
+            username (str): Username to authenticate with.
+            password (str): Password to authenticate with.
+            verify (bool, optional): Whether to validate the SSL certificate of the instance. Defaults to True.
+            pool_size (int, optional): Number of keep-alive connections to hold open to the instance. Defaults to 10.
+            max_workers (int, optional): Maximum number of pagination pages fetched concurrently. Defaults to 1.
+            doql_chunk_sizes (dict, optional): Number of records to retrieve per DOQL request keyed by query method name,
+                ie `get_ip_addrs`. Queries not listed are sent as a single request. Defaults to None.
+            max_retries (int, optional): Number of times a request is retried on a transient error. Defaults to 3.
+            backoff_factor (float, optional): Base number of seconds for exponential backoff between retries.
+                Defaults to 1.0.
+            circuit_breaker (CircuitBreaker, optional): Circuit breaker guarding requests to the instance. Defaults to a
+                CircuitBreaker with its default settings.
+            snapshots (SnapshotStore, optional): Store of dataset snapshots to serve datasets from, and write them to,
+                instead of retrieving them from Device42 every time. Defaults to None.
+            transport (HTTPAdapter, optional): Transport adapter to send requests through in place of the pooled
+                HTTPAdapter, ie to record or replay Device42 traffic. Defaults to None.
+            page_sizer (PageSizer, optional): Page sizes to request from REST endpoints, learned from the latency of
+                each page when adaptive. Defaults to None for 1000 records per page.
+            doql_output_type (str, optional): Format to retrieve DOQL queries that declare their column types in,
+                either `json` or `csv`. Defaults to "json".
+            memoize (bool, optional): Whether to serve the DOQL queries that are repeated during a sync, ie the default
+                CustomFields and the maps of primary keys, from the body of the first request for the lifetime of the
+                client. Defaults to True.
+        """
         self.base_url = base_url
         self.verify = verify
         self.username = username
         self.password = password
         self.headers = {"Content-Type": "application/x-www-form-urlencoded"}
+        self.max_workers = max(1, max_workers)
+        self.doql_chunk_sizes = doql_chunk_sizes or {}
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self.snapshots = snapshots
+        self.page_sizer = page_sizer
+        self.doql_output_type = doql_output_type
+        self.memo = RequestMemo() if memoize else None
+        self.stats = Counter()
+        # CustomField maps are shared between objects, and datasets, with the same fields
+        self.cf_interner = CustomFieldInterner()
+        self._stats_lock = threading.Lock()
 
         if verify is False:
             urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+        self.session = requests.Session()
+        self.session.auth = (self.username, self.password)
+        self.session.headers.update(self.headers)
+        self.session.verify = self.verify
+        pool_size = max(pool_size, self.max_workers)
+        adapter = transport or HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def close(self):
+        """Close the underlying HTTP session, release pooled connections and memoized responses and save page sizes."""
+        self.session.close()
+        if self.memo is not None:
+            self.memo.clear()
+        if self.page_sizer is not None:
+            self.page_sizer.save()
+
+    def __enter__(self):
+        """Return the client for use as a context manager."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Close the client when leaving the context manager."""
+        self.close()
+
+    def count(self, stat: str, amount: int = 1):
+        """Increment a request statistic in a thread-safe manner.
+
+        Args:
+            stat (str): Name of the statistic.
+            amount (int, optional): Amount to increment by. Defaults to 1.
+        """
+        with self._stats_lock:
+            self.stats[stat] += amount
+
+    def _retry_delay(self, attempt: int, response: Optional[requests.Response] = None) -> float:
+        """Determine how long to wait before retrying a request.
+
+        The `Retry-After` header of the response is honoured when present, otherwise exponential backoff with full
+        jitter is used.
+
+        Args:
+            attempt (int): Number of attempts that have already failed, starting at 0.
+            response (requests.Response, optional): Response of the failed attempt. Defaults to None.
+
+        Returns:
+            float: Number of seconds to wait.
+        """
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after:
+            try:
+                return min(max(float(retry_after), 0.0), self.MAX_BACKOFF)
+            except ValueError:
+                try:
+                    retry_at = parsedate_to_datetime(retry_after)
+                    return min(max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0), self.MAX_BACKOFF)
+                except (TypeError, ValueError):
+                    pass
+        return random.uniform(0, min(self.MAX_BACKOFF, self.backoff_factor * 2**attempt))  # nosec B311
+
+    def _memoized_content(self, url: str, params: dict) -> bytes:
+        """Retrieve the body of a GET request, serving it from the memo when it has already been retrieved.
+
+        Requests are memoized by URL and parameters. Concurrent callers of the same request share a single request to
+        Device42.
+
+        Args:
+            url (str): Full URL to send the request to.
+            params (dict): Parameters of the request.
+
+        Raises:
+            requests.exceptions.HTTPError: Device42 returned an error for the request, which isn't memoized.
+
+        Returns:
+            bytes: Body of the response from Device42.
+        """
+
+        def request():
+            response = self._request(method="GET", url=url, params=params)
+            response.raise_for_status()
+            return response.content
+
+        content, hit = self.memo.get((url, tuple(sorted(params.items()))), request)
+        self.count("cache hits" if hit else "cache misses")
+        return content
+
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request to Device42, retrying transient failures with backoff.
+
+        Connection errors, timeouts and responses with a status in `RETRY_STATUSES` are retried up to `max_retries`
+        times. Once retries are exhausted the last response is returned, or the connection error raised, for the caller
+        to handle.
+
+        Args:
+            method (str): API request method.
+            url (str): Full URL to send the request to.
+            **kwargs: Additional arguments passed to `requests.Session.request`.
+
+        Raises:
+            CircuitBreakerOpen: Device42 has failed too many consecutive requests.
+
+        Returns:
+            requests.Response: Response from Device42.
+        """
+        attempt = 0
+        while True:
+            self.circuit_breaker.before_request()
+            self.count("requests")
+            try:
+                response = self.session.request(method=method, url=url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as err:
+                self.circuit_breaker.record_failure()
+                if attempt >= self.max_retries:
+                    self.count("failures")
+                    raise
+                reason, delay = type(err).__name__, self._retry_delay(attempt)
+            else:
+                if response.status_code not in self.RETRY_STATUSES:
+                    self.circuit_breaker.record_success()
+                    return response
+                if response.status_code == 429:
+                    self.circuit_breaker.record_rate_limited()
+                else:
+                    self.circuit_breaker.record_failure()
+                if attempt >= self.max_retries:
+                    self.count("failures")
+                    return response
+                reason, delay = response.status_code, self._retry_delay(attempt, response)
+                response.close()
+            attempt += 1
+            self.count("retries")
+            self.count(f"retries ({reason})")
+            time.sleep(delay)
+
     def validate_url(self, path):
         """Validate URL formatting is correct."""
         if not self.base_url.endswith("/") and not path.startswith("/"):
@@ -246,7 +860,9 @@ class Device42API:  # pylint: disable=too-many-public-methods
             return full_path
         return full_path
 
-    def api_call(self, path: str, method: str = "GET", params: dict = None, payload: dict = None):
+    def api_call(  # pylint: disable=too-many-arguments
+        self, path: str, method: str = "GET", params: dict = None, payload: dict = None, memoize: bool = False
+    ):
         """Method to send Request to Device42 of type `method`. Defaults to GET request.
 
         Args:
@@ -254,6 +870,8 @@ class Device42API:  # pylint: disable=too-many-public-methods
             method (str, optional): API request method. Defaults to "GET".
             params (dict, optional): Additional parameters to send to API. Defaults to None.
             payload (dict, optional): Message payload to be sent as part of API call.
+            memoize (bool, optional): Whether to serve a repeated GET request from the memo when it's enabled. Further
+                pages of a paginated response are never memoized. Defaults to False.
 
         Raises:
             Exception: Error thrown if request errors.
@@ -267,73 +885,192 @@ class Device42API:  # pylint: disable=too-many-public-methods
         if params is None:
             params = {}
 
+        limit = self.page_sizer.size(url) if self.page_sizer is not None else 1000
         params.update(
             {
                 "_paging": "1",
                 "_return_as_object": "1",
-                "_max_results": "1000",
+                "_max_results": str(limit),
             }
         )
 
-        resp = requests.request(
-            method=method,
-            headers=self.headers,
-            auth=(self.username, self.password),
-            url=url,
-            params=params,
-            verify=self.verify,
-            data=payload,
-        )
+        start = time.perf_counter()
         try:
-            resp.raise_for_status()
+            if memoize and self.memo is not None and method.upper() == "GET" and payload is None:
+                content = self._memoized_content(url=url, params=params)
+            else:
+                resp = self._request(method=method, url=url, params=params, data=payload)
+                resp.raise_for_status()
+                content = resp.content
         except requests.exceptions.HTTPError as err:
-            print(f"Error in communicating to Device42 API: {err}")
+            if self.page_sizer is not None:
+                self.page_sizer.record(url, limit, None)
+            logger.error("Error in communicating to Device42 API: %s", err)
             return False
 
-        return_data = resp.json()
-        # print(f"Total count for {url}: {return_data.get('total_count')}")
+        return_data = json_loads(content)
+        if self.page_sizer is not None and isinstance(return_data, dict) and return_data.get("total_count"):
+            self.page_sizer.record(url, limit, time.perf_counter() - start)
         # Handle Device42 pagination
-        counter = 0
         pagination = False
         if isinstance(return_data, dict) and return_data.get("total_count"):
-            while (return_data.get("offset") + return_data.get("limit")) < return_data.get("total_count"):
-                pagination = True
-                # print("Handling paginated response from Device42.")
-                new_offset = return_data["offset"] + return_data["limit"]
-                params.update({"offset": new_offset})
-                counter += 1
-                response = requests.request(
-                    method="GET",
-                    headers=self.headers,
-                    auth=(self.username, self.password),
-                    url=url,
-                    params=params,
-                    verify=self.verify,
-                )
-                response.raise_for_status()
-                return_data = merge_offset_dicts(return_data, response.json())
-                # print(
-                #     f"Number of devices: {len(return_data['Devices'])}.\noffset: {return_data.get('offset')}.\nlimit: {return_data.get('limit')}."
-                # )
-
-                # Handle possible infinite loop.
-                if counter > 10000:
-                    print("Too many pagination loops in Device42 request. Possible infinite loop.")
-                    print(url)
-                    break
-
-            # print(f"Exiting API request loop after {counter} loops.")
+            if self.max_workers > 1:
+                pagination, return_data = self._fetch_pages_concurrently(url, params, return_data)
+            else:
+                pagination, return_data = self._fetch_pages(url, params, return_data)
 
         if pagination:
             return_data.pop("offset", None)
 
         return return_data
 
-    def doql_query(self, query: str) -> dict:
+    def _get_page(self, url: str, params: dict, offset: int, adapt: bool = False) -> dict:
+        """Retrieve a single page of a paginated response from Device42.
+
+        Args:
+            url (str): Full URL of the endpoint being paginated.
+            params (dict): Parameters sent with the original request.
+            offset (int): Offset of the page to retrieve.
+            adapt (bool, optional): Whether to retry a failed page with a smaller page size. Defaults to False.
+
+        Returns:
+            dict: JSON payload of the page.
+        """
+        params = {**params, "offset": offset}
+        while True:
+            start = time.perf_counter()
+            try:
+                response = self._request(method="GET", url=url, params=params)
+                response.raise_for_status()
+            except requests.exceptions.RequestException:
+                if not adapt:
+                    raise
+                limit = int(params["_max_results"])
+                new_limit = self.page_sizer.record(url, limit, None)
+                if new_limit >= limit:
+                    raise
+                self.count("page size reductions")
+                params["_max_results"] = str(new_limit)
+                continue
+            if self.page_sizer is not None:
+                self.page_sizer.record(url, int(params["_max_results"]), time.perf_counter() - start)
+            return json_loads(response.content)
+
+    def _fetch_pages(self, url: str, params: dict, return_data: dict):
+        """Walk the remaining pages of a paginated response one at a time.
+
+        With an adaptive PageSizer each page is requested with the size learned from the pages before it, and a failed
+        page is retried with a smaller size.
+
+        Args:
+            url (str): Full URL of the endpoint being paginated.
+            params (dict): Parameters sent with the original request.
+            return_data (dict): First page returned from Device42.
+
+        Returns:
+            tuple: Whether further pages were retrieved and the merged response.
+        """
+        counter = 0
+        pages = [return_data]
+        page = return_data
+        adapt = self.page_sizer is not None and self.page_sizer.adaptive
+        while (page.get("offset") + page.get("limit")) < page.get("total_count"):
+            new_offset = page["offset"] + page["limit"]
+            counter += 1
+            if adapt:
+                params = {**params, "_max_results": str(self.page_sizer.size(url))}
+            page = self._get_page(url, params, new_offset, adapt=adapt)
+            pages.append(page)
+
+            # Handle possible infinite loop.
+            if counter > self.MAX_PAGES:
+                logger.warning("Too many pages in Device42 response from %s, stopped after %d pages.", url, counter)
+                self.count("truncated responses")
+                break
+
+        if len(pages) == 1:
+            return False, return_data
+        return True, merge_paginated_responses(pages)
+
+    def _fetch_pages_concurrently(self, url: str, params: dict, return_data: dict):
+        """Retrieve the remaining pages of a paginated response in parallel.
+
+        The offsets of all remaining pages are known from the `total_count` and `limit` of the first page, so they are
+        fetched on a thread pool bounded by `max_workers` and merged back in offset order. With an adaptive PageSizer the
+        records of each page are requested with the size learned so far, up to the size of the first page, and a failed
+        request is retried with a smaller size, see `_fetch_window`.
+
+        Args:
+            url (str): Full URL of the endpoint being paginated.
+            params (dict): Parameters sent with the original request.
+            return_data (dict): First page returned from Device42.
+
+        Returns:
+            tuple: Whether further pages were retrieved and the merged response.
+        """
+        limit = return_data.get("limit")
+        if not limit:
+            return False, return_data
+        offsets = list(range(return_data.get("offset") + limit, return_data.get("total_count"), limit))
+        if len(offsets) > self.MAX_PAGES:
+            logger.warning(
+                "Too many pages in Device42 response from %s, only retrieving %d of %d pages.",
+                url,
+                self.MAX_PAGES + 1,
+                len(offsets),
+            )
+            self.count("truncated responses")
+            offsets = offsets[: self.MAX_PAGES + 1]
+        if not offsets:
+            return False, return_data
+        total_count = return_data.get("total_count")
+        adapt = self.page_sizer is not None and self.page_sizer.adaptive
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(offsets))) as executor:
+            windows = list(
+                executor.map(
+                    lambda offset: self._fetch_window(url, params, offset, min(offset + limit, total_count), adapt),
+                    offsets,
+                )
+            )
+        return True, merge_paginated_responses([return_data, *(page for window in windows for page in window)])
+
+    def _fetch_window(  # pylint: disable=too-many-arguments
+        self, url: str, params: dict, start: int, end: int, adapt: bool
+    ) -> List[dict]:
+        """Retrieve the records of a paginated response from offset `start` up to `end` as one or more pages.
+
+        Without adapting this is a single page. When adapting, each request asks for the size learned by the PageSizer,
+        limited to the records left in the window, so a window is split into smaller pages after a page failed or was
+        slow.
+
+        Args:
+            url (str): Full URL of the endpoint being paginated.
+            params (dict): Parameters sent with the original request.
+            start (int): Offset of the first record of the window.
+            end (int): Offset the window ends before.
+            adapt (bool): Whether to use the learned page size and retry a failed page with a smaller size.
+
+        Returns:
+            List[dict]: JSON payload of each page in offset order.
+        """
+        pages, offset = [], start
+        while offset < end:
+            if adapt:
+                params = {**params, "_max_results": str(min(self.page_sizer.size(url), end - offset))}
+            page = self._get_page(url, params, offset, adapt=adapt)
+            pages.append(page)
+            if not page.get("limit"):
+                break
+            offset += page["limit"]
+        return pages
+
+    def doql_query(self, query: str, memoize: bool = False) -> dict:
         """Method to perform a DOQL query against Device42.
 
         Args:
             query (str): DOQL query to be sent to Device42.
+            memoize (bool, optional): Whether to serve a repeated query from the memo, for queries that several loaders
+                run. Defaults to False.
 
         Returns:
             dict: Returned data from Device42 for DOQL query.
@@ -343,62 +1080,214 @@ class Device42API:  # pylint: disable=too-many-public-methods
             "output_type": "json",
         }
         url = "services/data/v1.0/query/"
-        return self.api_call(path=url, params=params)
+        return self.api_call(path=url, params=params, memoize=memoize)
+
+    def doql_query_iter(self, query: str, types: Optional[dict] = None, null_flags: bool = True) -> Iterator[dict]:
+        """Method to perform a DOQL query against Device42 and yield each returned record as it's parsed.
+
+        The response body is streamed, decompressed and incrementally parsed so the full result set is never held in
+        memory. JSON output uses ijson when it's installed and falls back to an incremental parser built on the standard
+        json decoder. When `doql_output_type` is `csv` and the column types of the query are given, the query is
+        retrieved as CSV instead, which doesn't repeat the column names on every record, and converted back to the same
+        records the JSON output would produce. Columns typed `text` are flagged with `doql_null_flags` so NULL text is
+        returned as None in either format.
+
+        Args:
+            query (str): DOQL query to be sent to Device42.
+            types (dict, optional): Type of each output column keyed by column name, see `iter_csv_records`. Defaults
+                to None.
+            null_flags (bool, optional): Whether to add the NULL flags of the `text` columns to the query. Defaults to
+                True, callers that have already added them to `query` pass False.
+
+        Raises:
+            requests.exceptions.HTTPError: Device42 returned an error for the query.
+
+        Yields:
+            Iterator[dict]: Each record returned from Device42 for DOQL query.
+        """
+        output_type = "csv" if types is not None and self.doql_output_type == "csv" else "json"
+        flags = doql_null_flags(types, alias="q") if output_type == "csv" and null_flags else ""
+        if flags:
+            query = f"SELECT q.*{flags} FROM ({query}) q"
+        params = {
+            "query": query,
+            "output_type": output_type,
+            "_paging": "1",
+            "_return_as_object": "1",
+            "_max_results": "1000",
+        }
+        url = self.validate_url("services/data/v1.0/query/")
+        with self._request(method="GET", url=url, params=params, stream=True) as resp:
+            # Unlike `api_call`, errors are raised so a failed query can't be mistaken for an empty dataset.
+            resp.raise_for_status()
+            if output_type == "csv":
+                decoder = codecs.getincrementaldecoder(resp.encoding or "utf-8")()
+                chunks = (decoder.decode(chunk) for chunk in resp.iter_content(chunk_size=65536))
+                yield from iter_csv_records(iter_text_lines(chunks), types)
+            elif IJSON_AVAILABLE:
+                resp.raw.decode_content = True
+                yield from ijson.items(resp.raw, "item", use_float=True)
+            else:
+                decoder = codecs.getincrementaldecoder(resp.encoding or "utf-8")()
+                yield from iter_json_array(decoder.decode(chunk) for chunk in resp.iter_content(chunk_size=65536))
+
+    def doql_query_chunked(
+        self, query: str, keys: tuple, chunk_size: int, types: Optional[dict] = None
+    ) -> Iterator[dict]:
+        """Method to perform a DOQL query against Device42 in chunks using keyset pagination.
+
+        The query is wrapped so each request returns at most `chunk_size` records ordered by `keys`, starting after the
+        keys of the last record of the previous chunk. Unlike OFFSET, this keeps every request equally cheap for the
+        Device42 database regardless of how deep into the result set it is.
+
+        Args:
+            query (str): DOQL query to be sent to Device42. The columns in `keys` must be included in its output.
+            keys (tuple): Names of the output columns that uniquely identify and order each record.
+            chunk_size (int): Maximum number of records to retrieve per request.
+            types (dict, optional): Type of each output column, see `doql_query_iter`. Defaults to None.
 
-    def get_buildings(self) -> List:
-        """Method to get all Buildings from Device42."""
-        return self.api_call(path="api/1.0/buildings")["buildings"]
+        Yields:
+            Iterator[dict]: Each record returned from Device42 for DOQL query.
+        """
+        columns = ", ".join(f'chunk."{key}"' for key in keys)
+        # NULL flags are added within the chunk so its records keep their order.
+        flags = doql_null_flags(types, alias="chunk") if types is not None and self.doql_output_type == "csv" else ""
+        select = f"chunk.*{flags}" if flags else "*"
+        last = None
+        while True:
+            where = f" WHERE ({columns}) > ({', '.join(doql_literal(value) for value in last)})" if last else ""
+            chunk_query = f"SELECT {select} FROM ({query}) chunk{where} ORDER BY {columns} LIMIT {chunk_size}"
+            count = 0
+            for record in self.doql_query_iter(query=chunk_query, types=types, null_flags=False):
+                count += 1
+                last = tuple(record[key] for key in keys)
+                yield record
+            # A failed chunk raises from doql_query_iter, so a short chunk is always the end of the result set.
+            if count < chunk_size:
+                return
+
+    def _doql_records(  # pylint: disable=too-many-arguments
+        self, name: str, query: str, keys: tuple, stream: bool = False, types: Optional[dict] = None
+    ):
+        """Method to run the DOQL query for `name`, in chunks if a chunk size has been configured for it.
 
-    def get_building_pks(self) -> dict:
+        Args:
+            name (str): Name of the query method used to look up its chunk size.
+            query (str): DOQL query to be sent to Device42.
+            keys (tuple): Names of the output columns used to paginate the query in chunks.
+            stream (bool, optional): Whether to return an iterator of records instead of a list. Defaults to False.
+            types (dict, optional): Type of each output column, see `doql_query_iter`. Defaults to None.
+
+        Returns:
+            Union[List[dict], Iterator[dict]]: Records returned from Device42 for DOQL query.
+        """
+        chunk_size = self.doql_chunk_sizes.get(name)
+        if chunk_size:
+            records = self.doql_query_chunked(query=query, keys=keys, chunk_size=chunk_size, types=types)
+            return records if stream else list(records)
+        if stream:
+            return self.doql_query_iter(query=query, types=types)
+        if types is not None and self.doql_output_type == "csv":
+            return list(self.doql_query_iter(query=query, types=types))
+        return self.doql_query(query=query)
+
+    @snapshot
+    def get_buildings(self, columns: Optional[tuple] = None) -> List:
+        """Method to get all Buildings from Device42.
+
+        Args:
+            columns (tuple, optional): Fields to retrieve for each record. Defaults to None for every field.
+        """
+        return self.api_call(path="api/1.0/buildings", params=include_columns(columns))["buildings"]
+
+    @snapshot
+    def get_building_pks(self, columns: Optional[tuple] = None) -> dict:
         """Method to obtain all Buildings from Device42 mapped to their PK.
 
+        Args:
+            columns (tuple, optional): Columns to retrieve for each record. Defaults to None for every column.
+
         Returns:
             dict: Dictionary of Buildings with their PK as key.
         """
-        query = "SELECT * FROM view_building_v1"
-        results = self.doql_query(query=query)
+        query = f"SELECT {doql_select(columns, key='building_pk')} FROM view_building_v1"
+        results = self.doql_query(query=query, memoize=True)
         return {x["building_pk"]: x for x in results}
 
-    def get_rooms(self) -> List:
-        """Method to get all Rooms from Device42."""
-        return self.api_call(path="api/1.0/rooms")["rooms"]
+    @snapshot
+    def get_rooms(self, columns: Optional[tuple] = None) -> List:
+        """Method to get all Rooms from Device42.
 
-    def get_room_pks(self) -> dict:
+        Args:
+            columns (tuple, optional): Fields to retrieve for each record. Defaults to None for every field.
+        """
+        return self.api_call(path="api/1.0/rooms", params=include_columns(columns))["rooms"]
+
+    @snapshot
+    def get_room_pks(self, columns: Optional[tuple] = None) -> dict:
         """Method to obtain all Rooms from Device42 mapped to their PK.
 
+        Args:
+            columns (tuple, optional): Columns to retrieve for each record. Defaults to None for every column.
+
         Returns:
             dict: Dictionary of Rooms with their PK as key.
         """
-        query = "SELECT * FROM view_room_v1"
-        results = self.doql_query(query=query)
+        query = f"SELECT {doql_select(columns, key='room_pk')} FROM view_room_v1"
+        results = self.doql_query(query=query, memoize=True)
         return {x["room_pk"]: x for x in results}
 
-    def get_racks(self) -> List:
-        """Method to get all Racks from Device42."""
-        return self.api_call(path="api/1.0/racks")["racks"]
+    @snapshot
+    def get_racks(self, columns: Optional[tuple] = None) -> List:
+        """Method to get all Racks from Device42.
 
-    def get_rack_pks(self) -> dict:
+        Args:
+            columns (tuple, optional): Fields to retrieve for each record. Defaults to None for every field.
+        """
+        return self.api_call(path="api/1.0/racks", params=include_columns(columns))["racks"]
+
+    @snapshot
+    def get_rack_pks(self, columns: Optional[tuple] = None) -> dict:
         """Method to obtain all Racks from Device42 mapped to their PK.
 
+        Args:
+            columns (tuple, optional): Columns to retrieve for each record. Defaults to None for every column.
+
         Returns:
             dict: Dictionary of Racks with their PK as key.
         """
-        query = "SELECT * FROM view_rack_v1"
-        results = self.doql_query(query=query)
+        query = f"SELECT {doql_select(columns, key='rack_pk')} FROM view_rack_v1"
+        results = self.doql_query(query=query, memoize=True)
         return {x["rack_pk"]: x for x in results}
 
-    def get_vendors(self) -> List:
-        """Method to get all Vendors from Device42."""
-        return self.api_call(path="api/1.0/vendors")["vendors"]
+    @snapshot
+    def get_vendors(self, columns: Optional[tuple] = None) -> List:
+        """Method to get all Vendors from Device42.
+
+        Args:
+            columns (tuple, optional): Fields to retrieve for each record. Defaults to None for every field.
+        """
+        return self.api_call(path="api/1.0/vendors", params=include_columns(columns))["vendors"]
+
+    @snapshot
+    def get_hardware_models(self, columns: Optional[tuple] = None) -> List:
+        """Method to get all Hardware Models from Device42.
 
-    def get_hardware_models(self) -> List:
-        """Method to get all Hardware Models from Device42."""
-        return self.api_call(path="api/1.0/hardwares")["models"]
+        Args:
+            columns (tuple, optional): Fields to retrieve for each record. Defaults to None for every field.
+        """
+        return self.api_call(path="api/1.0/hardwares", params=include_columns(columns))["models"]
 
-    def get_devices(self) -> List[dict]:
-        """Method to get all Network Devices from Device42."""
-        return self.api_call(path="api/1.0/devices/all/?is_it_switch=yes")["Devices"]
+    @snapshot
+    def get_devices(self, columns: Optional[tuple] = None) -> List[dict]:
+        """Method to get all Network Devices from Device42.
 
+        Args:
+            columns (tuple, optional): Fields to retrieve for each record. Defaults to None for every field.
+        """
+        return self.api_call(path="api/1.0/devices/all/?is_it_switch=yes", params=include_columns(columns))["Devices"]
+
+    @snapshot
     def get_cluster_members(self) -> dict:
         """Method to get all member devices of a cluster from Device42.
 
@@ -420,26 +1309,39 @@ class Device42API:  # pylint: disable=too-many-public-methods
             for _i in _results
         }
 
-    def get_ports_with_vlans(self) -> List[dict]:
-        """Method to get all Ports with attached VLANs from Device42.
+    @snapshot
+    def get_netports(self) -> List[dict]:
+        """Method to get all Ports from Device42 along with the VLANs each is a member of and the location of its Device.
 
-        This retrieves only the information we care about via DOQL in one giant json blob instead of multiple API calls.
+        This single dataset supplies the Ports, the Site VLANs and the Port primary key map so `view_netport_v1` is only
+        scanned once. `vlan_pks` and `vlan_names` are ordered by VLAN primary key so each name lines up with its PK.
 
         Returns:
-            List[dict]: Dict of interface information from DOQL query.
+            List[dict]: List of dicts of Port, VLAN membership and Building/Customer information from DOQL query.
         """
-        query = "SELECT array_agg( distinct concat (v.vlan_pk)) AS vlan_pks, n.netport_pk, n.port AS port_name, n.description, n.up, n.up_admin, n.discovered_type, n.hwaddress, n.port_type, n.port_speed, n.mtu, n.tags, n.second_device_fk, d.name AS device_name FROM view_vlan_v1 v LEFT JOIN view_vlan_on_netport_v1 vn ON vn.vlan_fk = v.vlan_pk LEFT JOIN view_netport_v1 n ON n.netport_pk = vn.netport_fk LEFT JOIN view_device_v1 d ON d.device_pk = n.device_fk WHERE n.port is not null GROUP BY n.netport_pk, n.port, n.description, n.up, n.up_admin, n.discovered_type, n.hwaddress, n.port_type, n.port_speed, n.mtu, n.tags, n.second_device_fk, d.name"
-        return self.doql_query(query=query)
-
-    def get_ports_wo_vlans(self) -> List[dict]:
-        """Method to get all Ports from Device42.
-
-        Returns:
-            List[dict]: Dict of Interface information from DOQL query.
-        """
-        query = "SELECT m.netport_pk, m.port as port_name, m.description, m.up_admin, m.discovered_type, m.hwaddress, m.port_type, m.port_speed, m.mtu, m.tags, m.second_device_fk, d.name as device_name FROM view_netport_v1 m JOIN view_device_v1 d on d.device_pk = m.device_fk WHERE m.port is not null GROUP BY m.netport_pk, m.port, m.description, m.up_admin, m.discovered_type, m.hwaddress, m.port_type, m.port_speed, m.mtu, m.tags, m.second_device_fk, d.name"
-        return self.doql_query(query=query)
+        query = "SELECT n.netport_pk, n.port AS port_name, n.description, n.up, n.up_admin, n.discovered_type, n.hwaddress, n.port_type, n.port_speed, n.mtu, n.tags, n.second_device_fk, d.name AS device_name, b.name AS building, c.name AS customer, array_agg(CAST(vn.vlan_fk AS text) ORDER BY vn.vlan_fk) FILTER (WHERE vn.vlan_fk IS NOT NULL) AS vlan_pks, array_agg(vn.vlan_name ORDER BY vn.vlan_fk) FILTER (WHERE vn.vlan_fk IS NOT NULL) AS vlan_names FROM view_netport_v1 n LEFT JOIN view_vlan_on_netport_v1 vn ON vn.netport_fk = n.netport_pk LEFT JOIN view_device_v2 d ON d.device_pk = n.device_fk LEFT JOIN view_building_v1 b ON b.building_pk = d.building_fk LEFT JOIN view_customer_v1 c ON c.customer_pk = d.customer_fk GROUP BY n.netport_pk, n.port, n.description, n.up, n.up_admin, n.discovered_type, n.hwaddress, n.port_type, n.port_speed, n.mtu, n.tags, n.second_device_fk, d.name, b.name, c.name"
+        types = {
+            "netport_pk": "int",
+            "up": "bool",
+            "up_admin": "bool",
+            "mtu": "int",
+            "second_device_fk": "int",
+            "vlan_pks": "array",
+            "vlan_names": "array",
+            "port_name": "text",
+            "description": "text",
+            "discovered_type": "text",
+            "hwaddress": "text",
+            "port_type": "text",
+            "port_speed": "text",
+            "tags": "text",
+            "device_name": "text",
+            "building": "text",
+            "customer": "text",
+        }
+        return self._doql_records(name="get_netports", query=query, keys=("netport_pk",), types=types)
 
+    @snapshot
     def get_port_default_custom_fields(self) -> List[dict]:
         """Method to retrieve the default CustomFields for Ports from Device42.
 
@@ -449,30 +1351,37 @@ class Device42API:  # pylint: disable=too-many-public-methods
             List[dict]: List of dictionaries of CustomFields matching D42 format from the API without values.
         """
         query = "SELECT cf.key, cf.value, cf.notes FROM view_netport_custom_fields_v1 cf"
-        results = self.doql_query(query=query)
+        results = self.doql_query(query=query, memoize=True)
         return self.get_all_custom_fields(results)
 
+    @snapshot
     def get_port_custom_fields(self) -> dict:
         """Method to retrieve custom fields for Ports from Device42.
 
         Returns:
             dict: Dictionary of CustomFields matching D42 format from the API.
         """
-        query = "SELECT cf.key, cf.value, cf.notes, np.port as port_name, d.name as device_name FROM view_netport_custom_fields_v1 cf LEFT JOIN view_netport_v1 np ON np.netport_pk = cf.netport_fk LEFT JOIN view_device_v1 d ON d.device_pk = np.device_fk"
-        results = self.doql_query(query=query)
+        query = "SELECT cf.netport_fk, cf.key, cf.value, cf.notes, np.port as port_name, d.name as device_name FROM view_netport_custom_fields_v1 cf LEFT JOIN view_netport_v1 np ON np.netport_pk = cf.netport_fk LEFT JOIN view_device_v1 d ON d.device_pk = np.device_fk"
+        types = {
+            "netport_fk": "int",
+            "key": "text",
+            "value": "text",
+            "notes": "text",
+            "port_name": "text",
+            "device_name": "text",
+        }
+        results = self._doql_records(
+            name="get_port_custom_fields", query=query, keys=("netport_fk", "key"), types=types
+        )
         _fields = {}
-        for _cf in results:
-            _fields[_cf["device_name"]] = {}
-        for _cf in results:
-            _fields[_cf["device_name"]][_cf["port_name"]] = {}
-        for _cf in results:
-            _fields[_cf["device_name"]][_cf["port_name"]][_cf["key"]] = {
-                "key": _cf["key"],
-                "value": _cf["value"],
-                "notes": _cf["notes"],
-            }
+        _pivot = pivot_custom_fields(
+            results, object_key=lambda _cf: (_cf["device_name"], _cf["port_name"]), interner=self.cf_interner
+        )
+        for (_device_name, _port_name), _cfs in _pivot.items():
+            _fields.setdefault(_device_name, {})[_port_name] = _cfs
         return _fields
 
+    @snapshot
     def get_vrfgroups(self) -> dict:
         """Method to retrieve VRF Groups from Device42.
 
@@ -481,6 +1390,7 @@ class Device42API:  # pylint: disable=too-many-public-methods
         """
         return self.api_call(path="api/1.0/vrfgroup/")["vrfgroup"]
 
+    @snapshot
     def get_subnets(self) -> List[dict]:
         """Method to get all subnets and associated data from Device42.
 
@@ -490,6 +1400,7 @@ class Device42API:  # pylint: disable=too-many-public-methods
         query = "SELECT s.name, s.network, s.mask_bits, s.tags, v.name as vrf FROM view_subnet_v1 s JOIN view_vrfgroup_v1 v ON s.vrfgroup_fk = v.vrfgroup_pk"
         return self.doql_query(query=query)
 
+    @snapshot
     def get_subnet_default_custom_fields(self) -> dict:
         """Method to retrieve the default CustomFields for Subnets from Device42.
 
@@ -499,9 +1410,10 @@ class Device42API:  # pylint: disable=too-many-public-methods
             dict: Dictionary of CustomFields matching D42 format from the API without values.
         """
         query = "SELECT cf.key, cf.value, cf.notes FROM view_subnet_custom_fields_v1 cf"
-        results = self.doql_query(query=query)
+        results = self.doql_query(query=query, memoize=True)
         return self.get_all_custom_fields(results)
 
+    @snapshot
     def get_subnet_custom_fields(self) -> dict:
         """Method to retrieve custom fields for Subnets from Device42.
 
@@ -512,28 +1424,34 @@ class Device42API:  # pylint: disable=too-many-public-methods
         results = self.doql_query(query=query)
 
         default_cfs = self.get_subnet_default_custom_fields()
+        return pivot_custom_fields(
+            results,
+            object_key=lambda _cf: f"{_cf['network']}/{_cf['mask_bits']}",
+            fill_keys=default_cfs,
+            interner=self.cf_interner,
+        )
 
-        _fields = {}
-        for _cf in results:
-            _fields[f"{_cf['network']}/{_cf['mask_bits']}"] = default_cfs
-
-        for _cf in results:
-            _fields[f"{_cf['network']}/{_cf['mask_bits']}"][_cf["key"]] = {
-                "key": _cf["key"],
-                "value": _cf["value"],
-                "notes": _cf["notes"],
-            }
-        return _fields
-
-    def get_ip_addrs(self) -> List[dict]:
+    def get_ip_addrs(self) -> Iterator[dict]:
         """Method to get all IP addresses and relevant data from Device42 via DOQL.
 
         Returns:
-            List[dict]: List of dicts with info about each IP address.
+            Iterator[dict]: Iterator of dicts with info about each IP address, streamed from the DOQL response.
         """
-        query = "SELECT i.ip_address, i.available, i.label, i.tags, np.netport_pk, s.network as subnet, s.mask_bits as netmask, v.name as vrf FROM view_ipaddress_v1 i LEFT JOIN view_subnet_v1 s ON s.subnet_pk = i.subnet_fk LEFT JOIN view_netport_v1 np ON np.netport_pk = i.netport_fk LEFT JOIN view_vrfgroup_v1 v ON v.vrfgroup_pk = s.vrfgroup_fk WHERE s.mask_bits <> 0"
-        return self.doql_query(query=query)
+        query = "SELECT i.ipaddress_pk, i.ip_address, i.available, i.label, i.tags, np.netport_pk, s.network as subnet, s.mask_bits as netmask, v.name as vrf FROM view_ipaddress_v1 i LEFT JOIN view_subnet_v1 s ON s.subnet_pk = i.subnet_fk LEFT JOIN view_netport_v1 np ON np.netport_pk = i.netport_fk LEFT JOIN view_vrfgroup_v1 v ON v.vrfgroup_pk = s.vrfgroup_fk WHERE s.mask_bits <> 0"
+        types = {
+            "ipaddress_pk": "int",
+            "ip_address": "text",
+            "available": "bool",
+            "label": "text",
+            "tags": "text",
+            "netport_pk": "int",
+            "subnet": "text",
+            "netmask": "int",
+            "vrf": "text",
+        }
+        return self._doql_records(name="get_ip_addrs", query=query, keys=("ipaddress_pk",), stream=True, types=types)
 
+    @snapshot
     def get_ipaddr_default_custom_fields(self) -> dict:
         """Method to retrieve the default CustomFields for IP Addresses from Device42.
 
@@ -543,34 +1461,39 @@ class Device42API:  # pylint: disable=too-many-public-methods
             dict: Dictionary of CustomFields with label as key and remaining info as value.
         """
         query = "SELECT cf.key, cf.value, cf.notes FROM view_ipaddress_custom_fields_v1 cf"
-        results = self.doql_query(query=query)
+        results = self.doql_query(query=query, memoize=True)
         return self.get_all_custom_fields(results)
 
+    @snapshot
     def get_ipaddr_custom_fields(self) -> dict:
         """Method to retrieve the CustomFields for IP Addresses from Device42.
 
         Returns:
             dict: Dictionary of CustomFields from D42 matched to IP Addressmatching D42 format from the API with values.
         """
-        query = "SELECT cf.key, cf.value, cf.notes, i.ip_address, s.mask_bits FROM view_ipaddress_custom_fields_v1 cf LEFT JOIN view_ipaddress_v1 i ON i.ipaddress_pk = cf.ipaddress_fk LEFT JOIN view_subnet_v1 s ON s.subnet_pk = i.subnet_fk"
-        results = self.doql_query(query=query)
-
-        default_cfs = self.get_all_custom_fields(results)
+        query = "SELECT cf.ipaddress_fk, cf.key, cf.value, cf.notes, i.ip_address, s.mask_bits FROM view_ipaddress_custom_fields_v1 cf LEFT JOIN view_ipaddress_v1 i ON i.ipaddress_pk = cf.ipaddress_fk LEFT JOIN view_subnet_v1 s ON s.subnet_pk = i.subnet_fk"
+        results = self._doql_records(
+            name="get_ipaddr_custom_fields",
+            query=query,
+            keys=("ipaddress_fk", "key"),
+            types={
+                "ipaddress_fk": "int",
+                "key": "text",
+                "value": "text",
+                "notes": "text",
+                "ip_address": "text",
+                "mask_bits": "int",
+            },
+        )
 
-        _fields = {}
-        for _cf in results:
-            addr = f"{_cf['ip_address']}/{_cf['mask_bits']}"
-            if addr not in _fields:
-                _fields[addr] = default_cfs
-            _fields[addr][_cf["key"]] = {
-                "key": _cf["key"],
-                "value": _cf["value"],
-                "notes": _cf["notes"],
-            }
-        return _fields
+        return pivot_custom_fields(
+            results,
+            object_key=lambda _cf: f"{_cf['ip_address']}/{_cf['mask_bits']}",
+            fill_seen=True,
+            interner=self.cf_interner,
+        )
 
-    @staticmethod
-    def get_all_custom_fields(custom_fields: List[dict]) -> dict:
+    def get_all_custom_fields(self, custom_fields: List[dict]) -> dict:
         """Get all Custom Fields for object.
 
         As Device42 only returns CustomFields with values in them when using DOQL, we need to compile a list of all Custom Fields on an object to match Nautobot method.
@@ -581,46 +1504,35 @@ class Device42API:  # pylint: disable=too-many-public-methods
         Returns:
             dict: List of all Custom Fields nulled.
         """
-        _cfs = {}
-        for _cf in custom_fields:
-            _cfs[_cf["key"]] = {
-                "key": _cf["key"],
-                "value": None,
-                "notes": None,
-            }
-        return _cfs
-
-    def get_vlans_with_location(self) -> List[dict]:
-        """Method to get all VLANs with Building and Customer info to attach to find Site.
-
-        Returns:
-            List[dict]: List of dicts of VLANs and location information.
-        """
-        query = "SELECT v.vlan_pk, v.number AS vid, v.description, v.tags, vn.vlan_name, b.name as building, c.name as customer FROM view_vlan_v1 v LEFT JOIN view_vlan_on_netport_v1 vn ON vn.vlan_fk = v.vlan_pk LEFT JOIN view_netport_v1 n on n.netport_pk = vn.netport_fk LEFT JOIN view_device_v2 d on d.device_pk = n.device_fk LEFT JOIN view_building_v1 b ON b.building_pk = d.building_fk LEFT JOIN view_customer_v1 c ON c.customer_pk = d.customer_fk WHERE vn.vlan_name is not null and v.number <> 0 GROUP BY v.vlan_pk, v.number, v.description, v.tags, vn.vlan_name, b.name, c.name"
-        return self.doql_query(query=query)
+        return self.cf_interner.freeze({}, fill_keys=(_cf["key"] for _cf in custom_fields))
 
+    @snapshot
     def get_vlan_info(self) -> dict:
-        """Method to obtain the VLAN name and ID paired to primary key.
+        """Method to obtain the VLAN name, ID, description and tags paired to primary key.
 
         Returns:
-            dict: Mapping of VLAN primary key to VLAN name and ID.
+            dict: Mapping of VLAN primary key to VLAN name, ID, description and tags.
         """
-        vinfo_query = "SELECT v.vlan_pk, v.name, v.number as vid FROM view_vlan_v1 v"
+        vinfo_query = "SELECT v.vlan_pk, v.name, v.number as vid, v.description, v.tags FROM view_vlan_v1 v"
         cfields_query = "SELECT cf.key, cf.value, cf.notes, v.vlan_pk FROM view_vlan_custom_fields_v1 cf LEFT JOIN view_vlan_v1 v ON v.vlan_pk = cf.vlan_fk"
         doql_vlans = self.doql_query(query=vinfo_query)
         vlans_cfs = self.doql_query(query=cfields_query)
-        vlan_dict = {str(x["vlan_pk"]): {"name": x["name"], "vid": x["vid"]} for x in doql_vlans}
-        for _cf in vlans_cfs:
-            if str(_cf["vlan_pk"]) in vlan_dict:
-                vlan_dict[str(_cf["vlan_pk"])]["custom_fields"] = {}
-        for _cf in vlans_cfs:
-            vlan_dict[str(_cf["vlan_pk"])]["custom_fields"][_cf["key"]] = {
-                "key": _cf["key"],
-                "value": _cf["value"],
-                "notes": _cf["notes"],
+        vlan_dict = {
+            str(x["vlan_pk"]): {
+                "name": x["name"],
+                "vid": x["vid"],
+                "description": x.get("description"),
+                "tags": x.get("tags"),
             }
+            for x in doql_vlans
+        }
+        _pivot = pivot_custom_fields(vlans_cfs, object_key=lambda _cf: str(_cf["vlan_pk"]), interner=self.cf_interner)
+        for _vlan_pk, _cfs in _pivot.items():
+            if _vlan_pk in vlan_dict:
+                vlan_dict[_vlan_pk]["custom_fields"] = _cfs
         return vlan_dict
 
+    @snapshot
     def get_device_pks(self) -> dict:
         """Get all Devices with their primary keys for reference in other functions.
 
@@ -628,50 +1540,49 @@ class Device42API:  # pylint: disable=too-many-public-methods
             dict: Dict of Devices where the key is the primary key of the Device.
         """
         query = "SELECT name, device_pk FROM view_device_v1 WHERE name <> ''"
-        _devs = self.doql_query(query=query)
+        _devs = self.doql_query(query=query, memoize=True)
         return {x["device_pk"]: x for x in _devs}
 
-    def get_port_pks(self) -> dict:
-        """Get all ports with their associated primary keys for reference in other functions.
-
-        Returns:
-            dict: Dict of ports where key is the primary key of the Port with the port name.
-        """
-        query = "SELECT np.port, np.netport_pk, np.hwaddress, np.second_device_fk, d.name as device FROM view_netport_v1 np JOIN view_device_v1 d ON d.device_pk = np.device_fk"
-        _ports = self.doql_query(query=query)
-        for _port in _ports:
-            if not _port["port"] and _port.get("hwaddress"):
-                _port["port"] = _port["hwaddress"]
-        return {x["netport_pk"]: x for x in _ports}
-
-    def get_port_connections(self) -> dict:
+    def get_port_connections(self) -> Iterator[dict]:
         """Gather all Ports with connections to determine connections between interfaces for Cables.
 
         Returns:
-            dict: Information about each port and it's connection information.
+            Iterator[dict]: Information about each port and it's connection information, streamed from the DOQL response.
         """
         query = "SELECT netport_pk as src_port, device_fk as src_device, second_device_fk as second_src_device, remote_netport_fk as dst_port FROM view_netport_v1 WHERE device_fk is not null AND remote_netport_fk is not null"
-        return self.doql_query(query=query)
+        types = {"src_port": "int", "src_device": "int", "second_src_device": "int", "dst_port": "int"}
+        return self._doql_records(
+            name="get_port_connections", query=query, keys=("src_port",), stream=True, types=types
+        )
 
-    def get_telcocircuits(self) -> List[dict]:
+    @snapshot
+    def get_telcocircuits(self, columns: Optional[tuple] = None) -> List[dict]:
         """Method to retrieve all information about TelcoCircuits from Device42.
 
+        Args:
+            columns (tuple, optional): Columns to retrieve for each circuit. Defaults to None for every column.
+
         Returns:
             List[dict]: List of dictionaries containing information about each circuit in Device42.
         """
-        query = "SELECT * FROM view_telcocircuit_v1"
+        query = f"SELECT {doql_select(columns)} FROM view_telcocircuit_v1"
         return self.doql_query(query=query)
 
-    def get_vendor_pks(self) -> dict:
+    @snapshot
+    def get_vendor_pks(self, columns: Optional[tuple] = None) -> dict:
         """Method to obtain all Vendors from Device42 mapped to their PK.
 
+        Args:
+            columns (tuple, optional): Columns to retrieve for each record. Defaults to None for every column.
+
         Returns:
             dict: Dictionary of Vendors with their PK as key.
         """
-        query = "SELECT * FROM view_vendor_v1"
-        results = self.doql_query(query=query)
+        query = f"SELECT {doql_select(columns, key='vendor_pk')} FROM view_vendor_v1"
+        results = self.doql_query(query=query, memoize=True)
         return {x["vendor_pk"]: x for x in results}
 
+    @snapshot
     def get_patch_panels(self) -> List[dict]:
         """Method to obtain all patch panels from Device42.
 
@@ -681,22 +1592,121 @@ class Device42API:  # pylint: disable=too-many-public-methods
         query = "SELECT a.name, a.in_service, a.serial_no, a.customer_fk, a.building_fk, a.calculated_building_fk, a.room_fk, a.calculated_room_fk, a.calculated_rack_fk, a.size, a.depth, m.number_of_ports, m.name as model_name, m.port_type_name as port_type, v.name as vendor, a.rack_fk, a.start_at as position, a.orientation FROM view_asset_v1 a LEFT JOIN view_patchpanelmodel_v1 m ON m.patchpanelmodel_pk = a.patchpanelmodel_fk JOIN view_vendor_v1 v ON v.vendor_pk = m.vendor_fk WHERE a.patchpanelmodel_fk is not null AND a.name is not null"
         return self.doql_query(query=query)
 
-    def get_patch_panel_port_pks(self) -> dict:
+    @snapshot
+    def get_patch_panel_port_pks(self, columns: Optional[tuple] = None) -> dict:
         """Method to obtain all Patch Panel Ports from Device42 mapped to their PK.
 
+        Args:
+            columns (tuple, optional): Columns of the Patch Panel Port to retrieve along with the name of its Patch
+                Panel. Defaults to None for every column.
+
         Returns:
             dict: Dictionary of Patch Panel Ports with their PK as key.
         """
-        query = "SELECT p.*, a.name FROM view_patchpanelport_v1 p JOIN view_asset_v1 a ON a.asset_pk = p.patchpanel_asset_fk"
-        results = self.doql_query(query=query)
+        columns = tuple(column for column in columns if column != "name") if columns else None
+        query = f"SELECT {doql_select(columns, key='patchpanelport_pk', prefix='p.')}, a.name FROM view_patchpanelport_v1 p JOIN view_asset_v1 a ON a.asset_pk = p.patchpanel_asset_fk"
+        results = self.doql_query(query=query, memoize=True)
         return {x["patchpanelport_pk"]: x for x in results}
 
-    def get_customer_pks(self) -> dict:
+    @snapshot
+    def get_customer_pks(self, columns: Optional[tuple] = None) -> dict:
         """Method to obtain all Customers from Device42 mapped to their PK.
 
+        Args:
+            columns (tuple, optional): Columns to retrieve for each record. Defaults to None for every column.
+
         Returns:
             dict: Dictionary of Customers with their PK as key.
         """
-        query = "SELECT * FROM view_customer_v1"
-        results = self.doql_query(query=query)
+        query = f"SELECT {doql_select(columns, key='customer_pk')} FROM view_customer_v1"
+        results = self.doql_query(query=query, memoize=True)
         return {x["customer_pk"]: x for x in results}
+
+
+class AsyncDevice42API:
+    """Asyncio facade for Device42API allowing independent datasets to be retrieved concurrently.
+
+    Every `get_*` method, along with `api_call` and `doql_query`, of the wrapped client is available as a coroutine that
+    runs the blocking call on a worker thread. The number of calls in flight against the appliance is bounded by the
+    number of worker threads. `fetch` provides a synchronous facade for callers that aren't running an event loop, such as Jobs.
+
+    Methods that stream their records, like `get_ip_addrs`, return their iterator without consuming it so gain nothing
+    from being called through this class.
+    """
+
+    def __init__(self, client: Device42API, max_concurrency: int = 4):
+        """Initialize AsyncDevice42API.
+
+        Args:
+            client (Device42API): Device42 API client used to perform the requests.
+            max_concurrency (int, optional): Maximum number of calls to Device42 in flight at once. Defaults to 4.
+        """
+        self.client = client
+        self.max_concurrency = max(1, max_concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="device42")
+
+    def __getattr__(self, name: str):
+        """Return a coroutine function wrapping the method of the same name on the client."""
+        if not (name.startswith("get_") or name in ("api_call", "doql_query")) or not hasattr(self.client, name):
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+        async def method(*args, **kwargs):
+            return await self.call(name, *args, **kwargs)
+
+        method.__name__ = name
+        method.__doc__ = getattr(self.client, name).__doc__
+        return method
+
+    async def call(self, name: str, *args, **kwargs):
+        """Call the client method `name` on a worker thread once one is available.
+
+        Args:
+            name (str): Name of the Device42API method to call.
+            *args: Positional arguments for the method.
+            **kwargs: Keyword arguments for the method.
+
+        Returns:
+            Any: Return value of the method.
+        """
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, functools.partial(getattr(self.client, name), *args, **kwargs)
+        )
+
+    async def gather(self, *names: str, kwargs: Optional[dict] = None) -> dict:
+        """Concurrently call each of the named client methods.
+
+        Args:
+            *names (str): Names of the Device42API methods to call, ie `get_buildings`.
+            kwargs (dict, optional): Keyword arguments for each method keyed by its name. Methods not listed are
+                called without arguments. Defaults to None.
+
+        Returns:
+            dict: Return value of each method keyed by its name.
+        """
+        kwargs = kwargs or {}
+        results = await asyncio.gather(*(self.call(name, **kwargs.get(name, {})) for name in names))
+        return dict(zip(names, results))
+
+    def fetch(self, *names: str, kwargs: Optional[dict] = None) -> dict:
+        """Synchronously retrieve the named datasets concurrently.
+
+        Args:
+            *names (str): Names of the Device42API methods to call, ie `get_buildings`.
+            kwargs (dict, optional): Keyword arguments for each method keyed by its name. Defaults to None.
+
+        Returns:
+            dict: Return value of each method keyed by its name.
+        """
+        return asyncio.run(self.gather(*names, kwargs=kwargs))
+
+    def close(self):
+        """Shut down the worker threads."""
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        """Return the client for use as a context manager."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Shut down the worker threads when leaving the context manager."""
+        self.close()
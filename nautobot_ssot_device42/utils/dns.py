@@ -0,0 +1,174 @@
+"""Concurrent DNS resolution of Device names with a cache that persists between runs."""
+
+import json
+import math
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Callable, Iterable, Optional, Union
+
+from netutils.dns import fqdn_to_ip
+
+
+class DNSResolver:
+    """Resolve Device FQDNs to an IP address, remembering both found and missing records for their TTL.
+
+    Each name is resolved with a single lookup that both proves it's resolvable and returns its address. Names whose
+    lookup timed out are reported missing for the remainder of the run without being cached, so they're retried on the
+    next run.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        max_workers: int = 8,
+        timeout: float = 5.0,
+        ttl: int = 86400,
+        negative_ttl: int = 3600,
+        path: Optional[str] = None,
+        resolve: Optional[Callable[[str], str]] = None,
+    ):
+        """Initialize DNSResolver.
+
+        Args:
+            max_workers (int, optional): Number of lookups to run at once. Defaults to 8.
+            timeout (float, optional): Seconds to wait for each lookup. Defaults to 5.0.
+            ttl (int, optional): Seconds to remember an address that was found. Defaults to 86400.
+            negative_ttl (int, optional): Seconds to remember a name that wasn't found. Defaults to 3600.
+            path (str, optional): JSON file the cache is read from and saved to. Defaults to None.
+            resolve (Callable[[str], str], optional): Function returning the address of a name and raising OSError if
+                it isn't resolvable. Defaults to None for `netutils.dns.fqdn_to_ip`.
+        """
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.path = path
+        self.resolve = resolve or fqdn_to_ip
+        self.cache = {}
+        # Names whose lookup timed out during this run, never saved
+        self.timed_out = set()
+        self.stats = {"hits": 0, "lookups": 0, "timeouts": 0}
+        self._lock = threading.Lock()
+        if self.path:
+            self.load()
+
+    def load(self):
+        """Read the cache saved by previous runs, ignoring a missing or unreadable file and expired entries."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                cache = json.load(file)
+        except (OSError, ValueError):
+            return
+        if isinstance(cache, dict):
+            now = time.time()
+            self.cache.update(
+                {
+                    name: (entry[0], entry[1])
+                    for name, entry in cache.items()
+                    if isinstance(entry, list) and len(entry) == 2 and entry[1] > now
+                }
+            )
+
+    def save(self):
+        """Write the unexpired cache entries so later runs start from them."""
+        if not self.path:
+            return
+        now = time.time()
+        with self._lock:
+            cache = {name: list(entry) for name, entry in sorted(self.cache.items()) if entry[1] > now}
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        with tempfile.NamedTemporaryFile("w", dir=directory, prefix=".dns-cache-", delete=False) as file:
+            json.dump(cache, file)
+        os.replace(file.name, self.path)
+
+    def cached(self, name: str) -> Optional[Union[str, bool]]:
+        """Return the cached address of `name`, False if it's cached as missing or None if it isn't cached."""
+        with self._lock:
+            entry = self.cache.get(name)
+        if entry is None or entry[1] <= time.time():
+            return None
+        return entry[0] if entry[0] else False
+
+    def _lookup(self, name: str) -> Union[str, bool]:
+        """Resolve `name` without the cache, returning False if it isn't resolvable."""
+        try:
+            return self.resolve(name)
+        except (OSError, UnicodeError):
+            return False
+
+    def _store(self, name: str, address: Union[str, bool]):
+        """Cache the result of resolving `name`."""
+        expires = time.time() + (self.ttl if address else self.negative_ttl)
+        with self._lock:
+            self.cache[name] = (address or None, expires)
+            self.stats["lookups"] += 1
+
+    def lookup(self, name: str) -> Union[str, bool]:
+        """Return the address of `name`, resolving it if it isn't cached.
+
+        Args:
+            name (str): FQDN to resolve.
+
+        Returns:
+            Union[str, bool]: IP address of the name or False if it isn't resolvable.
+        """
+        return self.resolve_all([name])[name]
+
+    def resolve_all(self, names: Iterable[str]) -> dict:
+        """Resolve every name that isn't cached concurrently, bounded by `max_workers` and `timeout`.
+
+        The lookups share one deadline of `timeout` for each lookup a worker has to run, ie two timeouts for 16 names
+        and 8 workers, so lookups that hang cost about one timeout per worker rather than one per name. Once it passes,
+        lookups still running are reported missing and recorded as timed out, and lookups that haven't started are
+        cancelled and reported missing for this call only. Names whose lookup already timed out during this run are
+        reported missing without being looked up again.
+
+        Args:
+            names (Iterable[str]): FQDNs to resolve.
+
+        Returns:
+            dict: Mapping of each name to its IP address or False if it isn't resolvable or the lookup timed out.
+        """
+        results, pending = {}, []
+        for name in dict.fromkeys(names):
+            address = False if name in self.timed_out else self.cached(name)
+            if address is None:
+                pending.append(name)
+            else:
+                results[name] = address
+        with self._lock:
+            self.stats["hits"] += len(results)
+        if not pending:
+            return results
+        workers = min(self.max_workers, len(pending))
+        executor = ThreadPoolExecutor(max_workers=workers)
+        futures = {name: executor.submit(self._lookup, name) for name in pending}
+        deadline = time.monotonic() + math.ceil(len(pending) / workers) * self.timeout
+        try:
+            for name, future in futures.items():
+                try:
+                    address = future.result(timeout=max(0.0, deadline - time.monotonic()))
+                except FutureTimeoutError:
+                    results[name] = False
+                    if future.cancel():
+                        # never started, so it may well resolve on the next call
+                        continue
+                    # the lookup can't be interrupted, so leave it running and move on without caching it
+                    with self._lock:
+                        self.stats["timeouts"] += 1
+                        self.timed_out.add(name)
+                    continue
+                self._store(name, address)
+                results[name] = address
+        finally:
+            if sys.version_info >= (3, 9):
+                executor.shutdown(wait=False, cancel_futures=True)  # pylint: disable=unexpected-keyword-arg
+            else:
+                for future in futures.values():
+                    future.cancel()
+                executor.shutdown(wait=False)
+        return results
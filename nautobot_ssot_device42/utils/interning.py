@@ -0,0 +1,88 @@
+"""Interning of the identifier strings and Tags repeated across many DiffSync models."""
+
+import sys
+from typing import Iterable, Optional, Union
+
+from pydantic.validators import str_validator
+
+# Most distinct Tag sets kept for sharing, so a run with unusually varied Tags can't grow the cache without bound.
+MAX_TAG_SETS = 100_000
+
+
+def intern_str(value):
+    """Return the interned copy of a string so equal identifiers share one object, passing anything else through."""
+    return sys.intern(value) if type(value) is str else value  # pylint: disable=unidiomatic-typecheck
+
+
+class InternedStr(str):
+    """Pydantic type of identifier fields, ie Device or Building names, whose values are interned when validated."""
+
+    @classmethod
+    def __get_validators__(cls):
+        """Validate the value as a `str` field does, then intern it."""
+        yield str_validator
+        yield intern_str
+
+
+class TagSet(tuple):
+    """Sorted, de-duplicated Tags of an object, shared between every object with the same Tags.
+
+    Equal Tag sets are the same instance so they compare by identity, and they also compare equal to a list of the same
+    Tags in order.
+    """
+
+    __slots__ = ()
+    _cache = {}
+
+    @classmethod
+    def of(cls, tags: Optional[Union[str, Iterable[str]]]) -> "TagSet":
+        """Return the shared TagSet of `tags`.
+
+        Args:
+            tags (Union[str, Iterable[str]], optional): Tags as a list or a comma-separated string, ie from DOQL.
+
+        Returns:
+            TagSet: Shared, sorted Tags.
+        """
+        if isinstance(tags, TagSet) and cls._cache.get(tags) is tags:
+            return tags
+        if not tags:
+            key = ()
+        else:
+            if isinstance(tags, str):
+                tags = tags.split(",")
+            key = tuple(sorted({intern_str(tag) for tag in tags}))
+        tag_set = cls._cache.get(key)
+        if tag_set is None:
+            tag_set = cls(key)
+            if len(cls._cache) < MAX_TAG_SETS:
+                tag_set = cls._cache.setdefault(key, tag_set)
+        return tag_set
+
+    @classmethod
+    def __get_validators__(cls):
+        """Validate Tags given as a list, tuple or comma-separated string."""
+        yield cls.of
+
+    def __eq__(self, other):
+        """Compare equal to the same Tags as a TagSet, tuple or list."""
+        if self is other:
+            return True
+        if isinstance(other, list):
+            other = tuple(other)
+        return tuple.__eq__(self, other)
+
+    def __ne__(self, other):
+        """Compare unequal to different Tags."""
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = tuple.__hash__
+
+    def __copy__(self):
+        """Return the TagSet itself as it can't be changed."""
+        return self
+
+    def __deepcopy__(self, memo: dict):
+        """Return the TagSet itself as it can't be changed."""
+        return self
@@ -1,6 +1,6 @@
 """Utility functions for Nautobot ORM."""
 import random
-from typing import List, OrderedDict
+from typing import List, Optional, OrderedDict
 from uuid import UUID
 
 from diffsync.exceptions import ObjectNotFound
@@ -15,6 +15,7 @@ from nautobot.utilities.utils import slugify_dashes_to_underscores
 from netutils.lib_mapper import ANSIBLE_LIB_MAPPER_REVERSE, NAPALM_LIB_MAPPER_REVERSE
 from taggit.managers import TaggableManager
 from nautobot_ssot_device42.diffsync.models.base.dcim import Device as NautobotDevice
+from nautobot_ssot_device42.utils.interning import TagSet
 
 try:
     from nautobot_device_lifecycle_mgmt.models import SoftwareLCM
@@ -172,7 +173,7 @@ def update_tags(tagged_obj: object, new_tags: List[str]):
             tagged_obj.tags.remove(tag)
 
 
-def get_tag_strings(list_tags: TaggableManager) -> List[str]:
+def get_tag_strings(list_tags: TaggableManager) -> TagSet:
     """Gets string values of all Tags in a list.
 
     This is the opposite of the `get_tags` function.
@@ -181,12 +182,9 @@ def get_tag_strings(list_tags: TaggableManager) -> List[str]:
         list_tags (TaggableManager): List of Tag objects to convert to strings.
 
     Returns:
-        List[str]: List of string values matching the Tags passed in.
+        TagSet: Shared, sorted string values matching the Tags passed in.
     """
-    _strings = list(list_tags.names())
-    if len(_strings) > 1:
-        _strings.sort()
-    return _strings
+    return TagSet.of(list_tags.names())
 
 
 def get_custom_field_dict(cfields: OrderedDict) -> dict:
@@ -282,17 +280,43 @@ def get_version_from_custom_field(fields: OrderedDict):
     return ""
 
 
-def determine_vc_position(vc_map: dict, virtual_chassis: str, device_name: str) -> int:
+def build_vc_member_index(vc_map: dict) -> dict:
+    """Index every member Device of each virtual chassis with the virtual chassis and its position in it.
+
+    A Device listed in more than one virtual chassis is indexed under the first, matching a scan of `vc_map` in order.
+
+    Args:
+        vc_map (dict): Dictionary of virtual chassis positions mapped to devices.
+
+    Returns:
+        dict: Mapping of member device name to a tuple of its virtual chassis name and position.
+    """
+    index = {}
+    for virtual_chassis, info in vc_map.items():
+        for position, member in enumerate(sorted(info["members"]), start=2):
+            index.setdefault(member, (virtual_chassis, position))
+    return index
+
+
+def determine_vc_position(
+    vc_map: dict, virtual_chassis: str, device_name: str, member_index: Optional[dict] = None
+) -> int:
     """Determine position of Member Device in Virtual Chassis based on name and other factors.
 
     Args:
         vc_map (dict): Dictionary of virtual chassis positions mapped to devices.
         virtual_chassis (str): Name of the virtual chassis that device is being added to.
         device_name (str): Name of member device to be added in virtual chassis.
+        member_index (dict, optional): Index of `vc_map` from `build_vc_member_index` to look the position up in
+            instead of sorting the members. Defaults to None.
 
     Returns:
         int: Position for member device in Virtual Chassis. Will always be position 2 or higher as 1 is master device.
     """
+    if member_index is not None and device_name in member_index:
+        _vc, position = member_index[device_name]
+        if _vc == virtual_chassis:
+            return position
     return sorted(vc_map[virtual_chassis]["members"]).index(device_name) + 2
 
 
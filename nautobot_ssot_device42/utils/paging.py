@@ -0,0 +1,129 @@
+"""Adaptive page sizing for paginated Device42 REST endpoints."""
+
+import json
+import os
+import tempfile
+import threading
+from typing import Optional
+from urllib.parse import urlsplit
+
+
+def endpoint_name(url: str) -> str:
+    """Return the name a Device42 endpoint is tracked under, ie `api/1.0/devices/all` for its full URL.
+
+    Args:
+        url (str): Full URL or path of the endpoint.
+
+    Returns:
+        str: Path of the endpoint without leading or trailing slashes.
+    """
+    return urlsplit(url).path.strip("/")
+
+
+class PageSizer:
+    """Track the number of records to request per page for each Device42 REST endpoint.
+
+    When adaptive, the page size of an endpoint is doubled after a page that took less than half of the target latency
+    and halved after a page that took longer than the target latency or failed, staying within `min_size` and
+    `max_size`. Endpoints listed in `overrides` always use their configured size.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        default: int = 1000,
+        adaptive: bool = False,
+        target_latency: float = 2.0,
+        min_size: int = 100,
+        max_size: int = 5000,
+        overrides: Optional[dict] = None,
+        path: Optional[str] = None,
+    ):
+        """Initialize PageSizer.
+
+        Args:
+            default (int, optional): Page size of endpoints that haven't been learned yet. Defaults to 1000.
+            adaptive (bool, optional): Whether to adjust page sizes based on the latency of each page. Defaults to False.
+            target_latency (float, optional): Number of seconds a page should take to retrieve. Defaults to 2.0.
+            min_size (int, optional): Smallest page size to shrink to. Defaults to 100.
+            max_size (int, optional): Largest page size to grow to. Defaults to 5000.
+            overrides (dict, optional): Fixed page size keyed by endpoint, ie `api/1.0/vendors`. Defaults to None.
+            path (str, optional): JSON file the learned page sizes are read from and saved to. Defaults to None.
+        """
+        self.default = default
+        self.adaptive = adaptive
+        self.target_latency = target_latency
+        self.min_size = min_size
+        self.max_size = max(max_size, min_size)
+        self.overrides = {endpoint_name(endpoint): size for endpoint, size in (overrides or {}).items()}
+        self.path = path
+        self.sizes = {}
+        self._lock = threading.Lock()
+        if self.adaptive and self.path:
+            self.load()
+
+    def load(self):
+        """Read the page sizes learned in previous runs, ignoring a missing or unreadable file."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                sizes = json.load(file)
+        except (OSError, ValueError):
+            return
+        if isinstance(sizes, dict):
+            self.sizes.update(
+                {endpoint: self._clamp(size) for endpoint, size in sizes.items() if isinstance(size, int)}
+            )
+
+    def save(self):
+        """Write the learned page sizes so later runs start from them."""
+        if not self.adaptive or not self.path:
+            return
+        with self._lock:
+            sizes = dict(sorted(self.sizes.items()))
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        with tempfile.NamedTemporaryFile("w", dir=directory, prefix=".page-sizes-", delete=False) as file:
+            json.dump(sizes, file, indent=2)
+        os.replace(file.name, self.path)
+
+    def _clamp(self, size: int) -> int:
+        """Return `size` bounded by `min_size` and `max_size`."""
+        return min(max(size, self.min_size), self.max_size)
+
+    def size(self, url: str) -> int:
+        """Return the page size to request from an endpoint.
+
+        Args:
+            url (str): Full URL or path of the endpoint.
+
+        Returns:
+            int: Number of records to request per page.
+        """
+        endpoint = endpoint_name(url)
+        if endpoint in self.overrides:
+            return self.overrides[endpoint]
+        with self._lock:
+            return self.sizes.get(endpoint, self.default)
+
+    def record(self, url: str, size: int, elapsed: Optional[float]) -> int:
+        """Adjust the page size of an endpoint based on how long a page took to retrieve.
+
+        Args:
+            url (str): Full URL or path of the endpoint.
+            size (int): Page size that was requested.
+            elapsed (float, optional): Number of seconds the page took, or None if the page failed.
+
+        Returns:
+            int: Page size to request next.
+        """
+        endpoint = endpoint_name(url)
+        if not self.adaptive or endpoint in self.overrides:
+            return self.size(url)
+        if elapsed is None or elapsed > self.target_latency:
+            new_size = self._clamp(size // 2)
+        elif elapsed < self.target_latency / 2:
+            new_size = self._clamp(size * 2)
+        else:
+            new_size = self._clamp(size)
+        with self._lock:
+            self.sizes[endpoint] = new_size
+        return new_size
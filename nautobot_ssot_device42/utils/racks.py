@@ -0,0 +1,95 @@
+"""Occupancy of rack units used to detect Devices placed in positions that are already taken."""
+
+from typing import Hashable
+
+# Flags marking which faces of a rack unit are taken. Full depth Devices take both faces.
+FRONT = 1
+REAR = 2
+BOTH = FRONT | REAR
+
+
+def face_mask(face: str, full_depth: bool = True) -> int:
+    """Return the faces of a rack unit taken by a Device mounted on `face`.
+
+    Args:
+        face (str): Face the Device is mounted on, ie `front` or `rear`.
+        full_depth (bool, optional): Whether the Device takes the full depth of the rack. Defaults to True.
+
+    Returns:
+        int: Flags of the faces taken by the Device.
+    """
+    if full_depth:
+        return BOTH
+    return REAR if face == "rear" else FRONT
+
+
+class RackOccupancy:
+    """Rack units taken in each rack, held as one byte of face flags per unit.
+
+    Racks are identified by any hashable key, ie a tuple of Building, Room and Rack name or a Nautobot Rack ID, that's
+    interned to a small integer the first time it's seen. Racks are sized up front when their height is known and grown
+    when a Device is placed beyond it.
+    """
+
+    def __init__(self):
+        """Initialize RackOccupancy."""
+        self._ids = {}
+        self._units = []
+
+    def rack_id(self, rack: Hashable) -> int:
+        """Return the integer ID interned for `rack`, adding an empty rack if it hasn't been seen before."""
+        _id = self._ids.get(rack)
+        if _id is None:
+            _id = self._ids[rack] = len(self._units)
+            self._units.append(bytearray(1))
+        return _id
+
+    def add_rack(self, rack: Hashable, height: int):
+        """Size the units of `rack` to its height, keeping any units that are already taken.
+
+        Args:
+            rack (Hashable): Key identifying the rack.
+            height (int): Number of units in the rack.
+        """
+        units = self._units[self.rack_id(rack)]
+        if len(units) <= height:
+            units.extend(bytes(height + 1 - len(units)))
+
+    def is_free(self, rack: Hashable, position: int, size: int, faces: int = BOTH) -> bool:
+        """Return whether the `size` units of `rack` starting at `position` are free on `faces`."""
+        _id = self._ids.get(rack)
+        if _id is None:
+            return True
+        units = self._units[_id]
+        return not any(flags & faces for flags in units[position : position + max(1, size)])
+
+    def reserve(self, rack: Hashable, position: int, size: int, faces: int = BOTH) -> bool:
+        """Take the units of `rack` for a Device if they're free.
+
+        Args:
+            rack (Hashable): Key identifying the rack.
+            position (int): Lowest unit the Device is mounted in.
+            size (int): Number of units the Device takes, with Devices under 1U taking a single unit.
+            faces (int, optional): Faces of the units the Device takes, see `face_mask`. Defaults to BOTH.
+
+        Returns:
+            bool: True if the units were free and are now taken, False if any of them were already taken.
+        """
+        if not self.is_free(rack, position, size, faces):
+            return False
+        units = self._units[self.rack_id(rack)]
+        end = position + max(1, size)
+        if len(units) < end:
+            units.extend(bytes(end - len(units)))
+        for unit in range(position, end):
+            units[unit] |= faces
+        return True
+
+    def release(self, rack: Hashable, position: int, size: int, faces: int = BOTH):
+        """Free the units of `rack` taken by a Device that's being moved or removed."""
+        _id = self._ids.get(rack)
+        if _id is None:
+            return
+        units = self._units[_id]
+        for unit in range(position, min(len(units), position + max(1, size))):
+            units[unit] &= ~faces & BOTH
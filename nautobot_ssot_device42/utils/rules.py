@@ -0,0 +1,229 @@
+"""Compiled form of the plugin settings that are matched against every Device, Patch Panel and Tag."""
+
+import re
+import threading
+import warnings
+from typing import Iterable, Optional
+
+# Characters that give a pattern a meaning other than its literal text.
+REGEX_METACHARACTERS = frozenset(".^$*+?{}[]\\|()")
+# Numbered or named backreferences, which would point at the wrong group once patterns are combined.
+BACKREFERENCE = re.compile(r"\\[1-9]|\(\?P=")
+# Names of the Port assumed to be a Device's management interface, in order of preference.
+DEFAULT_MGMT_INTERFACE_NAMES = ("mgmt0", "management", "management0", "Management")
+
+
+def is_literal(pattern: str) -> bool:
+    """Return whether `pattern` only matches its own text, ie `sitecode-`."""
+    return not REGEX_METACHARACTERS.intersection(pattern)
+
+
+class Prepend:
+    """Tag prefix setting, ie `facility_prepend` or `role_prepend`, that's stripped from the first matching Tag.
+
+    Matches the behavior of `re.search` to find the Tag and `re.sub` to strip it, using plain string operations when the
+    setting has no regex metacharacters.
+    """
+
+    def __init__(self, pattern: str):
+        """Initialize Prepend.
+
+        Args:
+            pattern (str): Literal prefix or regex pattern from the plugin settings.
+        """
+        self.pattern = pattern
+        self.literal = is_literal(pattern)
+        self.regex = None if self.literal else re.compile(pattern)
+
+    def strip(self, tags: Iterable[str]) -> Optional[str]:
+        """Return the first Tag matching the pattern with every match removed.
+
+        Args:
+            tags (Iterable[str]): Tags to search.
+
+        Returns:
+            Optional[str]: Remainder of the first matching Tag or None if no Tag matches.
+        """
+        for tag in tags:
+            if self.literal:
+                if self.pattern in tag:
+                    return tag.replace(self.pattern, "")
+            elif self.regex.search(tag):
+                return self.regex.sub("", tag)
+        return None
+
+
+class PluginRules:  # pylint: disable=too-many-instance-attributes
+    """Plugin settings compiled once so matching them doesn't repeat work for every Device or Tag.
+
+    The `hostname_mapping` patterns are combined into a single alternation, compiled the first time a hostname is
+    looked up, and the Site found for each hostname is remembered.
+    """
+
+    def __init__(
+        self,
+        hostname_mapping: Optional[list] = None,
+        facility_prepend: Optional[str] = None,
+        role_prepend: Optional[str] = None,
+        ignore_tag: Optional[str] = None,
+        mgmt_interface_names: Optional[Iterable[str]] = None,
+    ):
+        """Initialize PluginRules.
+
+        Args:
+            hostname_mapping (list, optional): List of dicts of regex pattern to Site slug. Defaults to None.
+            facility_prepend (str, optional): Prefix of the Tag holding a Site's facility. Defaults to None.
+            role_prepend (str, optional): Prefix of the Tag holding a Device's role. Defaults to None.
+            ignore_tag (str, optional): Tag marking Devices and Clusters that shouldn't be loaded. Defaults to None.
+            mgmt_interface_names (Iterable[str], optional): Port names or regex patterns of management interfaces in
+                order of preference. Defaults to None for `DEFAULT_MGMT_INTERFACE_NAMES`.
+        """
+        self.hostname_mapping = hostname_mapping
+        self.mappings = [(pattern, slug) for entry in hostname_mapping or [] for pattern, slug in entry.items()]
+        self.facility_prepend = Prepend(facility_prepend) if facility_prepend else None
+        self.role_prepend = Prepend(role_prepend) if role_prepend else None
+        self.ignore_tag = ignore_tag
+        self.mgmt_interface_names = tuple(
+            DEFAULT_MGMT_INTERFACE_NAMES if mgmt_interface_names is None else mgmt_interface_names
+        )
+        self._mgmt_literals = {}
+        self._mgmt_patterns = []
+        for rank, pattern in enumerate(self.mgmt_interface_names):
+            if is_literal(pattern):
+                self._mgmt_literals.setdefault(pattern, rank)
+            else:
+                self._mgmt_patterns.append((rank, re.compile(pattern)))
+        self.settings = (facility_prepend, role_prepend, ignore_tag, self.mgmt_interface_names)
+        self._combined = None
+        self._compiled = None
+        self._sites = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings: dict) -> "PluginRules":
+        """Compile the rules from the plugin settings.
+
+        Args:
+            settings (dict): Plugin settings, ie PLUGIN_CFG.
+
+        Returns:
+            PluginRules: Rules compiled from the settings.
+        """
+        return cls(
+            hostname_mapping=settings.get("hostname_mapping"),
+            facility_prepend=settings.get("facility_prepend"),
+            role_prepend=settings.get("role_prepend"),
+            ignore_tag=settings.get("ignore_tag"),
+            mgmt_interface_names=settings.get("mgmt_interface_names"),
+        )
+
+    def matches_settings(self, settings: dict) -> bool:
+        """Return whether these rules were compiled from the current values of `settings`."""
+        return settings.get("hostname_mapping") is self.hostname_mapping and self.settings == (
+            settings.get("facility_prepend"),
+            settings.get("role_prepend"),
+            settings.get("ignore_tag"),
+            tuple(
+                DEFAULT_MGMT_INTERFACE_NAMES
+                if settings.get("mgmt_interface_names") is None
+                else settings["mgmt_interface_names"]
+            ),
+        )
+
+    def _compile_mappings(self):
+        """Compile the hostname patterns into one alternation with a named group per pattern.
+
+        Patterns are tried in the order they're listed, so the first pattern to match wins as with matching them one by
+        one. Patterns that can't be combined, ie with backreferences or inline flags, are compiled individually instead.
+        """
+        self._compiled = [(re.compile(pattern), slug) for pattern, slug in self.mappings]
+        if not self.mappings or any(BACKREFERENCE.search(pattern) for pattern, _ in self.mappings):
+            return
+        combined = "|".join(f"(?P<_rule{num}>{pattern})" for num, (pattern, _) in enumerate(self.mappings))
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("error")
+                self._combined = re.compile(combined)
+        except (re.error, DeprecationWarning, FutureWarning):
+            self._combined = None
+
+    def _match_site(self, device_name: str) -> str:
+        """Return the Site slug of the first hostname pattern matching the start of `device_name`."""
+        if self._combined is not None:
+            match = self._combined.match(device_name)
+            if match:
+                return self.mappings[int(match.lastgroup[5:])][1]
+            return ""
+        for regex, slug in self._compiled:
+            if regex.match(device_name):
+                return slug
+        return ""
+
+    def site_for_device(self, device_name: str) -> str:
+        """Return the Site slug mapped to a hostname by `hostname_mapping`.
+
+        Args:
+            device_name (str): Name of the Device or Patch Panel.
+
+        Returns:
+            str: Site slug of the first matching pattern or blank string if none match.
+        """
+        if device_name in self._sites:
+            return self._sites[device_name]
+        with self._lock:
+            if self._compiled is None:
+                self._compile_mappings()
+        site = self._match_site(device_name)
+        self._sites[device_name] = site
+        return site
+
+    def facility(self, tags: Iterable[str]) -> Optional[str]:
+        """Return the facility from the first Tag matching `facility_prepend`, or None if there isn't one."""
+        return self.facility_prepend.strip(tags) if self.facility_prepend else None
+
+    def device_role(self, tags: Iterable[str]) -> Optional[str]:
+        """Return the Device role from the first Tag matching `role_prepend`, or None if there isn't one."""
+        return self.role_prepend.strip(tags) if self.role_prepend else None
+
+    def is_ignored(self, tags: Optional[Iterable[str]]) -> bool:
+        """Return whether the Tags include `ignore_tag`."""
+        return bool(self.ignore_tag) and bool(tags) and self.ignore_tag in tags
+
+    def mgmt_interface_rank(self, port_name: str) -> Optional[int]:
+        """Return the position of the first `mgmt_interface_names` entry matching the whole Port name.
+
+        Args:
+            port_name (str): Name of the Port.
+
+        Returns:
+            Optional[int]: Preference of the Port as management interface, lowest first, or None if it isn't one.
+        """
+        rank = self._mgmt_literals.get(port_name)
+        for pattern_rank, regex in self._mgmt_patterns:
+            if rank is not None and pattern_rank > rank:
+                break
+            if regex.fullmatch(port_name):
+                return pattern_rank
+        return rank
+
+
+_RULES = None
+_RULES_LOCK = threading.Lock()
+
+
+def get_rules(settings: dict) -> PluginRules:
+    """Return the rules compiled from the plugin settings, only compiling them again when the settings change.
+
+    Args:
+        settings (dict): Plugin settings, ie PLUGIN_CFG.
+
+    Returns:
+        PluginRules: Rules compiled from the settings.
+    """
+    global _RULES  # pylint: disable=global-statement
+    rules = _RULES
+    if rules is None or not rules.matches_settings(settings):
+        with _RULES_LOCK:
+            rules = PluginRules.from_settings(settings)
+            _RULES = rules
+    return rules
@@ -0,0 +1,248 @@
+"""Utility functions for storing Device42 datasets as on-disk snapshots."""
+
+import functools
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+import time
+from collections.abc import Mapping, Sequence
+from typing import Optional, Union
+
+try:
+    import orjson
+
+    def dumps(value) -> bytes:
+        """Serialize a value to JSON bytes."""
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+
+    loads = orjson.loads
+except ImportError:
+
+    def dumps(value) -> bytes:
+        """Serialize a value to JSON bytes."""
+        return json.dumps(value, separators=(",", ":")).encode()
+
+    loads = json.loads
+
+
+# Snapshot file layout, all integers little-endian:
+#   header:  magic (4s), format version (B), kind (B), reserved (H), created timestamp (d), record count (Q), key
+#            index length (Q)
+#   keys:    JSON array of the keys of a dict dataset, in record order. Empty for list datasets.
+#   offsets: record count + 1 offsets (Q) of each record relative to the start of the records section.
+#   records: JSON encoded records, one per list element or dict value.
+HEADER = struct.Struct("<4sBBHdQQ")
+OFFSET = struct.Struct("<Q")
+MAGIC = b"D42S"
+VERSION = 1
+KIND_LIST = 0
+KIND_DICT = 1
+
+
+class SnapshotFile:
+    """Memory-mapped snapshot file of a single dataset."""
+
+    def __init__(self, path: str):
+        """Open the snapshot file at `path` and read its header.
+
+        Args:
+            path (str): Path to the snapshot file.
+
+        Raises:
+            ValueError: The file isn't a snapshot of a supported format version.
+        """
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.kind, _, self.created, self.count, keys_length = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a supported Device42 snapshot.")
+        self._keys_start = HEADER.size
+        self._offsets_start = self._keys_start + keys_length
+        self._records_start = self._offsets_start + OFFSET.size * (self.count + 1)
+
+    def keys(self) -> list:
+        """Return the keys of a dict dataset in record order."""
+        return loads(self._mmap[self._keys_start : self._offsets_start]) if self.kind == KIND_DICT else []
+
+    def record(self, index: int):
+        """Decode and return the record at `index`."""
+        start = OFFSET.unpack_from(self._mmap, self._offsets_start + OFFSET.size * index)[0]
+        end = OFFSET.unpack_from(self._mmap, self._offsets_start + OFFSET.size * (index + 1))[0]
+        return loads(self._mmap[self._records_start + start : self._records_start + end])
+
+    def view(self) -> Union["SnapshotList", "SnapshotDict"]:
+        """Return a lazy read-only view of the dataset."""
+        return SnapshotDict(self) if self.kind == KIND_DICT else SnapshotList(self)
+
+
+class SnapshotList(Sequence):
+    """Read-only list view of a snapshot that decodes each record when it's accessed."""
+
+    def __init__(self, snapshot: SnapshotFile):
+        """Initialize SnapshotList."""
+        self._snapshot = snapshot
+
+    def __len__(self):
+        """Return the number of records in the snapshot."""
+        return self._snapshot.count
+
+    def __getitem__(self, index):
+        """Decode and return the record at `index`, or a list of records for a slice."""
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("snapshot index out of range")
+        return self._snapshot.record(index)
+
+    def __eq__(self, other):
+        """Compare the records of the snapshot to another sequence."""
+        return isinstance(other, Sequence) and list(self) == list(other)
+
+    def __add__(self, other):
+        """Concatenate the records of the snapshot with another sequence into a new list."""
+        return list(self) + list(other)
+
+    def __radd__(self, other):
+        """Concatenate another sequence with the records of the snapshot into a new list."""
+        return list(other) + list(self)
+
+
+class SnapshotDict(Mapping):
+    """Read-only dict view of a snapshot that decodes each value when it's accessed."""
+
+    def __init__(self, snapshot: SnapshotFile):
+        """Initialize SnapshotDict, loading only the key index."""
+        self._snapshot = snapshot
+        self._index = {key: index for index, key in enumerate(snapshot.keys())}
+
+    def __len__(self):
+        """Return the number of keys in the snapshot."""
+        return len(self._index)
+
+    def __iter__(self):
+        """Iterate over the keys of the snapshot."""
+        return iter(self._index)
+
+    def __contains__(self, key):
+        """Return whether `key` is in the snapshot without decoding its value."""
+        return key in self._index
+
+    def __getitem__(self, key):
+        """Decode and return the value for `key`."""
+        return self._snapshot.record(self._index[key])
+
+
+def write_snapshot(path: str, data: Union[list, dict]):
+    """Write a dataset to a snapshot file, replacing any existing snapshot atomically.
+
+    Args:
+        path (str): Path to the snapshot file.
+        data (Union[list, dict]): Dataset to be written.
+    """
+    if isinstance(data, Mapping):
+        kind, keys, values = KIND_DICT, dumps(list(data.keys())), data.values()
+    else:
+        kind, keys, values = KIND_LIST, b"", data
+    records = [dumps(value) for value in values]
+    offsets, position = [0], 0
+    for record in records:
+        position += len(record)
+        offsets.append(position)
+    directory = os.path.dirname(path) or "."
+    with tempfile.NamedTemporaryFile(dir=directory, prefix=".snapshot-", delete=False) as file:
+        file.write(HEADER.pack(MAGIC, VERSION, kind, 0, time.time(), len(records), len(keys)))
+        file.write(keys)
+        file.write(struct.pack(f"<{len(offsets)}Q", *offsets))
+        file.writelines(records)
+    os.replace(file.name, path)
+
+
+class SnapshotStore:
+    """Directory of Device42 dataset snapshots with a time to live for each dataset."""
+
+    def __init__(self, directory: str, ttls: Optional[dict] = None, refresh: bool = False):
+        """Initialize SnapshotStore.
+
+        Args:
+            directory (str): Directory the snapshots are stored in. Created if it doesn't exist.
+            ttls (dict, optional): Number of seconds a snapshot stays valid keyed by dataset name, ie `get_buildings`.
+                Only datasets with a TTL are snapshotted. Defaults to None.
+            refresh (bool, optional): Ignore existing snapshots, retrieving and writing every dataset again. Defaults
+                to False.
+        """
+        self.directory = directory
+        self.ttls = ttls or {}
+        self.refresh = refresh
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, name: str, variant: str = "") -> str:
+        """Return the path of the snapshot for dataset `name`, optionally qualified by a variant of the dataset."""
+        return os.path.join(self.directory, f"{name}-{variant}.snapshot" if variant else f"{name}.snapshot")
+
+    def enabled(self, name: str) -> bool:
+        """Return whether dataset `name` is snapshotted."""
+        return self.ttls.get(name, 0) > 0
+
+    def load(self, name: str, variant: str = "") -> Optional[Union[SnapshotList, SnapshotDict]]:
+        """Return a view of the snapshot of dataset `name` if one exists that's within its TTL.
+
+        Args:
+            name (str): Name of the dataset.
+            variant (str, optional): Variant of the dataset, ie a digest of the columns retrieved. Defaults to "".
+
+        Returns:
+            Optional[Union[SnapshotList, SnapshotDict]]: Lazy view of the dataset or None if there's no valid snapshot.
+        """
+        if self.refresh or not self.enabled(name):
+            return None
+        try:
+            snapshot = SnapshotFile(self.path(name, variant))
+        except (OSError, ValueError, struct.error):
+            return None
+        if time.time() - snapshot.created > self.ttls[name]:
+            return None
+        return snapshot.view()
+
+    def save(self, name: str, data: Union[list, dict], variant: str = ""):
+        """Write a snapshot of dataset `name`.
+
+        Args:
+            name (str): Name of the dataset.
+            data (Union[list, dict]): Dataset to be written.
+            variant (str, optional): Variant of the dataset, ie a digest of the columns retrieved. Defaults to "".
+        """
+        write_snapshot(self.path(name, variant), data)
+
+
+def snapshot(method):
+    """Decorator for Device42API methods whose dataset can be served from, and written to, a snapshot.
+
+    The method is bypassed when the client has a SnapshotStore holding a valid snapshot of the dataset, named after the
+    method. A dataset retrieved with a subset of its `columns` is snapshotted separately for each set of columns. Calls
+    with any other arguments are never snapshotted.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        store = getattr(self, "snapshots", None)
+        if store is None or args or set(kwargs) - {"columns"} or not store.enabled(method.__name__):
+            return method(self, *args, **kwargs)
+        columns = kwargs.get("columns")
+        variant = hashlib.sha1(",".join(columns).encode()).hexdigest()[:12] if columns else ""  # nosec B324
+        data = store.load(method.__name__, variant)
+        if data is not None:
+            self.count("snapshot hits")
+            return data
+        data = method(self, **kwargs)
+        if isinstance(data, (list, dict)):
+            store.save(method.__name__, data, variant)
+            self.count("snapshot writes")
+        return data
+
+    return wrapper
@@ -0,0 +1,145 @@
+"""Transport adapters for recording Device42 API traffic and replaying it offline."""
+
+import io
+import itertools
+import json
+import threading
+import time
+import zipfile
+from typing import Optional, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPResponse
+
+# Headers describing how the body was transferred. Bodies are stored decoded so these no longer apply on replay.
+TRANSFER_HEADERS = ("content-encoding", "content-length", "transfer-encoding", "connection", "set-cookie")
+
+
+class ReplayMissError(requests.exceptions.RequestException):
+    """Exception raised when replaying a request that isn't in the archive."""
+
+
+def request_key(method: str, url: str) -> str:
+    """Return a key identifying a request independently of the host and of the order of its query parameters.
+
+    Args:
+        method (str): HTTP method of the request.
+        url (str): Full URL of the request.
+
+    Returns:
+        str: Normalized key for the request.
+    """
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return f"{method.upper()} {parts.path.rstrip('/') or '/'}?{query}"
+
+
+class RecordingAdapter(HTTPAdapter):
+    """HTTPAdapter that captures every request and response pair into a compressed zip archive.
+
+    Response bodies are written to the archive as they're received and the index of requests is written when the
+    adapter is closed, which happens when the `requests.Session` it's mounted on is closed.
+    """
+
+    def __init__(self, path: str, **kwargs):
+        """Initialize RecordingAdapter.
+
+        Args:
+            path (str): Path of the archive to write.
+            **kwargs: Additional arguments passed to HTTPAdapter, ie `pool_maxsize`.
+        """
+        super().__init__(**kwargs)
+        self.path = path
+        self.index = {}
+        # pylint: disable-next=consider-using-with
+        self._archive = zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED)
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def send(self, request, **kwargs):  # pylint: disable=arguments-differ
+        """Send the request and record the response before returning it."""
+        start = time.perf_counter()
+        response = super().send(request, **kwargs)
+        content = response.content
+        elapsed = time.perf_counter() - start
+        headers = {key: value for key, value in response.headers.items() if key.lower() not in TRANSFER_HEADERS}
+        with self._lock:
+            body = f"bodies/{next(self._counter):08d}"
+            self._archive.writestr(body, content)
+            self.index.setdefault(request_key(request.method, request.url), []).append(
+                {
+                    "status": response.status_code,
+                    "reason": response.reason,
+                    "headers": headers,
+                    "body": body,
+                    "elapsed": elapsed,
+                }
+            )
+        # The body has been read, so give streaming consumers of `raw` a fresh copy of the decoded content.
+        response.raw = HTTPResponse(
+            body=io.BytesIO(content), headers=headers, status=response.status_code, preload_content=False
+        )
+        return response
+
+    def close(self):
+        """Write the index of recorded requests and close the archive."""
+        super().close()
+        with self._lock:
+            if self._archive.fp is not None:
+                self._archive.writestr("index.json", json.dumps({"version": 1, "requests": self.index}))
+                self._archive.close()
+
+
+class ReplayAdapter(HTTPAdapter):
+    """HTTPAdapter that serves responses from an archive written by RecordingAdapter without any network access.
+
+    Requests are matched on method, path and query parameters. When the same request was recorded more than once, the
+    responses are served in the order they were recorded with the last one repeated.
+    """
+
+    def __init__(self, path: str, latency: Optional[Union[float, str]] = None, **kwargs):
+        """Initialize ReplayAdapter.
+
+        Args:
+            path (str): Path of the archive to replay.
+            latency (Union[float, str], optional): Seconds to wait before serving each response, or `recorded` to wait
+                as long as the original response took. Defaults to None for no delay.
+            **kwargs: Additional arguments passed to HTTPAdapter.
+        """
+        super().__init__(**kwargs)
+        self.path = path
+        self.latency = latency
+        self._archive = zipfile.ZipFile(path, "r")  # pylint: disable=consider-using-with
+        self.index = json.loads(self._archive.read("index.json"))["requests"]
+        self._served = {}
+        self._lock = threading.Lock()
+
+    def send(self, request, **kwargs):  # pylint: disable=arguments-differ
+        """Serve the recorded response for the request."""
+        key = request_key(request.method, request.url)
+        if key not in self.index:
+            raise ReplayMissError(f"No recorded response for {key} in {self.path}.", request=request)
+        with self._lock:
+            served = self._served.get(key, 0)
+            self._served[key] = served + 1
+            entry = self.index[key][min(served, len(self.index[key]) - 1)]
+            body = self._archive.read(entry["body"])
+        if self.latency == "recorded":
+            time.sleep(entry["elapsed"])
+        elif self.latency:
+            time.sleep(float(self.latency))
+        raw = HTTPResponse(
+            body=io.BytesIO(body),
+            headers=entry["headers"],
+            status=entry["status"],
+            reason=entry.get("reason"),
+            preload_content=False,
+        )
+        return self.build_response(request, raw)
+
+    def close(self):
+        """Close the archive."""
+        super().close()
+        self._archive.close()
@@ -397,6 +397,18 @@ def unittest_coverage(context):
     run_command(context, command)
 
 
+@task(
+    help={
+        "name": "name of the benchmark module to run, ie `pagination` for `bench_pagination`",
+    }
+)
+def benchmark(context, name="pagination"):
+    """Run a performance benchmark from nautobot_ssot_device42/tests/benchmarks."""
+    command = f"python -m nautobot_ssot_device42.tests.benchmarks.bench_{name}"
+
+    run_command(context, command)
+
+
 @task(
     help={
         "failfast": "fail as soon as a single test fails don't run the entire test suite",